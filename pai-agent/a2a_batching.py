@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+A2A Message Batching
+Sender-side coalescer that groups messages per destination for a few
+milliseconds (or until a batch fills) so many small messages share one
+request to the peer's batch endpoint
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+logger = logging.getLogger("pai-a2a-batching")
+
+
+class MessageCoalescer:
+    """Per-destination micro-batcher
+
+    submit() parks an item in its destination's buffer and waits for that
+    item's own result. A buffer is flushed linger seconds after its first
+    item arrives or as soon as it holds max_items, whichever comes first;
+    flush(destination, items) must return one result per item, in order.
+    Several batches to the same destination may be in flight at once.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[str, List[Any]], Awaitable[List[Any]]],
+        max_items: int = int(os.getenv("A2A_BATCH_MAX_ITEMS", "64")),
+        linger: float = float(os.getenv("A2A_BATCH_LINGER_MS", "5")) / 1000
+    ):
+        self.flush = flush
+        self.max_items = max_items
+        self.linger = linger
+        self._pending: Dict[str, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._deliveries: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 1
+
+    async def submit(self, destination: str, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        buffer = self._pending.setdefault(destination, [])
+        buffer.append((item, future))
+
+        if len(buffer) >= self.max_items:
+            self._flush(destination)
+        elif len(buffer) == 1:
+            self._timers[destination] = loop.call_later(self.linger, self._flush, destination)
+        return await future
+
+    def _flush(self, destination: str):
+        timer = self._timers.pop(destination, None)
+        if timer:
+            timer.cancel()
+        batch = self._pending.pop(destination, None)
+        if not batch:
+            return
+        delivery = asyncio.get_running_loop().create_task(self._deliver(destination, batch))
+        self._deliveries.add(delivery)
+        delivery.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, destination: str, batch: List[Tuple[Any, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.flush(destination, [item for item, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e if isinstance(e, Exception) else RuntimeError("Batch delivery cancelled"))
+            if not isinstance(e, Exception):
+                raise
+            logger.error(f"Batch of {len(batch)} messages to {destination} failed: {e}")
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+        if len(results) != len(batch):
+            # Never leave a caller waiting on a result that will not come
+            error = RuntimeError(f"Batch flush returned {len(results)} results for {len(batch)} items")
+            logger.error(f"Batch of {len(batch)} messages to {destination}: {error}")
+            for _, future in batch[len(results):]:
+                if not future.done():
+                    future.set_exception(error)
+
+    async def close(self):
+        """Send everything still buffered and wait for in-flight batches"""
+        for destination in list(self._pending):
+            self._flush(destination)
+        await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_items": self.max_items,
+            "linger_ms": self.linger * 1000,
+            "batches": self.batches,
+            "messages": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "buffered": sum(len(buffer) for buffer in self._pending.values())
+        }
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+A2A Network Simulation
+Runs N in-process A2ANetworkManagers that talk to each other through ASGI
+test transports (no sockets), with injected network latency, failures and
+capability mixes, and benchmarks broadcast, delegation and health-check
+workloads for throughput, p50/p99 latency and memory. Routing, transport
+and scheduling changes can be compared on one machine.
+
+Run `python a2a_bench.py --help` for options.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+
+from a2a_history import MessageHistory
+from a2a_registry import AgentRegistry
+from a2a_routing import AgentRouter, RoutingConfig
+from a2a_system import A2ANetworkManager, AgentCapability, MessageType
+from a2a_transport import A2ATransport, A2ATransportConfig
+
+logger = logging.getLogger("pai-a2a-bench")
+
+WORKLOADS = ("broadcast", "delegation", "health_check")
+
+
+@dataclass
+class SimulationConfig:
+    """Shape of the simulated network and the faults injected into it"""
+    agents: int = 8
+    latency: float = 0.002  # seconds added to every request
+    jitter: float = 0.001  # latency varies uniformly by up to this much either way
+    failure_rate: float = 0.0  # fraction of requests answered with 503 before reaching the agent
+    down_agents: int = 0  # agents whose endpoint refuses every connection
+    handler_latency: float = 0.005  # time each capability handler takes
+    task_timeout: float = 10.0  # how long a delegation workload waits for a task result
+    # Fraction of agents that have each capability
+    capability_mix: Dict[str, float] = field(default_factory=lambda: {
+        AgentCapability.RAG_RETRIEVAL.value: 1.0,
+        AgentCapability.GRAPH_MEMORY.value: 0.5,
+        AgentCapability.KNOWLEDGE_SYNTHESIS.value: 0.25
+    })
+    routing_strategy: str = "p2c"
+    seed: int = 7
+
+
+class SimulatedNetwork(httpx.AsyncBaseTransport):
+    """Routes requests to in-process agent apps by host name
+
+    Every request is delayed by the configured latency; requests to a down
+    agent fail to connect and failure_rate of the rest get a 503 without
+    reaching the agent.
+    """
+
+    def __init__(self, config: SimulationConfig, rng: random.Random):
+        self.config = config
+        self.rng = rng
+        self.apps: Dict[str, httpx.ASGITransport] = {}
+        self.down: Set[str] = set()
+        self.requests = 0
+        self.refused = 0
+        self.injected_failures = 0
+
+    def add(self, host: str, app: FastAPI):
+        self.apps[host] = httpx.ASGITransport(app=app)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        delay = self.config.latency + self.rng.uniform(-self.config.jitter, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        host = request.url.host
+        if host in self.down or host not in self.apps:
+            self.refused += 1
+            raise httpx.ConnectError(f"Connection refused by {host}", request=request)
+        if self.config.failure_rate and self.rng.random() < self.config.failure_rate:
+            self.injected_failures += 1
+            return httpx.Response(503, json={"detail": "Injected failure"}, request=request)
+        return await self.apps[host].handle_async_request(request)
+
+
+def agent_app(manager: A2ANetworkManager) -> FastAPI:
+    """The A2A message routes of main.py, bound to one manager"""
+    app = FastAPI()
+
+    @app.post("/a2a/v1/message")
+    async def handle_a2a_message(request: Request):
+        result = await manager.handle_incoming_payload(
+            await request.body(),
+            request.headers.get("content-type"),
+            request.headers.get("content-encoding")
+        )
+        if result.get("status") == "overloaded":
+            raise HTTPException(
+                status_code=429,
+                detail=result["message"],
+                headers={"Retry-After": str(max(1, round(result["retry_after"])))}
+            )
+        return result
+
+    @app.post("/a2a/v1/batch")
+    async def handle_a2a_batch(request: Request):
+        result = await manager.handle_incoming_batch(
+            await request.body(),
+            request.headers.get("content-type"),
+            request.headers.get("content-encoding")
+        )
+        results = result.get("results") or []
+        if results and all(item.get("status") == "overloaded" for item in results):
+            raise HTTPException(
+                status_code=429,
+                detail="Inbound queue is full",
+                headers={"Retry-After": str(max(1, round(results[0]["retry_after"])))}
+            )
+        return result
+
+    return app
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class A2ASimulation:
+    """A fully meshed network of in-process agents
+
+    Agents are named agent-0 .. agent-N-1 and reach each other at
+    http://agent-<i>. Each has its own registry, history, scheduler, router
+    and breakers, exactly as in a deployment; only the HTTP hop is replaced.
+    """
+
+    def __init__(self, config: Optional[SimulationConfig] = None):
+        self.config = config or SimulationConfig()
+        self.rng = random.Random(self.config.seed)
+        self.network = SimulatedNetwork(self.config, self.rng)
+        self.managers: List[A2ANetworkManager] = []
+        self.capabilities: Dict[str, Set[AgentCapability]] = {}
+
+    @property
+    def live(self) -> List[A2ANetworkManager]:
+        return [manager for manager in self.managers if manager.agent_id not in self.network.down]
+
+    def _assign_capabilities(self) -> List[Set[AgentCapability]]:
+        assigned: List[Set[AgentCapability]] = [set() for _ in range(self.config.agents)]
+        for value, fraction in self.config.capability_mix.items():
+            capability = AgentCapability(value)
+            holders = [index for index in range(self.config.agents) if self.rng.random() < fraction]
+            # Every capability in the mix is held somewhere, and never only by the first agent
+            for index in holders or [self.config.agents - 1]:
+                assigned[index].add(capability)
+        return assigned
+
+    def _handler(self, capability: AgentCapability) -> Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]:
+        async def handle(parameters: Dict[str, Any]) -> Dict[str, Any]:
+            await asyncio.sleep(self.config.handler_latency)
+            return {"capability": capability.value, "n": parameters.get("n")}
+        return handle
+
+    @staticmethod
+    async def _on_broadcast(message) -> Dict[str, Any]:
+        return {"received": message.message_id}
+
+    async def start(self):
+        if self.config.agents < 2:
+            raise ValueError("A simulated network needs at least 2 agents")
+
+        for index, capabilities in enumerate(self._assign_capabilities()):
+            agent_id = f"agent-{index}"
+            manager = A2ANetworkManager(
+                agent_id,
+                agent_id,
+                f"http://{agent_id}",
+                transport=A2ATransport(A2ATransportConfig(http2=False), transport=self.network),
+                history=MessageHistory(capacity=1000, spill_path=None),
+                registry=AgentRegistry(A2ANetworkManager._profile_from_record, path=None),
+                router=AgentRouter(RoutingConfig(strategy=self.config.routing_strategy))
+            )
+            for capability in capabilities:
+                manager.register_capability_handler(capability, self._handler(capability))
+            manager.register_handler(MessageType.BROADCAST, self._on_broadcast)
+            self.network.add(agent_id, agent_app(manager))
+            self.capabilities[agent_id] = capabilities
+            self.managers.append(manager)
+
+        # The last down_agents agents never answer; agent-0 always stays up
+        down = min(self.config.down_agents, self.config.agents - 1)
+        self.network.down = {manager.agent_id for manager in self.managers[self.config.agents - down:]}
+
+        for manager in self.managers:
+            for peer in self.managers:
+                if peer is not manager:
+                    await manager.register_agent(
+                        peer.agent_id, peer.agent_name, "Simulated agent",
+                        self.capabilities[peer.agent_id], peer.endpoint, metadata=peer.advertise()
+                    )
+
+    async def close(self):
+        await asyncio.gather(*(manager.close() for manager in self.managers), return_exceptions=True)
+
+    def _sender(self) -> A2ANetworkManager:
+        return self.rng.choice(self.live)
+
+    async def _broadcast(self, n: int) -> bool:
+        result = await self._sender().broadcast_message(MessageType.BROADCAST, {"n": n})
+        return not result.failed
+
+    async def _delegation(self, n: int) -> bool:
+        capability = AgentCapability(self.rng.choice(list(self.config.capability_mix)))
+        holders = {manager.agent_id for manager in self.live if capability in self.capabilities[manager.agent_id]}
+        # An agent never delegates to itself, so the sole holder of a capability cannot send it
+        senders = [manager for manager in self.live if holders - {manager.agent_id}]
+        if not senders:
+            return False
+        sender = self.rng.choice(senders)
+        task_id = await sender.delegate_task(
+            "bench",
+            f"Simulated {capability.value} task",
+            {"n": n},
+            {capability},
+            deadline=datetime.now() + timedelta(seconds=self.config.task_timeout)
+        )
+        if task_id is None:
+            return False
+        task = await sender.wait_for_task(task_id, timeout=self.config.task_timeout)
+        return task.status == "completed"
+
+    async def _health_check(self, n: int) -> bool:
+        result = await self._sender().health_check_network()
+        return result["unreachable"] == 0
+
+    async def run(
+        self,
+        workload: str,
+        requests: int = 500,
+        concurrency: int = 32,
+        trace_memory: bool = True
+    ) -> Dict[str, Any]:
+        """Run requests operations of one workload, concurrency at a time
+
+        Latency is per operation: a whole broadcast or health-check fan-out,
+        or a delegation from send to result. An operation succeeds when its
+        fan-out reached every peer or its delegated task completed. Memory is the peak traced
+        allocation above the starting point; tracing slows everything down,
+        so compare throughput only between runs with the same setting.
+        """
+        operations = {
+            "broadcast": self._broadcast,
+            "delegation": self._delegation,
+            "health_check": self._health_check
+        }
+        if workload not in operations:
+            raise ValueError(f"Unknown workload {workload}; choose from {', '.join(WORKLOADS)}")
+        operation = operations[workload]
+
+        latencies: List[float] = []
+        succeeded = 0
+        pending = iter(range(requests))
+
+        async def worker():
+            nonlocal succeeded
+            for n in pending:
+                start = time.perf_counter()
+                try:
+                    ok = await operation(n)
+                except Exception as e:
+                    logger.debug(f"{workload} operation {n} failed: {e!r}")
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                succeeded += ok
+
+        requests_before = self.network.requests
+        if trace_memory:
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            "workload": workload,
+            "agents": self.config.agents,
+            "operations": len(latencies),
+            "succeeded": succeeded,
+            "elapsed": round(elapsed, 3),
+            "throughput": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+            "http_requests": self.network.requests - requests_before,
+            "peak_memory_kb": round(peak / 1024) if peak is not None else None
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "agents": self.config.agents,
+            "down": sorted(self.network.down),
+            "requests": self.network.requests,
+            "refused": self.network.refused,
+            "injected_failures": self.network.injected_failures,
+            "scheduler_shed": sum(manager.scheduler.shed for manager in self.managers),
+            "scheduler_rejected": sum(manager.scheduler.rejected for manager in self.managers),
+            "circuit_trips": sum(
+                breaker.trips for manager in self.managers for breaker in manager.breakers.breakers.values()
+            ),
+            "hedges": sum(manager.router.hedges for manager in self.managers)
+        }
+
+
+async def run_benchmark(
+    config: Optional[SimulationConfig] = None,
+    workloads: Optional[List[str]] = None,
+    requests: int = 500,
+    concurrency: int = 32,
+    trace_memory: bool = True
+) -> Dict[str, Any]:
+    """Build a simulated network, run each workload on it in turn and tear it down"""
+    simulation = A2ASimulation(config)
+    await simulation.start()
+    try:
+        results = [
+            await simulation.run(workload, requests, concurrency, trace_memory)
+            for workload in workloads or WORKLOADS
+        ]
+        return {"results": results, "network": simulation.stats()}
+    finally:
+        await simulation.close()
+
+
+def _capability_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, fraction = part.partition("=")
+        mix[AgentCapability(name.strip()).value] = float(fraction or 1.0)
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark a simulated in-process A2A network")
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="operations per workload")
+    parser.add_argument("--concurrency", type=int, default=32, help="operations in flight at once")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="comma-separated subset of %(default)s")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests failed with 503")
+    parser.add_argument("--down", type=int, default=0, help="agents that refuse all connections")
+    parser.add_argument("--handler-ms", type=float, default=5.0, help="capability handler run time")
+    parser.add_argument(
+        "--capabilities",
+        default="rag_retrieval=1.0,graph_memory=0.5,knowledge_synthesis=0.25",
+        help="capability=fraction of agents holding it, comma-separated"
+    )
+    parser.add_argument("--strategy", default="p2c", choices=["p2c", "least_outstanding"])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows the run")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--log-level", default="CRITICAL", help="agent log level; injected failures log errors")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper())
+    simulation_config = SimulationConfig(
+        agents=args.agents,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        failure_rate=args.failure_rate,
+        down_agents=args.down,
+        handler_latency=args.handler_ms / 1000,
+        capability_mix=_capability_mix(args.capabilities),
+        routing_strategy=args.strategy,
+        seed=args.seed
+    )
+    report = asyncio.run(run_benchmark(
+        simulation_config,
+        [workload.strip() for workload in args.workloads.split(",")],
+        requests=args.requests,
+        concurrency=args.concurrency,
+        trace_memory=not args.no_memory
+    ))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'workload':<13} {'ops':>6} {'ok':>6} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'http':>7} {'peak KB':>9}")
+        for row in report["results"]:
+            memory = row["peak_memory_kb"] if row["peak_memory_kb"] is not None else "-"
+            print(
+                f"{row['workload']:<13} {row['operations']:>6} {row['succeeded']:>6} {row['throughput']:>9} "
+                f"{row['p50_ms']:>9} {row['p99_ms']:>9} {row['http_requests']:>7} {memory:>9}"
+            )
+        print(json.dumps(report["network"]))
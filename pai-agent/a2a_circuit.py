@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+A2A Circuit Breakers
+Per-peer closed/open/half-open breakers so a dead peer is refused locally
+instead of costing a full request timeout, and request timeouts derived
+from each peer's observed latency tail
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from a2a_routing import LatencyEWMA
+
+logger = logging.getLogger("pai-a2a-circuit")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class BreakerConfig:
+    """Trip threshold, cool-down and adaptive timeout bounds"""
+    failure_threshold: int = int(os.getenv("A2A_BREAKER_FAILURES", "5"))
+    reset_timeout: float = float(os.getenv("A2A_BREAKER_RESET", "10.0"))
+    max_reset_timeout: float = 300.0
+    timeout_multiplier: float = 4.0
+    min_timeout: float = 1.0
+    max_timeout: float = 30.0
+    min_samples: int = 5
+
+
+class CircuitBreaker:
+    """Breaker for one peer
+
+    Consecutive failures trip it open; while open every call is refused.
+    After the cool-down one probe is let through (half-open): success closes
+    the breaker, failure reopens it with the cool-down doubled.
+    """
+
+    __slots__ = ("config", "state", "failures", "opened_at", "open_for", "probing", "trips", "rejected")
+
+    def __init__(self, config: BreakerConfig):
+        self.config = config
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.open_for = config.reset_timeout
+        self.probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    def _cooled_down(self, now: float) -> bool:
+        return now - self.opened_at >= self.open_for
+
+    def available(self) -> bool:
+        """Whether a call would currently be let through, without claiming the probe"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return self._cooled_down(time.monotonic())
+        return not self.probing
+
+    def allow(self) -> bool:
+        """Claim permission for one call"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self._cooled_down(time.monotonic()):
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.probing = False
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self.open_for = self.config.reset_timeout
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self.open_for = min(self.open_for * 2, self.config.max_reset_timeout)
+            self._open()
+        elif self.state == CLOSED and self.failures >= self.config.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.probing = False
+        self.trips += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "open_for": self.open_for,
+            "trips": self.trips,
+            "rejected": self.rejected
+        }
+
+
+class CircuitBreakers:
+    """Breakers keyed by agent id, plus the adaptive per-peer request timeout"""
+
+    def __init__(self, config: Optional[BreakerConfig] = None):
+        self.config = config or BreakerConfig()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, agent_id: str) -> CircuitBreaker:
+        breaker = self.breakers.get(agent_id)
+        if breaker is None:
+            breaker = self.breakers[agent_id] = CircuitBreaker(self.config)
+        return breaker
+
+    def available(self, agent_id: str) -> bool:
+        breaker = self.breakers.get(agent_id)
+        return breaker is None or breaker.available()
+
+    def allow(self, agent_id: str) -> bool:
+        return self.get(agent_id).allow()
+
+    def forget(self, agent_id: str):
+        self.breakers.pop(agent_id, None)
+
+    def record_success(self, agent_id: str):
+        self.get(agent_id).record_success()
+
+    def record_failure(self, agent_id: str):
+        breaker = self.get(agent_id)
+        was_open = breaker.state == OPEN
+        breaker.record_failure()
+        if breaker.state == OPEN and not was_open:
+            logger.warning(f"Circuit to {agent_id} opened for {breaker.open_for:.1f}s")
+
+    def state(self, agent_id: str) -> str:
+        breaker = self.breakers.get(agent_id)
+        return breaker.state if breaker else CLOSED
+
+    def timeout_for(self, latency: Optional[LatencyEWMA]) -> float:
+        """A few multiples of the peer's latency tail, within [min_timeout, max_timeout]"""
+        if latency is None or latency.samples < self.config.min_samples:
+            return self.config.max_timeout
+        adaptive = latency.p95 * self.config.timeout_multiplier
+        return min(self.config.max_timeout, max(self.config.min_timeout, adaptive))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "open": sum(1 for breaker in self.breakers.values() if breaker.state != CLOSED),
+            "agents": {agent_id: breaker.snapshot() for agent_id, breaker in self.breakers.items()}
+        }
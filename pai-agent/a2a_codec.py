@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+A2A Message Codec
+Wire encodings for A2A messages: JSON (always available), msgpack and CBOR
+when their packages are installed, and zstd compression for large bodies.
+Peers advertise what they accept in their /a2a/v1/profile metadata and the
+sender picks the best encoding both sides support, falling back to JSON.
+
+Run `python a2a_codec.py` to benchmark encode/decode time and wire size.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("pai-a2a-codec")
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+ZSTD = "zstd"
+
+# Profile metadata keys used for negotiation
+CODECS_KEY = "a2a_codecs"
+COMPRESSION_KEY = "a2a_compression"
+
+# Positional layout of binary-encoded messages; timestamps travel as UTC epoch seconds
+_FIELDS = (
+    "message_id", "from_agent", "to_agent", "message_type", "content",
+    "timestamp", "correlation_id", "reply_to", "ttl", "priority"
+)
+
+
+def _available_codecs() -> Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    codecs = {}
+    if msgpack is not None:
+        codecs[MSGPACK] = (
+            lambda value: msgpack.packb(value, use_bin_type=True, default=str),
+            lambda data: msgpack.unpackb(data, raw=False)
+        )
+    if cbor2 is not None:
+        codecs[CBOR] = (
+            lambda value: cbor2.dumps(value, default=lambda encoder, obj: encoder.encode(str(obj))),
+            cbor2.loads
+        )
+    return codecs
+
+
+class MessageCodec:
+    """Encodes outgoing and decodes incoming A2A messages
+
+    Binary codecs send the message as a positional array with an epoch
+    timestamp, so decoding skips both key strings and ISO date parsing.
+    Bodies of at least compress_min_bytes are zstd-compressed when the peer
+    accepts it. Incoming bodies larger than max_body_bytes, before or after
+    decompression, are refused.
+    """
+
+    def __init__(
+        self,
+        preferred: Optional[List[str]] = None,
+        compress_min_bytes: int = int(os.getenv("A2A_COMPRESS_MIN_BYTES", "4096")),
+        max_body_bytes: int = int(os.getenv("A2A_MAX_BODY_BYTES", str(16 * 1024 * 1024))),
+        enabled: bool = os.getenv("A2A_BINARY_CODECS", "true").lower() == "true"
+    ):
+        self.codecs = _available_codecs() if enabled else {}
+        order = preferred or [MSGPACK, CBOR]
+        self.preferred = [content_type for content_type in order if content_type in self.codecs]
+        self.compress_min_bytes = compress_min_bytes
+        self.max_body_bytes = max_body_bytes
+        self.compression = enabled and zstandard is not None
+        self._compressor = zstandard.ZstdCompressor(level=3) if self.compression else None
+        self._decompressor = zstandard.ZstdDecompressor() if self.compression else None
+        self.encoded: Dict[str, int] = {}
+
+    def advertise(self) -> Dict[str, List[str]]:
+        """Profile metadata announcing what this agent can decode"""
+        return {
+            CODECS_KEY: self.preferred + [JSON],
+            COMPRESSION_KEY: [ZSTD] if self.compression else []
+        }
+
+    def negotiate(self, peer_metadata: Optional[Dict[str, Any]]) -> Tuple[str, bool]:
+        """Best content type both sides support, and whether the peer takes zstd"""
+        peer_metadata = peer_metadata or {}
+        accepted = peer_metadata.get(CODECS_KEY) or [JSON]
+        content_type = next((codec for codec in self.preferred if codec in accepted), JSON)
+        compress = self.compression and ZSTD in (peer_metadata.get(COMPRESSION_KEY) or [])
+        return content_type, compress
+
+    @staticmethod
+    def _row(message, binary: bool) -> List[Any]:
+        return [
+            message.message_id, message.from_agent, message.to_agent, message.message_type.value,
+            message.content,
+            message.timestamp.astimezone(timezone.utc).timestamp() if binary else message.timestamp.isoformat(),
+            message.correlation_id, message.reply_to, message.ttl, message.priority
+        ]
+
+    def _finish(self, body: bytes, content_type: str, compress: bool, count: int) -> Tuple[bytes, Dict[str, str]]:
+        headers = {"Content-Type": content_type}
+        if compress and len(body) >= self.compress_min_bytes:
+            body = self._compressor.compress(body)
+            headers["Content-Encoding"] = ZSTD
+        self.encoded[content_type] = self.encoded.get(content_type, 0) + count
+        return body, headers
+
+    def encode(self, message, content_type: str, compress: bool = False) -> Tuple[bytes, Dict[str, str]]:
+        """Encode an A2AMessage into a request body and headers"""
+        if content_type == JSON:
+            body = json.dumps(dict(zip(_FIELDS, self._row(message, False))), default=str).encode()
+        else:
+            body = self.codecs[content_type][0](self._row(message, True))
+        return self._finish(body, content_type, compress, 1)
+
+    def encode_batch(self, messages: List[Any], content_type: str, compress: bool = False) -> Tuple[bytes, Dict[str, str]]:
+        """Encode several A2AMessages into one batch envelope"""
+        if content_type == JSON:
+            envelope = {"messages": [dict(zip(_FIELDS, self._row(message, False))) for message in messages]}
+            body = json.dumps(envelope, default=str).encode()
+        else:
+            body = self.codecs[content_type][0]([self._row(message, True) for message in messages])
+        return self._finish(body, content_type, compress, len(messages))
+
+    def _decompress(self, body: bytes) -> bytes:
+        """Inflate a zstd body, stopping as soon as it exceeds max_body_bytes
+
+        Streams rather than trusting the frame header's declared size, so a
+        small body cannot expand into an unbounded allocation.
+        """
+        if self._decompressor is None:
+            raise ValueError("zstd-encoded message received but zstandard is not installed")
+        chunks = []
+        size = 0
+        with self._decompressor.stream_reader(body) as reader:
+            while True:
+                chunk = reader.read(65536)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.max_body_bytes:
+                    raise ValueError(f"Decompressed message exceeds {self.max_body_bytes} bytes")
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _unpack(self, body: bytes, content_type: Optional[str], content_encoding: Optional[str]) -> Tuple[str, Any]:
+        if len(body) > self.max_body_bytes:
+            raise ValueError(f"Message body exceeds {self.max_body_bytes} bytes")
+        if content_encoding == ZSTD:
+            body = self._decompress(body)
+
+        content_type = (content_type or JSON).split(";")[0].strip()
+        if content_type == JSON:
+            return content_type, json.loads(body)
+        if content_type not in self.codecs:
+            raise ValueError(f"Unsupported A2A content type {content_type}")
+        return content_type, self.codecs[content_type][1](body)
+
+    @staticmethod
+    def _from_row(row: List[Any]) -> Dict[str, Any]:
+        data = dict(zip(_FIELDS, row))
+        data["timestamp"] = datetime.fromtimestamp(data["timestamp"], timezone.utc)
+        return data
+
+    def decode(self, body: bytes, content_type: Optional[str], content_encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Decode a request body into message fields; timestamps come back as UTC datetimes for binary codecs"""
+        content_type, value = self._unpack(body, content_type, content_encoding)
+        return value if content_type == JSON else self._from_row(value)
+
+    def decode_batch(self, body: bytes, content_type: Optional[str], content_encoding: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Decode a batch envelope into a list of message field dicts"""
+        content_type, value = self._unpack(body, content_type, content_encoding)
+        if content_type == JSON:
+            return value["messages"]
+        return [self._from_row(row) for row in value]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "codecs": self.preferred + [JSON],
+            "compression": self.compression,
+            "compress_min_bytes": self.compress_min_bytes,
+            "max_body_bytes": self.max_body_bytes,
+            "encoded": dict(self.encoded)
+        }
+
+
+def benchmark(iterations: int = 20000) -> List[Dict[str, Any]]:
+    """Time encode/decode and measure body size per codec for small and large messages"""
+    from a2a_system import A2AMessage, MessageType
+
+    small_content = {"task_id": "task_abc_1700000000_deadbeef", "status": "completed", "result": {"score": 0.93}}
+    large_content = {
+        "results": [
+            {"id": f"doc-{index}", "text": "graph memory recall snippet " * 8, "score": index / 100}
+            for index in range(50)
+        ]
+    }
+    codec = MessageCodec(compress_min_bytes=1024)
+    rows = []
+
+    for label, content in (("small", small_content), ("large", large_content)):
+        message = A2AMessage(
+            message_id="msg_pai-agent_1700000000_0a1b2c3d",
+            from_agent="pai-agent",
+            to_agent="research-agent",
+            message_type=MessageType.RESPONSE,
+            content=content,
+            timestamp=datetime.now(),
+            correlation_id="task_abc_1700000000_deadbeef",
+            ttl=60
+        )
+        variants = [(JSON, False)] + [(content_type, False) for content_type in codec.preferred]
+        if codec.compression:
+            variants += [(content_type, True) for content_type in [JSON] + codec.preferred]
+
+        count = iterations if label == "small" else max(1, iterations // 20)
+        for content_type, compress in variants:
+            body, headers = codec.encode(message, content_type, compress)
+            encoding = headers.get("Content-Encoding")
+            if compress and not encoding:
+                continue  # below compress_min_bytes, same as the uncompressed row
+
+            start = time.perf_counter()
+            for _ in range(count):
+                codec.encode(message, content_type, compress)
+            encode_us = (time.perf_counter() - start) / count * 1e6
+
+            start = time.perf_counter()
+            for _ in range(count):
+                decoded = codec.decode(body, content_type, encoding)
+                if isinstance(decoded["timestamp"], str):
+                    datetime.fromisoformat(decoded["timestamp"])
+            decode_us = (time.perf_counter() - start) / count * 1e6
+
+            rows.append({
+                "message": label,
+                "codec": content_type.split("/")[1] + ("+zstd" if encoding else ""),
+                "bytes": len(body),
+                "encode_us": round(encode_us, 2),
+                "decode_us": round(decode_us, 2)
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    print(f"{'message':<8} {'codec':<14} {'bytes':>8} {'encode µs':>10} {'decode µs':>10}")
+    for row in results:
+        print(f"{row['message']:<8} {row['codec']:<14} {row['bytes']:>8} {row['encode_us']:>10} {row['decode_us']:>10}")
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+A2A Capability Dispatch
+Routes delegated tasks to registered capability handlers, running the
+handlers a task needs concurrently with per-handler timeouts and a TTL
+result cache (with in-flight de-duplication) for idempotent handlers, and
+a streaming mode that forwards partial results as handlers produce them
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("pai-a2a-dispatch")
+
+
+@dataclass
+class HandlerSpec:
+    """A capability handler and how it may be run"""
+    handler: Callable[[Dict[str, Any]], Any]
+    timeout: float
+    cacheable: bool = False
+    stream: Optional[Callable[[Dict[str, Any]], AsyncIterator[Any]]] = None
+
+
+def _jsonable(value: Any) -> Any:
+    """Coerce handler output into plain JSON types so it can travel in a RESPONSE"""
+    return json.loads(json.dumps(value, default=str))
+
+
+def _cache_key(capability: str, parameters: Dict[str, Any]) -> str:
+    canonical = json.dumps(parameters, sort_keys=True, default=str)
+    return f"{capability}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+
+class CapabilityDispatcher:
+    """Runs one or more capability handlers for a delegated task
+
+    Each handler gets its own timeout and failures are reported per
+    capability, so one slow or broken handler does not sink the others.
+    Results of cacheable handlers are kept for cache_ttl seconds keyed by
+    capability and canonical parameters; concurrent identical calls share
+    one in-flight execution.
+    """
+
+    def __init__(
+        self,
+        default_timeout: float = float(os.getenv("A2A_HANDLER_TIMEOUT", "30")),
+        cache_ttl: float = float(os.getenv("A2A_HANDLER_CACHE_TTL", "60")),
+        cache_size: int = 1024,
+        stream_chunk_items: int = int(os.getenv("A2A_STREAM_CHUNK_ITEMS", "20")),
+        stream_buffer: int = 16
+    ):
+        self.default_timeout = default_timeout
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.stream_chunk_items = stream_chunk_items
+        self.stream_buffer = stream_buffer
+        self.handlers: Dict[str, HandlerSpec] = {}
+        self._cache: Dict[str, Tuple[float, asyncio.Future]] = {}
+        self.calls = 0
+        self.cache_hits = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def register(
+        self,
+        capability: str,
+        handler: Callable[[Dict[str, Any]], Any],
+        timeout: Optional[float] = None,
+        cacheable: bool = False,
+        stream: Optional[Callable[[Dict[str, Any]], AsyncIterator[Any]]] = None
+    ):
+        """Register a handler; stream optionally produces the same work incrementally for stream()"""
+        self.handlers[capability] = HandlerSpec(handler, timeout or self.default_timeout, cacheable, stream)
+
+    async def dispatch(self, capabilities: List[str], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Run every requested capability concurrently
+
+        parameters are shared by all handlers, except that a dict stored under
+        a capability's name is used as that capability's own parameters.
+        Raises RuntimeError only when every handler failed.
+        """
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+
+        async def run(capability: str):
+            own = parameters.get(capability)
+            try:
+                results[capability] = await self.call(capability, own if isinstance(own, dict) else parameters)
+            except TimeoutError:
+                errors[capability] = f"Timed out after {self.handlers[capability].timeout}s"
+            except Exception as e:
+                errors[capability] = str(e) or type(e).__name__
+
+        async with asyncio.TaskGroup() as group:
+            for capability in dict.fromkeys(capabilities):
+                group.create_task(run(capability))
+
+        if errors and not results:
+            raise RuntimeError("; ".join(f"{capability}: {error}" for capability, error in errors.items()))
+        return {"results": results, "errors": errors}
+
+    async def stream(self, capabilities: List[str], parameters: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Run every requested capability concurrently, yielding output as it is produced
+
+        Yields {"event": "chunk", "capability", "items"} for partial output,
+        then one {"event": "result", "capability", "result", "chunks"} or
+        {"event": "error", "capability", "error"} per capability, in
+        completion order. Items from a capability's stream callable are
+        forwarded one by one as they are produced. A plain handler's result
+        goes out whole, except that a long "results" list is sent as chunks
+        of stream_chunk_items followed by the rest of the result. The buffer
+        in front of the consumer is bounded, so a slow reader holds the
+        handlers back instead of letting output pile up; closing the
+        iterator cancels the handlers still running.
+        """
+        events: asyncio.Queue = asyncio.Queue(maxsize=self.stream_buffer)
+
+        async def run(capability: str):
+            own = parameters.get(capability)
+            own = own if isinstance(own, dict) else parameters
+            spec = self.handlers.get(capability)
+            try:
+                if spec is not None and spec.stream is not None:
+                    await self._pump(capability, spec, own, events)
+                else:
+                    for event in self._split(capability, await self.call(capability, own)):
+                        await events.put(event)
+            except TimeoutError:
+                await events.put({"event": "error", "capability": capability, "error": f"Timed out after {spec.timeout}s"})
+            except Exception as e:
+                await events.put({"event": "error", "capability": capability, "error": str(e) or type(e).__name__})
+            await events.put(None)
+
+        workers = [asyncio.create_task(run(capability)) for capability in dict.fromkeys(capabilities)]
+        running = len(workers)
+        try:
+            while running:
+                event = await events.get()
+                if event is None:
+                    running -= 1
+                else:
+                    yield event
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _pump(self, capability: str, spec: HandlerSpec, parameters: Dict[str, Any], events: asyncio.Queue):
+        """Forward a stream callable's items as chunk events under the handler's timeout"""
+        self.calls += 1
+        chunks = 0
+        try:
+            async with asyncio.timeout(spec.timeout):
+                async for item in spec.stream(parameters):
+                    await events.put({"event": "chunk", "capability": capability, "items": [_jsonable(item)]})
+                    chunks += 1
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        await events.put({"event": "result", "capability": capability, "result": None, "chunks": chunks})
+
+    def _split(self, capability: str, result: Any) -> Iterator[Dict[str, Any]]:
+        items = result.get("results") if isinstance(result, dict) else None
+        if not isinstance(items, list) or len(items) <= self.stream_chunk_items:
+            yield {"event": "result", "capability": capability, "result": result, "chunks": 0}
+            return
+
+        size = self.stream_chunk_items
+        for start in range(0, len(items), size):
+            yield {"event": "chunk", "capability": capability, "items": items[start:start + size]}
+        rest = {key: value for key, value in result.items() if key != "results"}
+        yield {"event": "result", "capability": capability, "result": rest, "chunks": -(-len(items) // size)}
+
+    async def call(self, capability: str, parameters: Dict[str, Any]) -> Any:
+        """Run one handler under its timeout, through the cache when it is cacheable"""
+        spec = self.handlers.get(capability)
+        if spec is None:
+            raise KeyError(f"No handler registered for {capability}")
+        self.calls += 1
+
+        if not spec.cacheable or self.cache_ttl <= 0:
+            return await self._invoke(spec, parameters)
+
+        key = _cache_key(capability, parameters)
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached and cached[0] > now:
+            self.cache_hits += 1
+            return await asyncio.shield(cached[1])
+
+        future = asyncio.get_running_loop().create_future()
+        self._cache[key] = (now + self.cache_ttl, future)
+        self._evict(now)
+        try:
+            result = await self._invoke(spec, parameters)
+        except BaseException as e:
+            # Failures are not cached; waiters sharing this call see the error
+            self._cache.pop(key, None)
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        future.set_result(result)
+        return result
+
+    async def _invoke(self, spec: HandlerSpec, parameters: Dict[str, Any]) -> Any:
+        try:
+            async with asyncio.timeout(spec.timeout):
+                result = spec.handler(parameters)
+                if inspect.isawaitable(result):
+                    result = await result
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        return _jsonable(result)
+
+    def _evict(self, now: float):
+        if len(self._cache) <= self.cache_size:
+            return
+        for key in [key for key, (expires, _) in self._cache.items() if expires <= now]:
+            del self._cache[key]
+        # Still too big: drop the oldest insertions
+        while len(self._cache) > self.cache_size:
+            del self._cache[next(iter(self._cache))]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "handlers": {
+                capability: {"timeout": spec.timeout, "cacheable": spec.cacheable, "streaming": spec.stream is not None}
+                for capability, spec in self.handlers.items()
+            },
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "cached": len(self._cache),
+            "timeouts": self.timeouts,
+            "errors": self.errors
+        }
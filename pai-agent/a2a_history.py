@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+A2A Message History
+Fixed-capacity ring buffer of compact message records with O(1) lookup by
+message id, correlation id and peer, plus an optional append-only JSONL
+spill log for auditing
+"""
+
+import json
+import logging
+import os
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, TextIO
+
+logger = logging.getLogger("pai-a2a-history")
+
+SENT = "sent"
+RECEIVED = "received"
+
+
+class MessageRecord:
+    """Metadata of one sent or received message; content is not kept in memory"""
+
+    __slots__ = (
+        "message_id", "correlation_id", "reply_to", "from_agent", "to_agent",
+        "message_type", "direction", "timestamp", "priority"
+    )
+
+    def __init__(
+        self,
+        message_id: str,
+        correlation_id: Optional[str],
+        reply_to: Optional[str],
+        from_agent: str,
+        to_agent: str,
+        message_type: str,
+        direction: str,
+        timestamp: datetime,
+        priority: int
+    ):
+        self.message_id = message_id
+        self.correlation_id = correlation_id
+        self.reply_to = reply_to
+        self.from_agent = from_agent
+        self.to_agent = to_agent
+        self.message_type = message_type
+        self.direction = direction
+        self.timestamp = timestamp
+        self.priority = priority
+
+    @property
+    def peer(self) -> str:
+        return self.to_agent if self.direction == SENT else self.from_agent
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "message_id": self.message_id,
+            "correlation_id": self.correlation_id,
+            "reply_to": self.reply_to,
+            "from_agent": self.from_agent,
+            "to_agent": self.to_agent,
+            "message_type": self.message_type,
+            "direction": self.direction,
+            "timestamp": self.timestamp.isoformat(),
+            "priority": self.priority
+        }
+
+
+class MessageHistory:
+    """Ring buffer of MessageRecords
+
+    Once full, each new record overwrites the oldest one. Records enter the
+    per-correlation and per-peer deques in the same order they enter the
+    ring, so the evicted record is always at the left of its deques and
+    eviction is O(1). When spill_path is set every record is also appended,
+    with its full content, to a JSON lines file that is never truncated.
+    """
+
+    def __init__(
+        self,
+        capacity: int = int(os.getenv("A2A_HISTORY_CAPACITY", "10000")),
+        spill_path: Optional[str] = os.getenv("A2A_HISTORY_LOG") or None
+    ):
+        if capacity < 1:
+            raise ValueError("Message history capacity must be at least 1")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._ring: List[Optional[MessageRecord]] = [None] * capacity
+        self._next = 0
+        self._size = 0
+        self._by_id: Dict[str, MessageRecord] = {}
+        self._by_correlation: Dict[str, Deque[MessageRecord]] = {}
+        self._by_peer: Dict[str, Deque[MessageRecord]] = {}
+        self._spill: Optional[TextIO] = None
+        self.recorded = 0
+        self.evicted = 0
+        self.spill_errors = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, message, direction: str) -> MessageRecord:
+        """Add an A2AMessage to the history, evicting the oldest record when full"""
+        record = MessageRecord(
+            message.message_id,
+            message.correlation_id,
+            message.reply_to,
+            message.from_agent,
+            message.to_agent,
+            message.message_type.value,
+            direction,
+            message.timestamp,
+            message.priority
+        )
+
+        evicted = self._ring[self._next]
+        if evicted is not None:
+            self._evict(evicted)
+        else:
+            self._size += 1
+
+        self._ring[self._next] = record
+        self._next = (self._next + 1) % self.capacity
+        self._by_id[record.message_id] = record
+        if record.correlation_id:
+            self._by_correlation.setdefault(record.correlation_id, deque()).append(record)
+        self._by_peer.setdefault(record.peer, deque()).append(record)
+        self.recorded += 1
+
+        if self.spill_path:
+            self._write_spill(record, message.content)
+        return record
+
+    def _evict(self, record: MessageRecord):
+        self.evicted += 1
+        if self._by_id.get(record.message_id) is record:
+            del self._by_id[record.message_id]
+        if record.correlation_id:
+            self._popleft(self._by_correlation, record.correlation_id, record)
+        self._popleft(self._by_peer, record.peer, record)
+
+    @staticmethod
+    def _popleft(index: Dict[str, Deque[MessageRecord]], key: str, record: MessageRecord):
+        records = index.get(key)
+        if records and records[0] is record:
+            records.popleft()
+            if not records:
+                del index[key]
+
+    def _write_spill(self, record: MessageRecord, content: Dict[str, Any]):
+        try:
+            if self._spill is None:
+                self._spill = open(self.spill_path, "a", encoding="utf-8")
+            entry = record.to_dict()
+            entry["content"] = content
+            self._spill.write(json.dumps(entry, default=str) + "\n")
+        except Exception as e:
+            # Auditing must never break messaging
+            self.spill_errors += 1
+            logger.warning(f"Failed to append to message log {self.spill_path}: {e}")
+
+    def get(self, message_id: str) -> Optional[MessageRecord]:
+        return self._by_id.get(message_id)
+
+    def by_correlation(self, correlation_id: str) -> List[MessageRecord]:
+        """Records sharing a correlation id, oldest first"""
+        return list(self._by_correlation.get(correlation_id, ()))
+
+    def by_peer(self, agent_id: str, limit: Optional[int] = None) -> List[MessageRecord]:
+        """Messages exchanged with one peer, newest first"""
+        records = self._by_peer.get(agent_id, ())
+        if limit is None:
+            return list(reversed(records))
+        result = []
+        for record in reversed(records):
+            if len(result) >= limit:
+                break
+            result.append(record)
+        return result
+
+    def recent(self, limit: int = 50) -> List[MessageRecord]:
+        """Newest records first"""
+        result = []
+        position = self._next
+        for _ in range(min(limit, self._size)):
+            position = (position - 1) % self.capacity
+            result.append(self._ring[position])
+        return result
+
+    def flush(self):
+        if self._spill is not None:
+            self._spill.flush()
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self._size,
+            "capacity": self.capacity,
+            "recorded": self.recorded,
+            "evicted": self.evicted,
+            "correlations": len(self._by_correlation),
+            "peers": len(self._by_peer),
+            "spill_path": self.spill_path,
+            "spill_errors": self.spill_errors
+        }
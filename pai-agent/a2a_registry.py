@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+A2A Agent Registry
+Known peers with a capability -> agents inverted index, change
+notifications for subscribers, and persistence to a local SQLite file so
+the network survives restarts
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger("pai-a2a-registry")
+
+# Runtime state lives under the agent's data directory, never the working directory
+DATA_DIR = os.getenv("PAI_AGENT_DATA_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_PATH = os.path.join(DATA_DIR, "a2a_registry.db")
+
+ADDED = "added"
+UPDATED = "updated"
+REMOVED = "removed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    agent_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    capabilities TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    last_seen REAL NOT NULL,
+    health_status TEXT NOT NULL,
+    response_time_avg REAL NOT NULL,
+    success_rate REAL NOT NULL,
+    metadata TEXT NOT NULL
+)
+"""
+
+
+class AgentRegistry:
+    """AgentProfiles keyed by agent id
+
+    agents is a plain dict that callers may read directly; all changes go
+    through register/remove/touch so the capability index, subscribers and
+    the store stay in step. Registration and removal are written through;
+    frequent last_seen and metric updates only mark the profile dirty and
+    are written by flush().
+    """
+
+    def __init__(
+        self,
+        profile_factory: Callable[[Dict[str, Any]], Any],
+        path: Optional[str] = os.getenv("A2A_REGISTRY_PATH", DEFAULT_PATH) or None
+    ):
+        self.profile_factory = profile_factory
+        self.path = path
+        self.agents: Dict[str, Any] = {}
+        self._by_capability: Dict[Any, Set[str]] = {}
+        self._subscribers: List[Callable[[str, Any], None]] = []
+        self._dirty: Set[str] = set()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if self.path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._db = sqlite3.connect(self.path)
+                self._db.execute(_SCHEMA)
+                self._load()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Agent registry at {self.path} unavailable, keeping peers in memory only: {e}")
+                self._db = None
+
+    def _load(self):
+        """Restore persisted peers; health is unknown until a heartbeat or reply confirms it"""
+        cursor = self._db.execute(
+            "SELECT agent_id, name, description, capabilities, endpoint, last_seen, "
+            "health_status, response_time_avg, success_rate, metadata FROM agents"
+        )
+        for row in cursor:
+            try:
+                profile = self.profile_factory({
+                    "agent_id": row[0],
+                    "name": row[1],
+                    "description": row[2],
+                    "capabilities": json.loads(row[3]),
+                    "endpoint": row[4],
+                    "last_seen": datetime.fromtimestamp(row[5]),
+                    "health_status": "unknown",
+                    "response_time_avg": row[7],
+                    "success_rate": row[8],
+                    "metadata": json.loads(row[9])
+                })
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable registry entry {row[0]}: {e}")
+                continue
+            self.agents[profile.agent_id] = profile
+            self._index(profile)
+        if self.agents:
+            logger.info(f"Loaded {len(self.agents)} agents from {self.path}")
+
+    def _index(self, profile):
+        for capability in profile.capabilities:
+            self._by_capability.setdefault(capability, set()).add(profile.agent_id)
+
+    def _unindex(self, profile):
+        for capability in profile.capabilities:
+            agent_ids = self._by_capability.get(capability)
+            if agent_ids is not None:
+                agent_ids.discard(profile.agent_id)
+                if not agent_ids:
+                    del self._by_capability[capability]
+
+    def subscribe(self, callback: Callable[[str, Any], None]):
+        """Call callback(event, profile) on every added, updated or removed agent"""
+        self._subscribers.append(callback)
+
+    def _publish(self, event: str, profile):
+        for callback in self._subscribers:
+            try:
+                callback(event, profile)
+            except Exception as e:
+                logger.error(f"Registry subscriber failed on {event} {profile.agent_id}: {e}")
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self.agents
+
+    def register(self, profile):
+        """Add or replace a profile, keeping learned metrics of a known agent"""
+        previous = self.agents.get(profile.agent_id)
+        if previous is not None:
+            self._unindex(previous)
+            profile.response_time_avg = previous.response_time_avg
+            profile.success_rate = previous.success_rate
+            if profile.health_status == "unknown":
+                profile.health_status = previous.health_status
+        self.agents[profile.agent_id] = profile
+        self._index(profile)
+        self._write([profile])
+        self._dirty.discard(profile.agent_id)
+        self._publish(UPDATED if previous is not None else ADDED, profile)
+
+    def remove(self, agent_id: str):
+        profile = self.agents.pop(agent_id, None)
+        if profile is None:
+            return
+        self._unindex(profile)
+        self._dirty.discard(agent_id)
+        if self._db is not None:
+            try:
+                with self._db:
+                    self._db.execute("DELETE FROM agents WHERE agent_id = ?", (agent_id,))
+            except sqlite3.Error as e:
+                logger.warning(f"Could not remove {agent_id} from the registry store: {e}")
+        self._publish(REMOVED, profile)
+
+    def touch(self, agent_id: str, seen: Optional[datetime] = None):
+        """Record that an agent was heard from; persisted on the next flush"""
+        profile = self.agents.get(agent_id)
+        if profile is not None:
+            profile.last_seen = seen or datetime.now()
+            self._dirty.add(agent_id)
+
+    def mark_dirty(self, agent_id: str):
+        if agent_id in self.agents:
+            self._dirty.add(agent_id)
+
+    def with_all(self, capabilities: Iterable[Any]) -> Set[str]:
+        """Agents that have every one of the capabilities (all agents if none are given)"""
+        capabilities = list(capabilities)
+        if not capabilities:
+            return set(self.agents)
+        sets = sorted((self._by_capability.get(capability, set()) for capability in capabilities), key=len)
+        return set(sets[0]).intersection(*sets[1:])
+
+    def with_any(self, capabilities: Iterable[Any]) -> Set[str]:
+        """Agents that have at least one of the capabilities"""
+        result: Set[str] = set()
+        for capability in capabilities:
+            result |= self._by_capability.get(capability, set())
+        return result
+
+    def flush(self) -> int:
+        """Write profiles changed since the last flush; returns how many were written"""
+        if not self._dirty:
+            return 0
+        profiles = [self.agents[agent_id] for agent_id in self._dirty if agent_id in self.agents]
+        self._dirty.clear()
+        self._write(profiles)
+        return len(profiles)
+
+    def _write(self, profiles: List[Any]):
+        if self._db is None or not profiles:
+            return
+        rows = [
+            (
+                profile.agent_id,
+                profile.name,
+                profile.description,
+                json.dumps(sorted(capability.value for capability in profile.capabilities)),
+                profile.endpoint,
+                profile.last_seen.timestamp(),
+                profile.health_status,
+                profile.response_time_avg,
+                profile.success_rate,
+                json.dumps(profile.metadata, default=str)
+            )
+            for profile in profiles
+        ]
+        try:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not persist {len(rows)} agents to {self.path}: {e}")
+
+    def close(self):
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "agents": len(self.agents),
+            "capabilities": {
+                getattr(capability, "value", capability): len(agent_ids)
+                for capability, agent_ids in self._by_capability.items()
+            },
+            "dirty": len(self._dirty),
+            "path": self.path if self._db is not None else None
+        }
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+A2A Routing
+Load-aware peer selection for delegated work: power-of-two-choices or
+least-outstanding routing over in-flight counts and EWMA latency tails,
+plus the hedge delay used for latency-critical tasks
+"""
+
+import logging
+import math
+import os
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger("pai-a2a-routing")
+
+# One-sided z-score for the 95th percentile of a normal distribution
+_Z95 = 1.645
+
+
+class LatencyEWMA:
+    """Exponentially weighted mean and variance of a latency series
+
+    The tail is estimated as mean + 1.645 standard deviations, which is cheap,
+    forgets old behaviour at the same rate as the mean and is close enough to
+    a true p95 to rank peers.
+    """
+
+    __slots__ = ("alpha", "mean", "variance", "samples")
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.variance = 0.0
+        self.samples = 0
+
+    def update(self, value: float):
+        if self.samples == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.samples += 1
+
+    @property
+    def p95(self) -> float:
+        return self.mean + _Z95 * math.sqrt(self.variance)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"mean": round(self.mean, 4), "p95": round(self.p95, 4), "samples": self.samples}
+
+
+class PeerLoad:
+    """Outstanding work and latency history for one peer"""
+
+    __slots__ = ("in_flight", "outstanding_tasks", "request", "task")
+
+    def __init__(self, alpha: float):
+        self.in_flight = 0
+        self.outstanding_tasks = 0
+        self.request = LatencyEWMA(alpha)
+        self.task = LatencyEWMA(alpha)
+
+    @property
+    def load(self) -> int:
+        return self.in_flight + self.outstanding_tasks
+
+
+@dataclass
+class RoutingConfig:
+    """Peer selection strategy and hedging settings"""
+    strategy: str = os.getenv("A2A_ROUTING_STRATEGY", "p2c")  # "p2c" or "least_outstanding"
+    ewma_alpha: float = 0.2
+    default_latency: float = 0.1  # assumed for peers with no samples, so new peers get tried
+    hedge_delay: float = float(os.getenv("A2A_HEDGE_DELAY", "2.0"))
+    min_hedge_delay: float = 0.05
+    hedge_min_samples: int = 5
+
+
+class AgentRouter:
+    """Chooses which peer gets the next delegated task
+
+    A peer's cost is its expected tail latency multiplied by the work it
+    already has outstanding (in-flight requests plus accepted but unfinished
+    tasks), divided by its success rate. "p2c" compares two random
+    candidates, which spreads load without herding onto one best peer;
+    "least_outstanding" scans all candidates.
+    """
+
+    def __init__(self, config: Optional[RoutingConfig] = None):
+        self.config = config or RoutingConfig()
+        self.peers: Dict[str, PeerLoad] = {}
+        self.task_latency = LatencyEWMA(self.config.ewma_alpha)
+        self.decisions = 0
+        self.hedges = 0
+
+    def _peer(self, agent_id: str) -> PeerLoad:
+        peer = self.peers.get(agent_id)
+        if peer is None:
+            peer = self.peers[agent_id] = PeerLoad(self.config.ewma_alpha)
+        return peer
+
+    def forget(self, agent_id: str):
+        self.peers.pop(agent_id, None)
+
+    def expected_latency(self, agent_id: str) -> float:
+        peer = self.peers.get(agent_id)
+        if peer is None:
+            return self.config.default_latency
+        if peer.task.samples:
+            return peer.task.p95
+        if peer.request.samples:
+            return peer.request.p95
+        return self.config.default_latency
+
+    def cost(self, agent_id: str, success_rate: float) -> float:
+        peer = self.peers.get(agent_id)
+        load = peer.load if peer else 0
+        return self.expected_latency(agent_id) * (load + 1) / max(success_rate, 0.05)
+
+    def choose(self, candidates: Sequence[Tuple[str, float]]) -> Optional[str]:
+        """Pick a peer from (agent_id, success_rate) candidates"""
+        if not candidates:
+            return None
+        self.decisions += 1
+        if len(candidates) == 1:
+            return candidates[0][0]
+
+        if self.config.strategy == "least_outstanding":
+            pool = candidates
+        else:
+            pool = random.sample(list(candidates), 2)
+        return min(pool, key=lambda candidate: self.cost(*candidate))[0]
+
+    def begin_request(self, agent_id: str):
+        self._peer(agent_id).in_flight += 1
+
+    def end_request(self, agent_id: str, latency: Optional[float]):
+        peer = self._peer(agent_id)
+        peer.in_flight = max(0, peer.in_flight - 1)
+        if latency is not None:
+            peer.request.update(latency)
+
+    def task_started(self, agent_id: str):
+        self._peer(agent_id).outstanding_tasks += 1
+
+    def task_finished(self, agent_id: str, latency: Optional[float]):
+        peer = self._peer(agent_id)
+        peer.outstanding_tasks = max(0, peer.outstanding_tasks - 1)
+        if latency is not None:
+            peer.task.update(latency)
+            self.task_latency.update(latency)
+
+    def hedge_delay(self) -> float:
+        """How long to wait before hedging: the pool-wide task p95 once known
+
+        Using the pool's tail rather than the primary's own means a peer that
+        is slow across the board still gets hedged.
+        """
+        if self.task_latency.samples < self.config.hedge_min_samples:
+            return self.config.hedge_delay
+        return max(self.config.min_hedge_delay, self.task_latency.p95)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.config.strategy,
+            "decisions": self.decisions,
+            "hedges": self.hedges,
+            "hedge_delay": round(self.hedge_delay(), 4),
+            "task_latency": self.task_latency.snapshot(),
+            "peers": {
+                agent_id: {
+                    "in_flight": peer.in_flight,
+                    "outstanding_tasks": peer.outstanding_tasks,
+                    "request_latency": peer.request.snapshot(),
+                    "task_latency": peer.task.snapshot()
+                }
+                for agent_id, peer in self.peers.items()
+            }
+        }
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+A2A Inbound Scheduler
+Bounded priority queue and worker pool for incoming A2A messages, with
+per-message-type concurrency limits, deadline-aware load shedding and a
+backpressure signal when saturated
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("pai-a2a-scheduler")
+
+
+class SchedulerOverloaded(Exception):
+    """Raised when a message is refused or shed because the inbound queue is full"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class MessageExpired(Exception):
+    """Raised when a queued message's deadline passes before a worker picks it up"""
+
+
+def _default_type_limits() -> Dict[str, int]:
+    return {"task_execution": int(os.getenv("A2A_TASK_CONCURRENCY", "4"))}
+
+
+def _default_type_priority() -> Dict[str, int]:
+    # Liveness and coordination traffic should never wait behind bulk work
+    return {"health_check": 10, "coordination": 5, "response": 5}
+
+
+@dataclass
+class SchedulerConfig:
+    """Worker pool, queue bound and per-type limits for inbound messages"""
+    workers: int = int(os.getenv("A2A_INBOUND_WORKERS", "16"))
+    max_queue_size: int = int(os.getenv("A2A_INBOUND_QUEUE_SIZE", "1000"))
+    retry_after: float = 1.0
+    type_limits: Dict[str, int] = field(default_factory=_default_type_limits)
+    type_priority: Dict[str, int] = field(default_factory=_default_type_priority)
+
+
+class _Job:
+    __slots__ = ("kind", "priority", "deadline", "run", "future", "enqueued")
+
+    def __init__(
+        self,
+        kind: str,
+        priority: int,
+        deadline: Optional[float],
+        run: Callable[[], Awaitable[Any]],
+        future: asyncio.Future
+    ):
+        self.kind = kind
+        self.priority = priority
+        self.deadline = deadline
+        self.run = run
+        self.future = future
+        self.enqueued = time.monotonic()
+
+    def expired(self, now: float) -> bool:
+        return self.deadline is not None and now >= self.deadline
+
+
+class InboundScheduler:
+    """Priority scheduler for inbound message handlers
+
+    Jobs wait in one heap per message type, ordered by effective priority
+    (message priority plus the type's boost) and then arrival. A free worker
+    takes the highest-priority head among the types still under their
+    concurrency limit, so a burst of delegated tasks cannot occupy every
+    worker. When the queue is full, expired jobs are dropped first, then the
+    lowest-priority queued job is shed if the newcomer outranks it; otherwise
+    the newcomer is refused with SchedulerOverloaded.
+    """
+
+    def __init__(self, config: Optional[SchedulerConfig] = None):
+        self.config = config or SchedulerConfig()
+        self._queues: Dict[str, List[Tuple[int, int, _Job]]] = {}
+        self._running: Dict[str, int] = {}
+        self._queued = 0
+        self._sequence = itertools.count()
+        self._available: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.shed = 0
+        self.expired = 0
+
+    def _ensure_workers(self):
+        if self._workers:
+            return
+        self._available = asyncio.Condition()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"a2a-inbound-{index}")
+            for index in range(self.config.workers)
+        ]
+
+    async def submit(
+        self,
+        kind: str,
+        run: Callable[[], Awaitable[Any]],
+        priority: int = 0,
+        deadline: Optional[float] = None
+    ) -> Any:
+        """Queue run() and wait for its result
+
+        deadline is a time.monotonic() value after which the job is dropped
+        with MessageExpired instead of being run.
+        """
+        self._ensure_workers()
+        priority += self.config.type_priority.get(kind, 0)
+        job = _Job(kind, priority, deadline, run, asyncio.get_running_loop().create_future())
+
+        async with self._available:
+            if self._queued >= self.config.max_queue_size:
+                self._make_room(job)
+            heapq.heappush(self._queues.setdefault(kind, []), (-priority, next(self._sequence), job))
+            self._queued += 1
+            self._available.notify()
+
+        return await job.future
+
+    def _make_room(self, incoming: _Job):
+        now = time.monotonic()
+        for kind, queue in self._queues.items():
+            live = []
+            for entry in queue:
+                job = entry[2]
+                if job.expired(now) or job.future.done():
+                    self._drop(job, MessageExpired("Message deadline passed while queued"))
+                    self.expired += 1
+                else:
+                    live.append(entry)
+            if len(live) != len(queue):
+                heapq.heapify(live)
+                self._queues[kind] = live
+        self._queued = sum(len(queue) for queue in self._queues.values())
+        if self._queued < self.config.max_queue_size:
+            return
+
+        # Shed the lowest-priority, most recently queued job if the newcomer outranks it
+        victim_kind, victim_entry = max(
+            ((kind, entry) for kind, queue in self._queues.items() for entry in queue),
+            key=lambda item: (item[1][0], item[1][1])
+        )
+        victim = victim_entry[2]
+        if victim.priority >= incoming.priority:
+            self.rejected += 1
+            raise SchedulerOverloaded("Inbound queue is full", self.config.retry_after)
+
+        queue = self._queues[victim_kind]
+        queue.remove(victim_entry)
+        heapq.heapify(queue)
+        self._queued -= 1
+        self.shed += 1
+        self._drop(victim, SchedulerOverloaded("Shed for higher-priority traffic", self.config.retry_after))
+
+    @staticmethod
+    def _drop(job: _Job, error: Exception):
+        if not job.future.done():
+            job.future.set_exception(error)
+
+    def _next_job(self) -> Optional[_Job]:
+        """Pop the best runnable job, discarding expired or abandoned ones on the way"""
+        now = time.monotonic()
+        while True:
+            best_kind = None
+            for kind, queue in self._queues.items():
+                if not queue:
+                    continue
+                limit = self.config.type_limits.get(kind)
+                if limit is not None and self._running.get(kind, 0) >= limit:
+                    continue
+                if best_kind is None or queue[0][:2] < self._queues[best_kind][0][:2]:
+                    best_kind = kind
+            if best_kind is None:
+                return None
+
+            _, _, job = heapq.heappop(self._queues[best_kind])
+            self._queued -= 1
+            if job.future.done():
+                continue
+            if job.expired(now):
+                self.expired += 1
+                self._drop(job, MessageExpired("Message deadline passed while queued"))
+                continue
+            self._running[best_kind] = self._running.get(best_kind, 0) + 1
+            return job
+
+    async def _worker(self):
+        while True:
+            async with self._available:
+                job = self._next_job()
+                while job is None:
+                    await self._available.wait()
+                    job = self._next_job()
+
+            try:
+                result = await job.run()
+            except asyncio.CancelledError:
+                self._drop(job, MessageExpired("Scheduler stopped"))
+                raise
+            except Exception as e:
+                self.failed += 1
+                self._drop(job, e)
+            else:
+                self.completed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                async with self._available:
+                    self._running[job.kind] -= 1
+                    # A type that was at its limit may now be runnable
+                    self._available.notify_all()
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for queue in self._queues.values():
+            for _, _, job in queue:
+                self._drop(job, MessageExpired("Scheduler stopped"))
+        self._queues.clear()
+        self._queued = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "queued": self._queued,
+            "max_queue_size": self.config.max_queue_size,
+            "queued_by_type": {kind: len(queue) for kind, queue in self._queues.items() if queue},
+            "running_by_type": {kind: count for kind, count in self._running.items() if count},
+            "type_limits": dict(self.config.type_limits),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "shed": self.shed,
+            "expired": self.expired
+        }
@@ -8,16 +8,31 @@ import asyncio
 import json
 import os
 import time
-from typing import Dict, List, Any, Optional, Set, Callable, Awaitable
-from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Set, Tuple, Callable, Awaitable, AsyncIterator, Deque
+from collections import deque
+from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from enum import Enum
 import hashlib
 import httpx
 import logging
 
+from a2a_batching import MessageCoalescer
+from a2a_circuit import CircuitBreakers
+from a2a_codec import MessageCodec
+from a2a_dispatch import CapabilityDispatcher
+from a2a_registry import REMOVED, AgentRegistry
+from a2a_history import MessageHistory, RECEIVED, SENT
+from a2a_routing import AgentRouter
+from a2a_scheduler import InboundScheduler, MessageExpired, SchedulerOverloaded
+from a2a_transport import A2ATransport
+
 logger = logging.getLogger("pai-a2a")
 
+# Profile metadata flags for peers that accept /a2a/v1/batch and /a2a/v1/stream
+BATCH_KEY = "a2a_batch"
+STREAM_KEY = "a2a_stream"
+
 
 class MessageType(Enum):
     """Types of A2A messages"""
@@ -31,6 +46,10 @@ class MessageType(Enum):
     TASK_DELEGATION = "task_delegation"
 
 
+# Fire-and-forget traffic that is coalesced per peer when the peer accepts batches
+BATCHABLE_TYPES = {MessageType.NOTIFICATION, MessageType.BROADCAST}
+
+
 class AgentCapability(Enum):
     """Agent capabilities for coordination"""
     RAG_RETRIEVAL = "rag_retrieval"
@@ -86,28 +105,167 @@ class TaskDelegation:
     deadline: Optional[datetime] = None
     priority: int = 0
     delegate_to: Optional[str] = None
+    hedged_to: Optional[str] = None
+    completed_by: Optional[str] = None
+    status: str = "pending"  # pending, accepted, completed, failed, rejected or expired
+    result: Any = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "rejected", "expired")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.task_id,
+            "task_type": self.task_type,
+            "description": self.description,
+            "delegate_to": self.delegate_to,
+            "hedged_to": self.hedged_to,
+            "completed_by": self.completed_by,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "priority": self.priority,
+            "deadline": self.deadline.isoformat() if self.deadline else None,
+            "created_at": self.created_at.isoformat(),
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None
+        }
+
+
+@dataclass
+class PeerOutcome:
+    """Result of sending one message to one peer"""
+    agent_id: str
+    status: str  # "delivered", "failed", "timeout" or "circuit_open"
+    latency: Optional[float] = None
+    message_id: Optional[str] = None
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def delivered(self) -> bool:
+        return self.status == "delivered"
+
+
+@dataclass
+class FanOutResult:
+    """Per-peer outcomes of a concurrent fan-out"""
+    outcomes: Dict[str, PeerOutcome]
+    elapsed: float
+
+    @property
+    def delivered(self) -> List[str]:
+        return [agent_id for agent_id, outcome in self.outcomes.items() if outcome.delivered]
+
+    @property
+    def failed(self) -> List[str]:
+        return [agent_id for agent_id, outcome in self.outcomes.items() if not outcome.delivered]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "elapsed": self.elapsed,
+            "delivered": len(self.delivered),
+            "failed": len(self.failed),
+            "outcomes": {agent_id: asdict(outcome) for agent_id, outcome in self.outcomes.items()}
+        }
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    """Format a stream event as a server-sent event named after its "event" key"""
+    data = {key: value for key, value in event.items() if key != "event"}
+    return f"event: {event['event']}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 class A2ANetworkManager:
     """Manages agent-to-agent communication network"""
 
-    def __init__(self, agent_id: str, agent_name: str, endpoint: str):
+    def __init__(
+        self,
+        agent_id: str,
+        agent_name: str,
+        endpoint: str,
+        fanout_concurrency: int = int(os.getenv("A2A_FANOUT_CONCURRENCY", "32")),
+        peer_timeout: float = float(os.getenv("A2A_PEER_TIMEOUT", "10.0")),
+        transport: Optional[A2ATransport] = None,
+        history: Optional[MessageHistory] = None,
+        scheduler: Optional[InboundScheduler] = None,
+        task_retention: float = float(os.getenv("A2A_TASK_RETENTION", "300")),
+        task_lifetime: float = float(os.getenv("A2A_TASK_LIFETIME", "3600")),
+        dispatcher: Optional[CapabilityDispatcher] = None,
+        router: Optional[AgentRouter] = None,
+        breakers: Optional[CircuitBreakers] = None,
+        codec: Optional[MessageCodec] = None,
+        coalescer: Optional[MessageCoalescer] = None,
+        registry: Optional[AgentRegistry] = None,
+        heartbeat_interval: float = float(os.getenv("A2A_HEARTBEAT_INTERVAL", "30")),
+        peer_expiry: float = float(os.getenv("A2A_PEER_EXPIRY", "86400"))
+    ):
         self.agent_id = agent_id
         self.agent_name = agent_name
         self.endpoint = endpoint
-        self.agents: Dict[str, AgentProfile] = {}
+        self.registry = registry or AgentRegistry(self._profile_from_record)
+        self.agents: Dict[str, AgentProfile] = self.registry.agents
+        self.heartbeat_interval = heartbeat_interval
+        self.peer_expiry = peer_expiry
+        self._heartbeat: Optional[asyncio.Task] = None
         self.message_handlers: Dict[MessageType, Callable] = {}
         self.capability_handlers: Dict[AgentCapability, Callable] = {}
+        self.dispatcher = dispatcher or CapabilityDispatcher()
+        self.router = router or AgentRouter()
+        self.breakers = breakers or CircuitBreakers()
+        self.codec = codec or MessageCodec()
+        self.coalescer = coalescer or MessageCoalescer(self._send_batch)
         self.active_tasks: Dict[str, TaskDelegation] = {}
-        self.message_history: List[A2AMessage] = []
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.task_retention = task_retention
+        self.task_lifetime = task_lifetime
+        self._task_futures: Dict[str, asyncio.Future] = {}
+        self._task_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._task_callbacks: Dict[str, Callable[[TaskDelegation], Any]] = {}
+        self._finished_tasks: Deque[Tuple[float, str]] = deque()
+        self._executions: Dict[str, asyncio.Task] = {}
+        self._hedges: Dict[str, asyncio.Task] = {}
+        self.message_history = history or MessageHistory()
+        self.scheduler = scheduler or InboundScheduler()
+        self.transport = transport or A2ATransport()
+        self.client = self.transport.client
+        self.fanout_concurrency = fanout_concurrency
+        self.peer_timeout = peer_timeout
+        self.registry.subscribe(self._on_registry_change)
         self._setup_default_handlers()
 
+    def _on_registry_change(self, event: str, profile: AgentProfile):
+        """Drop routing and circuit state for agents that leave the registry"""
+        if event == REMOVED:
+            self.router.forget(profile.agent_id)
+            self.breakers.forget(profile.agent_id)
+
     def _setup_default_handlers(self):
         """Setup default message handlers"""
         self.register_handler(MessageType.HEALTH_CHECK, self._handle_health_check)
         self.register_handler(MessageType.CAPABILITY_QUERY, self._handle_capability_query)
         self.register_handler(MessageType.TASK_DELEGATION, self._handle_task_delegation)
+        self.register_handler(MessageType.RESPONSE, self._handle_response)
+
+    async def close(self):
+        """Stop background work, close pooled peer connections, the message log and the registry"""
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        background = list(self._executions.values()) + list(self._hedges.values())
+        for job in background:
+            job.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        for timer in self._task_timers.values():
+            timer.cancel()
+        await self.coalescer.close()
+        await self.scheduler.stop()
+        await self.transport.aclose()
+        self.message_history.close()
+        self.registry.close()
 
     def register_handler(
         self,
@@ -120,10 +278,20 @@ class A2ANetworkManager:
     def register_capability_handler(
         self,
         capability: AgentCapability,
-        handler: Callable[[Dict[str, Any]], Awaitable[Any]]
+        handler: Callable[[Dict[str, Any]], Awaitable[Any]],
+        timeout: Optional[float] = None,
+        cacheable: bool = False,
+        stream: Optional[Callable[[Dict[str, Any]], AsyncIterator[Any]]] = None
     ):
-        """Register a capability handler"""
+        """Register a capability handler
+
+        cacheable marks handlers whose result depends only on their parameters,
+        so repeated delegations can be answered from the dispatcher's cache.
+        stream is an optional async-generator version of the handler whose
+        items are forwarded to streaming delegators as they are produced.
+        """
         self.capability_handlers[capability] = handler
+        self.dispatcher.register(capability.value, handler, timeout=timeout, cacheable=cacheable, stream=stream)
 
     async def register_agent(
         self,
@@ -144,32 +312,100 @@ class A2ANetworkManager:
             last_seen=datetime.now(),
             metadata=metadata or {}
         )
-        self.agents[agent_id] = profile
+        self.registry.register(profile)
         logger.info(f"Registered agent: {name} ({agent_id}) with {len(capabilities)} capabilities")
 
-    async def discover_agents(self, discovery_endpoints: List[str]) -> List[str]:
-        """Discover other agents in the network"""
-        discovered = []
+    @staticmethod
+    def _profile_from_record(record: Dict[str, Any]) -> AgentProfile:
+        """Rebuild a persisted profile; raises ValueError for capabilities this version does not know"""
+        return AgentProfile(
+            agent_id=record["agent_id"],
+            name=record["name"],
+            description=record["description"],
+            capabilities={AgentCapability(cap) for cap in record["capabilities"]},
+            endpoint=record["endpoint"],
+            last_seen=record["last_seen"],
+            health_status=record["health_status"],
+            response_time_avg=record["response_time_avg"],
+            success_rate=record["success_rate"],
+            metadata=record["metadata"]
+        )
 
-        for endpoint in discovery_endpoints:
+    async def discover_agents(self, discovery_endpoints: List[str]) -> List[str]:
+        """Discover other agents in the network, probing endpoints concurrently"""
+        semaphore = asyncio.Semaphore(self.fanout_concurrency)
+        discovered: Dict[str, str] = {}
+
+        async def probe(endpoint: str):
+            async with semaphore:
+                try:
+                    async with asyncio.timeout(self.peer_timeout):
+                        response = await self.client.get(f"{endpoint}/a2a/v1/profile")
+                    if response.status_code == 200:
+                        profile_data = response.json()
+                        await self.register_agent(
+                            agent_id=profile_data["agent_id"],
+                            name=profile_data["name"],
+                            description=profile_data["description"],
+                            capabilities=set(AgentCapability(cap) for cap in profile_data["capabilities"]),
+                            endpoint=endpoint,
+                            metadata=profile_data.get("metadata", {})
+                        )
+                        discovered[endpoint] = profile_data["agent_id"]
+
+                except Exception as e:
+                    logger.warning(f"Failed to discover agent at {endpoint}: {e!r}")
+
+        async with asyncio.TaskGroup() as group:
+            for endpoint in dict.fromkeys(discovery_endpoints):
+                group.create_task(probe(endpoint))
+
+        return [discovered[endpoint] for endpoint in dict.fromkeys(discovery_endpoints) if endpoint in discovered]
+
+    def start(self):
+        """Start the heartbeat loop; call from a running event loop"""
+        if self._heartbeat is None and self.heartbeat_interval > 0:
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop(), name="a2a-heartbeat")
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
             try:
-                response = await self.client.get(f"{endpoint}/a2a/v1/profile")
-                if response.status_code == 200:
-                    profile_data = response.json()
-                    await self.register_agent(
-                        agent_id=profile_data["agent_id"],
-                        name=profile_data["name"],
-                        description=profile_data["description"],
-                        capabilities=set(AgentCapability(cap) for cap in profile_data["capabilities"]),
-                        endpoint=endpoint,
-                        metadata=profile_data.get("metadata", {})
-                    )
-                    discovered.append(profile_data["agent_id"])
-
+                await self.heartbeat()
             except Exception as e:
-                logger.warning(f"Failed to discover agent at {endpoint}: {e}")
+                logger.error(f"A2A heartbeat failed: {e}")
 
-        return discovered
+    async def heartbeat(self) -> Dict[str, Any]:
+        """Health-check peers not heard from within the heartbeat interval, expire long-silent ones
+        and persist registry changes
+        """
+        now = datetime.now()
+        quiet = timedelta(seconds=self.heartbeat_interval)
+        expiry = timedelta(seconds=self.peer_expiry)
+
+        expired = [
+            agent_id for agent_id, profile in self.agents.items()
+            if agent_id != self.agent_id and now - profile.last_seen > expiry
+        ]
+        for agent_id in expired:
+            logger.info(f"Removing agent {agent_id}: not seen for {self.peer_expiry:.0f}s")
+            self.registry.remove(agent_id)
+
+        stale = [
+            agent_id for agent_id, profile in self.agents.items()
+            if agent_id != self.agent_id and now - profile.last_seen > quiet and self.breakers.available(agent_id)
+        ]
+        result = None
+        if stale:
+            result = await self.fan_out(stale, MessageType.HEALTH_CHECK, {"timestamp": now.isoformat()})
+
+        persisted = self.registry.flush()
+        return {
+            "probed": len(stale),
+            "reachable": len(result.delivered) if result else 0,
+            "expired": expired,
+            "persisted": persisted
+        }
 
     async def send_message(
         self,
@@ -179,12 +415,42 @@ class A2ANetworkManager:
         correlation_id: Optional[str] = None,
         reply_to: Optional[str] = None,
         ttl: Optional[int] = None,
-        priority: int = 0
+        priority: int = 0,
+        batch: Optional[bool] = None
     ) -> Optional[A2AMessage]:
-        """Send a message to another agent"""
+        """Send a message to another agent
+
+        batch=None coalesces notifications and broadcasts to peers that accept
+        batches; True or False forces the choice (True still needs peer support).
+        """
+        message, _ = await self._send(
+            to_agent, message_type, content,
+            correlation_id=correlation_id, reply_to=reply_to, ttl=ttl, priority=priority, batch=batch
+        )
+        return message
+
+    def _should_batch(self, to_agent: str, message_type: MessageType, batch: Optional[bool]) -> bool:
+        if batch is False or not self.coalescer.enabled:
+            return False
+        if not self.agents[to_agent].metadata.get(BATCH_KEY):
+            return False
+        return batch is True or message_type in BATCHABLE_TYPES
+
+    async def _send(
+        self,
+        to_agent: str,
+        message_type: MessageType,
+        content: Dict[str, Any],
+        correlation_id: Optional[str] = None,
+        reply_to: Optional[str] = None,
+        ttl: Optional[int] = None,
+        priority: int = 0,
+        batch: Optional[bool] = None
+    ) -> Tuple[Optional[A2AMessage], PeerOutcome]:
+        """Send a message and report the peer's outcome alongside it"""
         if to_agent not in self.agents:
             logger.error(f"Agent {to_agent} not found in network")
-            return None
+            return None, PeerOutcome(to_agent, "failed", error="Agent not found in network")
 
         message_id = self._generate_message_id()
         message = A2AMessage(
@@ -200,71 +466,377 @@ class A2ANetworkManager:
             priority=priority
         )
 
+        if self._should_batch(to_agent, message_type, batch):
+            if not self.breakers.available(to_agent):
+                return None, PeerOutcome(to_agent, "circuit_open", error="Circuit open; peer skipped")
+            return await self.coalescer.submit(to_agent, message)
+
+        # Encode before claiming the breaker: an unencodable message is not the peer's fault
+        content_type, compress = self.codec.negotiate(self.agents[to_agent].metadata)
+        try:
+            body, headers = self.codec.encode(message, content_type, compress)
+        except Exception as e:
+            logger.error(f"Could not encode message to {to_agent}: {e}")
+            return None, PeerOutcome(to_agent, "failed", message_id=message_id, error=f"Unencodable message: {e}")
+
+        # A peer behind an open circuit is refused locally instead of waiting out a timeout
+        if not self.breakers.allow(to_agent):
+            return None, PeerOutcome(to_agent, "circuit_open", error="Circuit open; peer skipped")
+
+        response, response_time, failure = await self._post(to_agent, "/a2a/v1/message", body, headers)
+
+        if failure:
+            return None, PeerOutcome(to_agent, failure[0], latency=response_time, message_id=message_id, error=failure[1])
+
+        if response.status_code == 200:
+            self.message_history.record(message, SENT)
+            logger.info(f"Message sent to {to_agent}: {message_type.value}")
+            try:
+                reply = response.json()
+            except ValueError:
+                reply = None
+            return message, PeerOutcome(
+                to_agent, "delivered", latency=response_time, message_id=message_id, response=reply
+            )
+
+        logger.error(f"Failed to send message to {to_agent}: {response.status_code}")
+        return None, PeerOutcome(
+            to_agent, "failed", latency=response_time, message_id=message_id,
+            error=f"HTTP {response.status_code}"
+        )
+
+    async def _send_batch(
+        self,
+        to_agent: str,
+        messages: List[A2AMessage]
+    ) -> List[Tuple[Optional[A2AMessage], PeerOutcome]]:
+        """Deliver coalesced messages to a peer's batch endpoint in one request"""
+        def fail_all(status: str, error: str, latency: Optional[float] = None):
+            return [
+                (None, PeerOutcome(to_agent, status, latency=latency, message_id=message.message_id, error=error))
+                for message in messages
+            ]
+
+        if to_agent not in self.agents:
+            return fail_all("failed", "Agent not found in network")
+        content_type, compress = self.codec.negotiate(self.agents[to_agent].metadata)
+        try:
+            body, headers = self.codec.encode_batch(messages, content_type, compress)
+        except Exception as e:
+            logger.error(f"Could not encode batch of {len(messages)} to {to_agent}: {e}")
+            return fail_all("failed", f"Unencodable batch: {e}")
+        if not self.breakers.allow(to_agent):
+            return fail_all("circuit_open", "Circuit open; peer skipped")
+        response, response_time, failure = await self._post(to_agent, "/a2a/v1/batch", body, headers)
+
+        if failure:
+            return fail_all(failure[0], failure[1], response_time)
+        if response.status_code != 200:
+            logger.error(f"Failed to send batch of {len(messages)} to {to_agent}: {response.status_code}")
+            return fail_all("failed", f"HTTP {response.status_code}", response_time)
+
+        try:
+            replies = response.json()["results"]
+        except (ValueError, KeyError) as e:
+            return fail_all("failed", f"Malformed batch reply: {e}", response_time)
+        if len(replies) != len(messages):
+            return fail_all(
+                "failed", f"Malformed batch reply: {len(replies)} results for {len(messages)} messages", response_time
+            )
+
+        outcomes = []
+        for message, reply in zip(messages, replies):
+            if reply.get("status") == "success":
+                self.message_history.record(message, SENT)
+                outcomes.append((message, PeerOutcome(
+                    to_agent, "delivered", latency=response_time, message_id=message.message_id, response=reply
+                )))
+            else:
+                outcomes.append((None, PeerOutcome(
+                    to_agent, "failed", latency=response_time, message_id=message.message_id,
+                    response=reply, error=reply.get("message") or reply.get("status")
+                )))
+        logger.info(f"Batch of {len(messages)} messages sent to {to_agent}")
+        return outcomes
+
+    async def _post(
+        self,
+        to_agent: str,
+        path: str,
+        body: bytes,
+        headers: Dict[str, str]
+    ) -> Tuple[Optional[httpx.Response], Optional[float], Optional[Tuple[str, str]]]:
+        """POST an encoded body to a peer, waiting for the reply under its adaptive read timeout
+
+        Updates agent metrics, routing load and the circuit breaker. Returns
+        the response and its latency, or a (status, error) failure when no
+        response arrived.
+        """
         agent_profile = self.agents[to_agent]
+        peer_load = self.router.peers.get(to_agent)
+        timeout = self.breakers.timeout_for(peer_load.request if peer_load else None)
+        self.router.begin_request(to_agent)
+        response_time = None
 
         try:
             start_time = time.time()
             response = await self.client.post(
-                f"{agent_profile.endpoint}/a2a/v1/message",
-                json=self._message_to_dict(message),
-                headers={"Content-Type": "application/json"}
+                f"{agent_profile.endpoint}{path}",
+                content=body,
+                headers=headers,
+                timeout=self.transport.timeout(read=timeout)
             )
             response_time = time.time() - start_time
 
             # Update agent metrics
             self._update_agent_metrics(to_agent, response.status_code == 200, response_time)
-
-            if response.status_code == 200:
-                self.message_history.append(message)
-                logger.info(f"Message sent to {to_agent}: {message_type.value}")
-                return message
+            if response.status_code == 429 or response.status_code >= 500:
+                self.breakers.record_failure(to_agent)
             else:
-                logger.error(f"Failed to send message to {to_agent}: {response.status_code}")
-                return None
+                self.breakers.record_success(to_agent)
+            return response, response_time, None
 
+        except httpx.TimeoutException as e:
+            logger.error(f"Timed out sending to {to_agent} (read timeout {timeout:.2f}s): {e!r}")
+            self._update_agent_metrics(to_agent, False, None)
+            self.breakers.record_failure(to_agent)
+            return None, None, ("timeout", f"No reply within {timeout:.2f}s")
+        except asyncio.CancelledError:
+            # Abandoned by a caller-side timeout (e.g. fan_out); counts against the peer
+            self.breakers.record_failure(to_agent)
+            raise
         except Exception as e:
             logger.error(f"Error sending message to {to_agent}: {e}")
             self._update_agent_metrics(to_agent, False, None)
-            return None
+            self.breakers.record_failure(to_agent)
+            return None, None, ("failed", str(e))
+        finally:
+            self.router.end_request(to_agent, response_time)
 
-    async def broadcast_message(
+    async def fan_out(
         self,
+        agent_ids: List[str],
         message_type: MessageType,
         content: Dict[str, Any],
-        exclude_agents: Optional[Set[str]] = None
-    ) -> List[str]:
-        """Broadcast a message to all agents in the network"""
+        timeout: Optional[float] = None
+    ) -> FanOutResult:
+        """Send one message to many peers concurrently
+
+        At most fanout_concurrency sends are in flight and each peer gets its
+        own timeout, so a slow or dead peer only costs its own slot. Every
+        peer gets an outcome; failures never cancel the other sends.
+        """
+        timeout = timeout or self.peer_timeout
+        semaphore = asyncio.Semaphore(self.fanout_concurrency)
+        outcomes: Dict[str, PeerOutcome] = {}
+        started = time.perf_counter()
+
+        async def reach(agent_id: str):
+            async with semaphore:
+                began = time.perf_counter()
+                try:
+                    async with asyncio.timeout(timeout):
+                        _, outcome = await self._send(agent_id, message_type, content)
+                except TimeoutError:
+                    self._update_agent_metrics(agent_id, False, None)
+                    outcome = PeerOutcome(
+                        agent_id, "timeout", latency=time.perf_counter() - began,
+                        error=f"No reply within {timeout}s"
+                    )
+                except Exception as e:
+                    # One bad peer must not cancel the TaskGroup and the other sends
+                    logger.error(f"Fan-out to {agent_id} failed: {e}")
+                    outcome = PeerOutcome(
+                        agent_id, "failed", latency=time.perf_counter() - began, error=str(e)
+                    )
+                outcomes[agent_id] = outcome
+
+        async with asyncio.TaskGroup() as group:
+            for agent_id in agent_ids:
+                group.create_task(reach(agent_id))
+
+        return FanOutResult(
+            outcomes={agent_id: outcomes[agent_id] for agent_id in agent_ids},
+            elapsed=time.perf_counter() - started
+        )
+
+    def _peer_ids(self, exclude_agents: Optional[Set[str]] = None) -> List[str]:
         exclude_agents = exclude_agents or set()
-        successful_sends = []
+        return [
+            agent_id for agent_id in self.agents
+            if agent_id not in exclude_agents and agent_id != self.agent_id
+        ]
 
-        for agent_id in self.agents:
-            if agent_id not in exclude_agents and agent_id != self.agent_id:
-                message = await self.send_message(agent_id, message_type, content)
-                if message:
-                    successful_sends.append(agent_id)
+    async def broadcast_message(
+        self,
+        message_type: MessageType,
+        content: Dict[str, Any],
+        exclude_agents: Optional[Set[str]] = None,
+        timeout: Optional[float] = None
+    ) -> FanOutResult:
+        """Broadcast a message to all agents in the network concurrently"""
+        return await self.fan_out(self._peer_ids(exclude_agents), message_type, content, timeout=timeout)
 
-        return successful_sends
+    async def handle_incoming_payload(
+        self,
+        body: bytes,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Decode a raw A2A request body in any negotiated encoding and handle it"""
+        try:
+            message_data = self.codec.decode(body, content_type, content_encoding)
+        except Exception as e:
+            logger.error(f"Could not decode incoming A2A message ({content_type}, {content_encoding}): {e}")
+            return {"status": "error", "message": f"Undecodable message: {e}"}
+        return await self.handle_incoming_message(message_data)
+
+    async def handle_incoming_batch(
+        self,
+        body: bytes,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Decode a batch envelope and handle its messages concurrently, one result per message"""
+        try:
+            messages = self.codec.decode_batch(body, content_type, content_encoding)
+        except Exception as e:
+            logger.error(f"Could not decode incoming A2A batch ({content_type}, {content_encoding}): {e}")
+            return {"status": "error", "message": f"Undecodable batch: {e}"}
+
+        results = await asyncio.gather(*(self.handle_incoming_message(message) for message in messages))
+        return {"status": "success", "results": list(results)}
+
+    async def handle_incoming_stream(
+        self,
+        body: bytes,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Run a TASK_DELEGATION posted to the stream endpoint, yielding server-sent events
+
+        After an "accepted" event the task's chunk, result and error events
+        (see CapabilityDispatcher.stream) are relayed as they are produced,
+        and a final "done" event carries the per-capability errors. A task
+        that cannot run ends with an "error" event instead. The task counts
+        against the scheduler's task_execution limit like any delegation.
+        """
+        try:
+            message = self._dict_to_message(self.codec.decode(body, content_type, content_encoding))
+            if message.message_type != MessageType.TASK_DELEGATION:
+                raise ValueError(f"Only {MessageType.TASK_DELEGATION.value} messages can be streamed")
+            task_data = message.content
+            capabilities = self._task_capabilities(task_data)
+        except Exception as e:
+            logger.error(f"Rejected streamed A2A task: {e}")
+            yield _sse({"event": "error", "status": "rejected", "error": str(e)})
+            return
+
+        self.registry.touch(message.from_agent)
+        self.message_history.record(message, RECEIVED)
+        task_id = task_data.get("task_id")
+        deadline = datetime.fromisoformat(task_data["deadline"]) if task_data.get("deadline") else None
+        remaining = self._seconds_until(deadline)
+
+        events: asyncio.Queue = asyncio.Queue(maxsize=self.dispatcher.stream_buffer)
+        producer: Optional[asyncio.Task] = None
+        closed = False
+
+        async def forward():
+            async for event in self.dispatcher.stream(capabilities, task_data.get("parameters", {})):
+                await events.put(event)
+
+        async def run():
+            # Runs on a scheduler worker; the work happens in its own task so a
+            # reader that disconnects can cancel it without cancelling the worker
+            nonlocal producer
+            if closed:
+                return
+            producer = asyncio.create_task(forward())
+            await asyncio.wait({producer})
+            if not producer.cancelled():
+                producer.result()
+
+        job = asyncio.ensure_future(self.scheduler.submit(
+            "task_execution",
+            run,
+            priority=task_data.get("priority", 0),
+            deadline=time.monotonic() + remaining if remaining is not None else None
+        ))
+        errors: Dict[str, str] = {}
+        started = time.perf_counter()
+        try:
+            yield _sse({"event": "accepted", "task_id": task_id, "capabilities": capabilities})
+            while True:
+                getter = asyncio.ensure_future(events.get())
+                await asyncio.wait({getter, job}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    if events.empty():
+                        break
+                    continue
+                event = getter.result()
+                if event["event"] == "error":
+                    errors[event["capability"]] = event["error"]
+                yield _sse(event)
+            job.result()
+        except SchedulerOverloaded as e:
+            yield _sse({"event": "error", "task_id": task_id, "status": "overloaded", "error": str(e), "retry_after": e.retry_after})
+        except MessageExpired as e:
+            yield _sse({"event": "error", "task_id": task_id, "status": "expired", "error": str(e)})
+        except Exception as e:
+            logger.error(f"Streamed task {task_id} failed: {e}")
+            yield _sse({"event": "error", "task_id": task_id, "status": "failed", "error": str(e)})
+        else:
+            status = "failed" if errors and len(errors) == len(capabilities) else "completed"
+            yield _sse({
+                "event": "done", "task_id": task_id, "status": status,
+                "errors": errors, "elapsed": time.perf_counter() - started
+            })
+        finally:
+            closed = True
+            if producer is not None:
+                producer.cancel()
+            job.cancel()
+
+    def advertise(self) -> Dict[str, Any]:
+        """Profile metadata telling peers which encodings and features this agent accepts"""
+        return {**self.codec.advertise(), BATCH_KEY: self.coalescer.enabled, STREAM_KEY: True}
 
     async def handle_incoming_message(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle incoming A2A message"""
         try:
             message = self._dict_to_message(message_data)
+            self.registry.touch(message.from_agent)
 
             # Check TTL
-            if message.ttl and (datetime.now() - message.timestamp).seconds > message.ttl:
-                return {"status": "expired", "message": "Message TTL exceeded"}
+            deadline = None
+            if message.ttl:
+                remaining = message.ttl - (datetime.now(message.timestamp.tzinfo) - message.timestamp).total_seconds()
+                if remaining <= 0:
+                    return {"status": "expired", "message": "Message TTL exceeded"}
+                deadline = time.monotonic() + remaining
 
             # Find appropriate handler
             handler = self.message_handlers.get(message.message_type)
             if not handler:
                 return {"status": "error", "message": f"No handler for {message.message_type.value}"}
 
-            # Execute handler
-            result = await handler(message)
-            self.message_history.append(message)
+            # Execute handler through the priority scheduler
+            result = await self.scheduler.submit(
+                message.message_type.value,
+                lambda: handler(message),
+                priority=message.priority,
+                deadline=deadline
+            )
+            self.message_history.record(message, RECEIVED)
 
             return {"status": "success", "result": result}
 
+        except SchedulerOverloaded as e:
+            return {"status": "overloaded", "message": str(e), "retry_after": e.retry_after}
+        except MessageExpired as e:
+            return {"status": "expired", "message": str(e)}
         except Exception as e:
             logger.error(f"Error handling incoming message: {e}")
             return {"status": "error", "message": str(e)}
@@ -276,24 +848,35 @@ class A2ANetworkManager:
         parameters: Dict[str, Any],
         required_capabilities: Set[AgentCapability],
         deadline: Optional[datetime] = None,
-        priority: int = 0
+        priority: int = 0,
+        on_complete: Optional[Callable[[TaskDelegation], Any]] = None,
+        hedge: bool = False
     ) -> Optional[str]:
-        """Delegate a task to the most suitable agent"""
+        """Delegate a task to a capable agent chosen by the load-aware router
+
+        Returns as soon as the peer accepts the task. The peer runs it in the
+        background and pushes a RESPONSE correlated by task_id; use
+        wait_for_task or on_complete (sync or async, called with the finished
+        TaskDelegation) to get the result. With hedge, the task is also sent
+        to a second agent if it is still unfinished after the pool's p95 task
+        latency; whichever RESPONSE arrives first wins.
+        """
+        self._collect_finished_tasks()
+
         # Find agents with required capabilities
-        suitable_agents = []
-        for agent_id, profile in self.agents.items():
-            if agent_id != self.agent_id and required_capabilities.issubset(profile.capabilities):
-                suitable_agents.append((agent_id, profile))
+        suitable_agents = [
+            (agent_id, self.agents[agent_id])
+            for agent_id in sorted(self.registry.with_all(required_capabilities))
+            if agent_id != self.agent_id and self.breakers.available(agent_id)
+        ]
 
         if not suitable_agents:
             logger.warning(f"No suitable agents found for task requiring {required_capabilities}")
             return None
 
-        # Select best agent based on success rate and response time
-        best_agent = min(
-            suitable_agents,
-            key=lambda x: (1 - x[1].success_rate, x[1].response_time_avg)
-        )
+        # Spread load by outstanding work and latency rather than always picking one "best" agent
+        candidates = [(agent_id, profile.success_rate) for agent_id, profile in suitable_agents]
+        delegate_to = self.router.choose(candidates)
 
         task_id = self._generate_task_id()
         task = TaskDelegation(
@@ -304,14 +887,136 @@ class A2ANetworkManager:
             required_capabilities=required_capabilities,
             deadline=deadline,
             priority=priority,
-            delegate_to=best_agent[0]
+            delegate_to=delegate_to
         )
 
+        # Register before sending so a fast RESPONSE finds the task
         self.active_tasks[task_id] = task
+        self.router.task_started(delegate_to)
+        self._task_futures[task_id] = asyncio.get_running_loop().create_future()
+        if on_complete:
+            self._task_callbacks[task_id] = on_complete
+        # Without a deadline a lost RESPONSE would otherwise hold the task and its
+        # router slot forever, so every task gets at most task_lifetime
+        remaining = self._seconds_until(deadline)
+        if remaining is not None and remaining <= self.task_lifetime:
+            self._task_timers[task_id] = asyncio.get_running_loop().call_later(
+                max(0.0, remaining), self._expire_task, task_id
+            )
+        else:
+            self._task_timers[task_id] = asyncio.get_running_loop().call_later(
+                self.task_lifetime, self._expire_task, task_id,
+                f"No result within the {self.task_lifetime:.0f}s task lifetime"
+            )
 
         # Send task delegation message
-        message = await self.send_message(
-            to_agent=best_agent[0],
+        error = await self._send_delegation(task, delegate_to)
+        if error:
+            self._finish_task(task_id, "rejected", error=error)
+            return None
+
+        if not task.finished:
+            task.status = "accepted"
+            if hedge and len(candidates) > 1:
+                backups = [candidate for candidate in candidates if candidate[0] != delegate_to]
+                self._hedges[task_id] = asyncio.create_task(self._hedge_task(task, backups))
+        logger.info(f"Task {task_id} delegated to {delegate_to}")
+        return task_id
+
+    async def _send_delegation(self, task: TaskDelegation, agent_id: str) -> Optional[str]:
+        """Send a TASK_DELEGATION message; returns why it was not accepted, or None"""
+        message, outcome = await self._send(
+            agent_id,
+            MessageType.TASK_DELEGATION,
+            {
+                "task_id": task.task_id,
+                "task_type": task.task_type,
+                "description": task.description,
+                "parameters": task.parameters,
+                "required_capabilities": [cap.value for cap in task.required_capabilities],
+                "deadline": task.deadline.isoformat() if task.deadline else None,
+                "priority": task.priority
+            },
+            correlation_id=task.task_id,
+            reply_to=self.agent_id,
+            priority=task.priority
+        )
+
+        reply = ((outcome.response or {}).get("result") or {}) if message else {}
+        if not message or reply.get("status") not in ("accepted", "completed", "failed"):
+            return outcome.error or reply.get("reason") or "Task not accepted"
+        return None
+
+    async def _hedge_task(self, task: TaskDelegation, backups: List[Tuple[str, float]]):
+        """Send a task that is still unfinished after the hedge delay to a second agent"""
+        try:
+            await asyncio.sleep(self.router.hedge_delay())
+            backups = [candidate for candidate in backups if self.breakers.available(candidate[0])]
+            if task.finished or not backups:
+                return
+
+            backup = self.router.choose(backups)
+            task.hedged_to = backup
+            self.router.hedges += 1
+            self.router.task_started(backup)
+            error = await self._send_delegation(task, backup)
+            if error:
+                logger.warning(f"Hedge of task {task.task_id} to {backup} failed: {error}")
+                if task.hedged_to == backup and not task.finished:
+                    self.router.task_finished(backup, None)
+                    task.hedged_to = None
+            else:
+                logger.info(f"Task {task.task_id} hedged to {backup}")
+        finally:
+            self._hedges.pop(task.task_id, None)
+
+    async def stream_task(
+        self,
+        task_type: str,
+        description: str,
+        parameters: Dict[str, Any],
+        required_capabilities: Set[AgentCapability],
+        deadline: Optional[datetime] = None,
+        priority: int = 0,
+        agent_id: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Delegate a task to a peer's stream endpoint and yield its events as they arrive
+
+        Each event is a dict with an "event" key: "accepted", then "chunk"
+        (partial items), "result" and "error" per capability, and finally
+        "done" (or "error" if the peer could not run the task). Partial
+        results can be used as soon as they arrive instead of after the
+        slowest handler, and large results are never held whole. The peer is
+        agent_id or the router's choice among capable peers that stream;
+        timeout bounds the wait for each event, not the whole task (default:
+        the adaptive timeout from the peer's task latency). Raises
+        RuntimeError if no peer can take the task or the peer refuses it.
+        """
+        if agent_id is None:
+            candidates = [
+                (peer_id, self.agents[peer_id].success_rate)
+                for peer_id in sorted(self.registry.with_all(required_capabilities))
+                if peer_id != self.agent_id
+                and self.agents[peer_id].metadata.get(STREAM_KEY)
+                and self.breakers.available(peer_id)
+            ]
+            agent_id = self.router.choose(candidates)
+            if agent_id is None:
+                raise RuntimeError(f"No streaming agent found for task requiring {required_capabilities}")
+        elif agent_id not in self.agents:
+            raise RuntimeError(f"Agent {agent_id} not found in network")
+        if not self.breakers.allow(agent_id):
+            raise RuntimeError(f"Circuit to {agent_id} is open")
+
+        # From here on the call holds the breaker (possibly its half-open probe):
+        # every exit must report an outcome, or the probe is never released
+        settled = False
+        task_id = self._generate_task_id()
+        message = A2AMessage(
+            message_id=self._generate_message_id(),
+            from_agent=self.agent_id,
+            to_agent=agent_id,
             message_type=MessageType.TASK_DELEGATION,
             content={
                 "task_id": task_id,
@@ -321,15 +1026,172 @@ class A2ANetworkManager:
                 "required_capabilities": [cap.value for cap in required_capabilities],
                 "deadline": deadline.isoformat() if deadline else None,
                 "priority": priority
-            }
+            },
+            timestamp=datetime.now(),
+            correlation_id=task_id,
+            reply_to=self.agent_id,
+            priority=priority
         )
-
-        if message:
-            logger.info(f"Task {task_id} delegated to {best_agent[0]}")
-            return task_id
-        else:
-            del self.active_tasks[task_id]
+        if timeout is None:
+            # Events arrive as handlers finish, so the wait follows the peer's task latency
+            peer_load = self.router.peers.get(agent_id)
+            timeout = self.breakers.timeout_for(peer_load.task if peer_load else None)
+
+        self.router.begin_request(agent_id)
+        self.router.task_started(agent_id)
+        start_time = time.time()
+        response_time = None
+        task_time = None
+        try:
+            content_type, compress = self.codec.negotiate(self.agents[agent_id].metadata)
+            body, headers = self.codec.encode(message, content_type, compress)
+            headers["Accept"] = "text/event-stream"
+
+            async with self.client.stream(
+                "POST",
+                f"{self.agents[agent_id].endpoint}/a2a/v1/stream",
+                content=body,
+                headers=headers,
+                timeout=self.transport.timeout(read=timeout)
+            ) as response:
+                response_time = time.time() - start_time
+                self.router.end_request(agent_id, response_time)
+                self._update_agent_metrics(agent_id, response.status_code == 200, response_time)
+                if response.status_code != 200:
+                    if response.status_code == 429 or response.status_code >= 500:
+                        self.breakers.record_failure(agent_id)
+                    else:
+                        # The peer answered; a refusal says nothing about its health
+                        self.breakers.record_success(agent_id)
+                    settled = True
+                    raise RuntimeError(f"{agent_id} refused stream: HTTP {response.status_code}")
+                self.breakers.record_success(agent_id)
+                self.message_history.record(message, SENT)
+
+                event_name, data = None, []
+                async for line in response.aiter_lines():
+                    if line.startswith("event:"):
+                        event_name = line[6:].strip()
+                    elif line.startswith("data:"):
+                        data.append(line[5:].strip())
+                    elif not line and data:
+                        event = {"event": event_name or "message", **json.loads("\n".join(data))}
+                        event_name, data = None, []
+                        if "capability" in event or event["event"] not in ("done", "error"):
+                            yield event
+                            continue
+
+                        if event.get("status") in ("rejected", "overloaded"):
+                            if event["status"] == "overloaded":
+                                self.breakers.record_failure(agent_id)
+                            settled = True
+                            raise RuntimeError(f"{agent_id} did not run streamed task: {event.get('error')}")
+                        task_time = time.time() - start_time
+                        settled = True
+                        yield event
+                        return
+        except httpx.HTTPError as e:
+            if response_time is None:
+                self._update_agent_metrics(agent_id, False, None)
+            self.breakers.record_failure(agent_id)
+            settled = True
+            raise RuntimeError(f"Stream from {agent_id} failed: {e!r}") from e
+        except GeneratorExit:
+            # The consumer stopped reading; not the peer's fault
+            raise
+        except BaseException:
+            # Malformed events, encode errors, cancellation: count against the peer
+            # like _post does, which also releases a half-open probe
+            if not settled:
+                self.breakers.record_failure(agent_id)
+            raise
+        finally:
+            if response_time is None:
+                # No response headers: failed or abandoned before the peer answered
+                self.router.end_request(agent_id, None)
+            self.router.task_finished(agent_id, task_time)
+
+    def get_task(self, task_id: str) -> Optional[TaskDelegation]:
+        """Look up a delegated task that is in flight or recently finished"""
+        self._collect_finished_tasks()
+        return self.active_tasks.get(task_id)
+
+    async def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> TaskDelegation:
+        """Wait until a delegated task finishes, its deadline passes or timeout elapses
+
+        Raises KeyError for unknown (or already collected) tasks and
+        TimeoutError if timeout elapses first; the task keeps running.
+        """
+        task = self.active_tasks.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        if task.finished:
+            return task
+        await asyncio.wait_for(asyncio.shield(self._task_futures[task_id]), timeout)
+        return task
+
+    def _seconds_until(self, deadline: Optional[datetime]) -> Optional[float]:
+        if deadline is None:
             return None
+        return (deadline - datetime.now(deadline.tzinfo)).total_seconds()
+
+    def _expire_task(self, task_id: str, error: str = "Deadline passed before a result arrived"):
+        self._finish_task(task_id, "expired", error=error)
+
+    def _finish_task(
+        self,
+        task_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+        agent_id: Optional[str] = None
+    ):
+        """Record a delegated task's final state, resolve its waiters and schedule collection"""
+        task = self.active_tasks.get(task_id)
+        if task is None or task.finished:
+            return
+
+        task.status = status
+        task.result = result
+        task.error = error
+        task.completed_by = agent_id
+        task.completed_at = datetime.now()
+
+        # Release the task from every agent it was sent to; an expiry counts as a
+        # (censored) latency sample so slow agents lose traffic
+        elapsed = (task.completed_at - task.created_at).total_seconds()
+        for assignee in (task.delegate_to, task.hedged_to):
+            if assignee is None:
+                continue
+            observed = status == "expired" or (status == "completed" and assignee == agent_id)
+            self.router.task_finished(assignee, elapsed if observed else None)
+        hedge = self._hedges.pop(task_id, None)
+        if hedge and hedge is not asyncio.current_task():
+            hedge.cancel()
+
+        timer = self._task_timers.pop(task_id, None)
+        if timer:
+            timer.cancel()
+        future = self._task_futures.pop(task_id, None)
+        if future and not future.done():
+            future.set_result(task)
+        self._finished_tasks.append((time.monotonic() + self.task_retention, task_id))
+
+        callback = self._task_callbacks.pop(task_id, None)
+        if callback:
+            try:
+                outcome = callback(task)
+                if asyncio.iscoroutine(outcome):
+                    asyncio.get_running_loop().create_task(outcome)
+            except Exception as e:
+                logger.error(f"Completion callback for task {task_id} failed: {e}")
+
+    def _collect_finished_tasks(self):
+        """Drop finished tasks once they have been kept for task_retention seconds"""
+        now = time.monotonic()
+        while self._finished_tasks and self._finished_tasks[0][0] <= now:
+            _, task_id = self._finished_tasks.popleft()
+            self.active_tasks.pop(task_id, None)
 
     async def query_capabilities(
         self,
@@ -338,7 +1200,8 @@ class A2ANetworkManager:
         """Query which agents have specific capabilities"""
         matching_agents = []
 
-        for agent_id, profile in self.agents.items():
+        for agent_id in self.registry.with_any(required_capabilities):
+            profile = self.agents[agent_id]
             if agent_id != self.agent_id:
                 matching_caps = required_capabilities.intersection(profile.capabilities)
                 if matching_caps:
@@ -354,20 +1217,48 @@ class A2ANetworkManager:
 
         return sorted(matching_agents, key=lambda x: (x["success_rate"], -x["response_time"]), reverse=True)
 
-    async def health_check_network(self) -> Dict[str, Any]:
-        """Perform health check on all agents in the network"""
-        results = {}
+    async def health_check_network(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Perform health check on all agents in the network concurrently"""
+        result = await self.fan_out(
+            self._peer_ids(),
+            MessageType.HEALTH_CHECK,
+            {"timestamp": datetime.now().isoformat()},
+            timeout=timeout
+        )
 
-        for agent_id in self.agents:
-            if agent_id != self.agent_id:
-                message = await self.send_message(
-                    to_agent=agent_id,
-                    message_type=MessageType.HEALTH_CHECK,
-                    content={"timestamp": datetime.now().isoformat()}
-                )
-                results[agent_id] = "sent" if message else "failed"
+        return {
+            "healthy": len(result.delivered),
+            "unreachable": len(result.failed),
+            "elapsed": result.elapsed,
+            "agents": {
+                agent_id: {
+                    "status": outcome.status,
+                    "latency": outcome.latency,
+                    "health": ((outcome.response or {}).get("result") or {}).get("status"),
+                    "error": outcome.error
+                }
+                for agent_id, outcome in result.outcomes.items()
+            }
+        }
 
-        return results
+    def lookup_messages(
+        self,
+        message_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        peer: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Find recorded messages by id, correlation id or peer (newest first otherwise)"""
+        if message_id:
+            record = self.message_history.get(message_id)
+            records = [record] if record else []
+        elif correlation_id:
+            records = self.message_history.by_correlation(correlation_id)[-limit:]
+        elif peer:
+            records = self.message_history.by_peer(peer, limit)
+        else:
+            records = self.message_history.recent(limit)
+        return [record.to_dict() for record in records]
 
     async def get_network_status(self) -> Dict[str, Any]:
         """Get comprehensive network status"""
@@ -384,12 +1275,22 @@ class A2ANetworkManager:
             },
             "active_tasks": len(self.active_tasks),
             "message_history": len(self.message_history),
+            "history": self.message_history.stats(),
+            "inbound": self.scheduler.stats(),
+            "dispatch": self.dispatcher.stats(),
+            "routing": self.router.stats(),
+            "circuits": self.breakers.stats(),
+            "codec": self.codec.stats(),
+            "batching": self.coalescer.stats(),
+            "registry": self.registry.stats(),
+            "transport": self.transport.stats(),
             "agents": [
                 {
                     "id": agent_id,
                     "name": profile.name,
                     "capabilities": [cap.value for cap in profile.capabilities],
                     "health": profile.health_status,
+                    "circuit": self.breakers.state(agent_id),
                     "last_seen": profile.last_seen.isoformat(),
                     "response_time": profile.response_time_avg,
                     "success_rate": profile.success_rate
@@ -424,30 +1325,16 @@ class A2ANetworkManager:
         }
 
     async def _handle_task_delegation(self, message: A2AMessage) -> Dict[str, Any]:
-        """Handle task delegation message"""
+        """Accept a delegated task and run it in the background
+
+        The reply only says whether the task was accepted; the outcome is
+        pushed to the delegator later as a RESPONSE message.
+        """
         task_data = message.content
-        task_type = task_data.get("task_type")
         required_caps = set(AgentCapability(cap) for cap in task_data.get("required_capabilities", []))
 
         # Check if we can handle this task
-        can_handle = required_caps.issubset(self.capability_handlers.keys())
-
-        if can_handle:
-            # Execute the task (simplified for demo)
-            try:
-                result = await self._execute_delegated_task(task_data)
-                return {
-                    "task_id": task_data["task_id"],
-                    "status": "completed",
-                    "result": result
-                }
-            except Exception as e:
-                return {
-                    "task_id": task_data["task_id"],
-                    "status": "failed",
-                    "error": str(e)
-                }
-        else:
+        if not required_caps.issubset(self.capability_handlers.keys()):
             return {
                 "task_id": task_data["task_id"],
                 "status": "rejected",
@@ -456,14 +1343,96 @@ class A2ANetworkManager:
                 "available": [cap.value for cap in self.capability_handlers.keys()]
             }
 
-    async def _execute_delegated_task(self, task_data: Dict[str, Any]) -> Any:
-        """Execute a delegated task based on its type"""
-        task_type = task_data["task_type"]
-        parameters = task_data.get("parameters", {})
+        task_id = task_data["task_id"]
+        if task_id not in self._executions:
+            execution = asyncio.create_task(self._run_delegated_task(message), name=f"a2a-task-{task_id}")
+            self._executions[task_id] = execution
+            execution.add_done_callback(lambda _: self._executions.pop(task_id, None))
 
-        # This would dispatch to appropriate capability handlers
-        # For demo purposes, we'll just return a success message
-        return f"Task {task_type} executed with parameters: {parameters}"
+        return {"task_id": task_id, "status": "accepted"}
+
+    async def _run_delegated_task(self, message: A2AMessage):
+        """Execute an accepted task under the scheduler and report back to the delegator"""
+        task_data = message.content
+        task_id = task_data["task_id"]
+        deadline = datetime.fromisoformat(task_data["deadline"]) if task_data.get("deadline") else None
+        remaining = self._seconds_until(deadline)
+
+        try:
+            result = await self.scheduler.submit(
+                "task_execution",
+                lambda: self._execute_delegated_task(task_data),
+                priority=task_data.get("priority", 0),
+                deadline=time.monotonic() + remaining if remaining is not None else None
+            )
+            content = {"task_id": task_id, "status": "completed", "result": result}
+        except MessageExpired as e:
+            content = {"task_id": task_id, "status": "expired", "error": str(e)}
+        except Exception as e:
+            content = {"task_id": task_id, "status": "failed", "error": str(e)}
+
+        # Results only go to agents already in the registry: an endpoint named by the
+        # (unauthenticated) sender is never trusted, stored or contacted
+        reply_to = message.reply_to or message.from_agent
+        if reply_to not in self.agents:
+            logger.error(f"Dropping result of task {task_id}: {reply_to} is not a known agent")
+            return
+
+        for attempt in range(3):
+            sent = await self.send_message(
+                reply_to,
+                MessageType.RESPONSE,
+                content,
+                correlation_id=message.correlation_id or task_id,
+                priority=task_data.get("priority", 0)
+            )
+            if sent:
+                return
+            await asyncio.sleep(0.5 * 2 ** attempt)
+        logger.error(f"Could not deliver result of task {task_id} to {reply_to}")
+
+    async def _handle_response(self, message: A2AMessage) -> Dict[str, Any]:
+        """Resolve the delegated task a RESPONSE message is correlated with
+
+        Only an agent the task was actually sent to (the delegate or its
+        hedge) may resolve it.
+        """
+        task_id = message.correlation_id or message.content.get("task_id")
+        task = self.active_tasks.get(task_id)
+        if task is None:
+            return {"acknowledged": False, "reason": "unknown_task"}
+        if message.from_agent not in (task.delegate_to, task.hedged_to):
+            logger.warning(f"Ignoring response for task {task_id} from {message.from_agent}, which was not assigned it")
+            return {"acknowledged": False, "reason": "unexpected_sender"}
+
+        status = message.content.get("status")
+        if status not in ("completed", "failed", "expired"):
+            status = "failed"
+        self._finish_task(
+            task_id, status,
+            result=message.content.get("result"), error=message.content.get("error"), agent_id=message.from_agent
+        )
+        return {"acknowledged": True, "task_id": task_id}
+
+    def _task_capabilities(self, task_data: Dict[str, Any]) -> List[str]:
+        """Capabilities a delegated task needs; raises ValueError if any has no handler here"""
+        capabilities = task_data.get("required_capabilities") or []
+        if not capabilities:
+            # Tasks without explicit requirements may name a capability as their type
+            task_type = task_data["task_type"]
+            if task_type not in self.dispatcher.handlers:
+                raise ValueError(f"Task type {task_type} names no registered capability")
+            return [task_type]
+
+        missing = [capability for capability in capabilities if capability not in self.dispatcher.handlers]
+        if missing:
+            raise ValueError(f"No handler for {', '.join(missing)}")
+        return capabilities
+
+    async def _execute_delegated_task(self, task_data: Dict[str, Any]) -> Any:
+        """Execute a delegated task by running its required capability handlers concurrently"""
+        capabilities = self._task_capabilities(task_data)
+        return await self.dispatcher.dispatch(capabilities, task_data.get("parameters", {}))
 
     def _generate_message_id(self) -> str:
         """Generate unique message ID"""
@@ -496,7 +1465,10 @@ class A2ANetworkManager:
             to_agent=data["to_agent"],
             message_type=MessageType(data["message_type"]),
             content=data["content"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            timestamp=(
+                data["timestamp"] if isinstance(data["timestamp"], datetime)
+                else datetime.fromisoformat(data["timestamp"])
+            ),
             correlation_id=data.get("correlation_id"),
             reply_to=data.get("reply_to"),
             ttl=data.get("ttl"),
@@ -507,7 +1479,9 @@ class A2ANetworkManager:
         """Update agent performance metrics"""
         if agent_id in self.agents:
             profile = self.agents[agent_id]
-            profile.last_seen = datetime.now()
+            if success:
+                profile.last_seen = datetime.now()
+            self.registry.mark_dirty(agent_id)
 
             if response_time is not None:
                 # Simple moving average
@@ -534,9 +1508,12 @@ def initialize_a2a_network(agent_id: str, agent_name: str, endpoint: str) -> A2A
 
     a2a_manager.register_capability_handler(
         AgentCapability.RAG_RETRIEVAL,
-        lambda params: rag_system.agentic_retrieve(params["query"], params.get("context"))
+        lambda params: rag_system.agentic_retrieve(params["query"], params.get("context")),
+        cacheable=True
     )
 
+    # Not cacheable here: graph writes never reach the dispatcher cache, while
+    # graph_memory's own recall cache is invalidated by them
     a2a_manager.register_capability_handler(
         AgentCapability.GRAPH_MEMORY,
         lambda params: graph_memory.find_related_memories(
@@ -547,7 +1524,9 @@ def initialize_a2a_network(agent_id: str, agent_name: str, endpoint: str) -> A2A
 
     a2a_manager.register_capability_handler(
         AgentCapability.KNOWLEDGE_SYNTHESIS,
-        lambda params: _synthesize_knowledge(params["query"], params.get("sources", []))
+        lambda params: _synthesize_knowledge(params["query"], params.get("sources", [])),
+        cacheable=True,
+        stream=lambda params: _stream_knowledge(params["query"], params.get("sources", []))
     )
 
     logger.info(f"A2A network initialized for {agent_name} ({agent_id})")
@@ -555,17 +1534,33 @@ def initialize_a2a_network(agent_id: str, agent_name: str, endpoint: str) -> A2A
 
 
 async def _synthesize_knowledge(query: str, sources: List[str]) -> Dict[str, Any]:
-    """Synthesize knowledge from RAG and graph memory"""
-    from rag_system import get_rag_context
-    from graph_memory import query_graph_memory_tool
+    """Synthesize knowledge from one fused RAG + graph memory recall"""
+    from fused_recall import fused_recall
 
-    rag_results = await get_rag_context(query)
-    graph_results = await query_graph_memory_tool(query)
+    recall = await fused_recall.recall(query)
 
     return {
         "query": query,
-        "rag_context": rag_results,
-        "graph_context": graph_results,
+        "results": recall["results"],
+        "errors": recall["errors"],
         "synthesis": f"Combined insights from RAG and graph memory for: {query}",
         "sources": sources
-    }
\ No newline at end of file
+    }
+
+
+async def _stream_knowledge(query: str, sources: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Streaming synthesis: each recall source's candidates as they land, then the fused result"""
+    from fused_recall import fused_recall
+
+    async for partial in fused_recall.stream(query):
+        if partial["source"] != "fused":
+            yield partial
+            continue
+        yield {
+            "source": "fused",
+            "query": query,
+            "results": partial["results"],
+            "errors": partial["errors"],
+            "synthesis": f"Combined insights from RAG and graph memory for: {query}",
+            "sources": sources
+        }
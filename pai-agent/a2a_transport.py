@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+A2A HTTP Transport
+Pooled httpx client for inter-agent traffic: tuned connection limits,
+HTTP/2 multiplexing, keep-alive expiry, split timeouts and pool metrics
+"""
+
+import importlib.util
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger("pai-a2a-transport")
+
+
+@dataclass
+class A2ATransportConfig:
+    """Connection pool and timeout settings for A2A HTTP traffic"""
+    http2: bool = os.getenv("A2A_HTTP2", "true").lower() == "true"
+    max_connections: int = int(os.getenv("A2A_MAX_CONNECTIONS", "200"))
+    max_keepalive_connections: int = int(os.getenv("A2A_MAX_KEEPALIVE_CONNECTIONS", "50"))
+    keepalive_expiry: float = float(os.getenv("A2A_KEEPALIVE_EXPIRY", "60.0"))
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 10.0
+    pool_timeout: float = 5.0
+    retries: int = 1
+
+
+class A2ATransport:
+    """Owns the shared AsyncClient and counts how often connections are reused
+
+    New TCP connects and TLS handshakes are observed through the httpcore
+    trace extension, so requests minus connects is the number served from
+    a pooled (or multiplexed HTTP/2) connection.
+    """
+
+    def __init__(
+        self,
+        config: Optional[A2ATransportConfig] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """transport replaces the pooled HTTP transport, e.g. with in-process ASGI apps for testing"""
+        self.config = config or A2ATransportConfig()
+        self.http2 = self.config.http2 and importlib.util.find_spec("h2") is not None
+        if self.config.http2 and not self.http2:
+            logger.warning("HTTP/2 requested for A2A transport but 'h2' is not installed; using HTTP/1.1")
+
+        self.requests = 0
+        self.errors = 0
+        self.connects = 0
+        self.tls_handshakes = 0
+        self.http_versions: Dict[str, int] = {}
+
+        self._transport = transport or httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry
+            ),
+            retries=self.config.retries
+        )
+        self.client = httpx.AsyncClient(
+            transport=self._transport,
+            timeout=self.timeout(),
+            event_hooks={"request": [self._on_request], "response": [self._on_response]}
+        )
+
+    def timeout(self, read: Optional[float] = None) -> httpx.Timeout:
+        """The configured split timeouts, with only the read phase replaced when read is given"""
+        return httpx.Timeout(
+            connect=self.config.connect_timeout,
+            read=self.config.read_timeout if read is None else read,
+            write=self.config.write_timeout,
+            pool=self.config.pool_timeout
+        )
+
+    async def _on_request(self, request: httpx.Request):
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _on_response(self, response: httpx.Response):
+        version = response.http_version
+        self.http_versions[version] = self.http_versions.get(version, 0) + 1
+        if response.status_code >= 500:
+            self.errors += 1
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        if event_name == "connection.connect_tcp.complete":
+            self.connects += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    @property
+    def closed(self) -> bool:
+        return self.client.is_closed
+
+    async def aclose(self):
+        if not self.client.is_closed:
+            await self.client.aclose()
+
+    def _pool_connections(self) -> list:
+        # httpx does not expose its httpcore pool publicly
+        pool = getattr(self._transport, "_pool", None)
+        return list(getattr(pool, "connections", []) or [])
+
+    def stats(self) -> Dict[str, Any]:
+        connections = self._pool_connections()
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "http2_enabled": self.http2,
+            "requests": self.requests,
+            "server_errors": self.errors,
+            "new_connections": self.connects,
+            "tls_handshakes": self.tls_handshakes,
+            "reused_requests": max(0, self.requests - self.connects),
+            "http_versions": dict(self.http_versions),
+            "pool": {
+                "connections": len(connections),
+                "idle": idle,
+                "active": len(connections) - idle,
+                "max_connections": self.config.max_connections,
+                "max_keepalive_connections": self.config.max_keepalive_connections,
+                "keepalive_expiry": self.config.keepalive_expiry
+            },
+            "closed": self.closed
+        }
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Fused Recall Engine
+Runs graph recall and pgvector recall concurrently and merges them into one
+ranked, deduplicated result list
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from graph_memory import GraphMemorySystem, extract_query_entities, graph_memory
+from rag_system import AgenticRAGSystem, rag_system
+
+logger = logging.getLogger("pai-fused-recall")
+
+# Chunk metadata key linking a knowledge chunk to its graph Conversation node
+GRAPH_NODE_KEY = "graph_node_id"
+
+
+@dataclass
+class FusedRecallConfig:
+    """Configuration for fused graph + vector recall"""
+    rrf_k: int = 60
+    vector_weight: float = 1.0
+    graph_weight: float = 1.0
+    candidates_per_source: int = 10
+    graph_max_depth: int = 2
+    snippet_length: int = 300
+
+
+class FusedRecallEngine:
+    """Single-call recall over graph memory and the vector store"""
+
+    def __init__(
+        self,
+        rag: AgenticRAGSystem,
+        graph: GraphMemorySystem,
+        config: Optional[FusedRecallConfig] = None
+    ):
+        self.rag = rag
+        self.graph = graph
+        self.config = config or FusedRecallConfig()
+
+    async def recall(
+        self,
+        query: str,
+        entities: Optional[List[str]] = None,
+        limit: int = 10
+    ) -> Dict[str, Any]:
+        """Run both searches concurrently and return one fused ranking
+
+        Results are combined with weighted reciprocal rank fusion. A knowledge
+        chunk whose metadata carries a graph_node_id and the matching graph
+        memory collapse into a single result that scores from both sides.
+        """
+        entities = entities if entities is not None else extract_query_entities(query)
+        candidates = max(limit, self.config.candidates_per_source)
+
+        vector_results, graph_results = await asyncio.gather(
+            self.rag.retrieve_relevant_context(query, max_results=candidates),
+            self._graph_recall(entities, candidates),
+            return_exceptions=True
+        )
+
+        errors = {}
+        if isinstance(vector_results, Exception):
+            errors["vector"] = str(vector_results)
+            vector_results = []
+        if isinstance(graph_results, Exception):
+            errors["graph"] = str(graph_results)
+            graph_results = []
+
+        return self._fuse(query, entities, vector_results, graph_results, errors, limit)
+
+    async def stream(
+        self,
+        query: str,
+        entities: Optional[List[str]] = None,
+        limit: int = 10
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Like recall, but yields each source's candidates as soon as that search finishes
+
+        Yields {"source": "vector" | "graph", "results", "error"} once per
+        source in completion order, then {"source": "fused", **recall result}.
+        """
+        entities = entities if entities is not None else extract_query_entities(query)
+        candidates = max(limit, self.config.candidates_per_source)
+
+        searches = {
+            asyncio.ensure_future(self.rag.retrieve_relevant_context(query, max_results=candidates)): "vector",
+            asyncio.ensure_future(self._graph_recall(entities, candidates)): "graph"
+        }
+        found: Dict[str, List[Dict[str, Any]]] = {"vector": [], "graph": []}
+        errors = {}
+        pending = set(searches)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for search in done:
+                    source = searches[search]
+                    if search.exception() is not None:
+                        errors[source] = str(search.exception())
+                    else:
+                        found[source] = search.result()
+                    yield {"source": source, "results": found[source], "error": errors.get(source)}
+        finally:
+            for search in pending:
+                search.cancel()
+
+        yield {"source": "fused", **self._fuse(query, entities, found["vector"], found["graph"], errors, limit)}
+
+    def _fuse(
+        self,
+        query: str,
+        entities: List[str],
+        vector_results: List[Dict[str, Any]],
+        graph_results: List[Dict[str, Any]],
+        errors: Dict[str, str],
+        limit: int
+    ) -> Dict[str, Any]:
+        """Weighted reciprocal rank fusion of the two candidate lists"""
+        fused: Dict[str, Dict[str, Any]] = {}
+
+        for rank, memory in enumerate(graph_results, start=1):
+            item = fused.setdefault(memory["id"], self._new_item(memory["id"]))
+            item["graph_node_id"] = memory["id"]
+            item["graph_relevance"] = memory["relevance_score"]
+            item["content"] = item["content"] or self._memory_text(memory)
+            item["sources"].append("graph")
+            item["fused_score"] += self.config.graph_weight / (self.config.rrf_k + rank)
+
+        # A document split into several chunks counts once, at its best-ranked chunk;
+        # vector_results arrive ranked, so later chunks of the same node are skipped
+        for rank, chunk in enumerate(vector_results, start=1):
+            node_id = (chunk.get("metadata") or {}).get(GRAPH_NODE_KEY)
+            key = node_id or f"chunk:{chunk['id']}"
+            item = fused.setdefault(key, self._new_item(key))
+            if "vector" in item["sources"]:
+                continue
+            item["graph_node_id"] = item["graph_node_id"] or node_id
+            item["chunk_id"] = chunk["id"]
+            item["similarity"] = chunk["similarity"]
+            item["source"] = chunk.get("source")
+            # Prefer the chunk text: it is the stored content rather than a snippet pair
+            item["content"] = chunk["content"][:self.config.snippet_length]
+            item["sources"].append("vector")
+            item["fused_score"] += self.config.vector_weight / (self.config.rrf_k + rank)
+
+        ranked = sorted(fused.values(), key=lambda item: item["fused_score"], reverse=True)
+
+        return {
+            "query": query,
+            "entities": entities,
+            "results": ranked[:limit],
+            "vector_candidates": len(vector_results),
+            "graph_candidates": len(graph_results),
+            "errors": errors
+        }
+
+    async def _graph_recall(self, entities: List[str], limit: int) -> List[Dict[str, Any]]:
+        if not entities:
+            return []
+        return await self.graph.find_related_memories(
+            query_entities=entities,
+            max_depth=self.config.graph_max_depth,
+            limit=limit,
+            fields=["user_message", "assistant_response"],
+            snippet_length=self.config.snippet_length
+        )
+
+    @staticmethod
+    def _new_item(key: str) -> Dict[str, Any]:
+        return {
+            "key": key,
+            "graph_node_id": None,
+            "chunk_id": None,
+            "content": "",
+            "source": None,
+            "similarity": None,
+            "graph_relevance": None,
+            "sources": [],
+            "fused_score": 0.0
+        }
+
+    @staticmethod
+    def _memory_text(memory: Dict[str, Any]) -> str:
+        return f"User: {memory.get('user_message') or ''}\nAssistant: {memory.get('assistant_response') or ''}"
+
+
+# Global fused recall engine
+fused_recall = FusedRecallEngine(rag_system, graph_memory)
+
+
+async def get_fused_context(query: str, limit: int = 5) -> str:
+    """Fused graph + vector context for a query - used by tools and A2A synthesis"""
+    try:
+        result = await fused_recall.recall(query, limit=limit)
+
+        if not result["results"]:
+            return f"No relevant context found for: {query}"
+
+        context_parts = []
+        for item in result["results"]:
+            origin = "+".join(item["sources"])
+            label = f"[Source: {item['source']}]" if item["source"] else "[Graph memory]"
+            context_parts.append(f"{label} ({origin}, score: {item['fused_score']:.4f}) {item['content']}")
+
+        return "\n\n".join(context_parts)
+
+    except Exception as e:
+        return f"Fused recall error: {str(e)}"
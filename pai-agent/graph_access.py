@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Graph Access Aggregator
+Buffers per-node access counts and importance weights and flushes them in batches
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger("pai-graph-access")
+
+
+@dataclass
+class PendingAccess:
+    """Accumulated, not yet persisted accesses for one node"""
+    count: int = 0
+    weight: float = 0.0
+
+
+class AccessAggregator:
+    """Coalesces node accesses in memory and flushes them periodically"""
+
+    def __init__(
+        self,
+        flush_callback: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        flush_interval: float = 5.0,
+        max_pending_nodes: int = 10000
+    ):
+        self.flush_callback = flush_callback
+        self.flush_interval = flush_interval
+        self.max_pending_nodes = max_pending_nodes
+        self._pending: Dict[str, PendingAccess] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._early_flush: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.flushed_accesses = 0
+
+    @property
+    def pending_nodes(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        """Whether the periodic flush loop is active"""
+        return self._task is not None and not self._task.done()
+
+    def record(self, node_id: str, weight: float):
+        """Record one access; never touches the database"""
+        pending = self._pending.get(node_id)
+        if pending is None:
+            pending = self._pending[node_id] = PendingAccess()
+        pending.count += 1
+        pending.weight += weight
+
+        if (
+            len(self._pending) >= self.max_pending_nodes
+            and self._task is not None
+            and (self._early_flush is None or self._early_flush.done())
+        ):
+            # Flush early rather than let the buffer grow without bound
+            self._early_flush = asyncio.get_running_loop().create_task(self._flush_quietly())
+
+    def pending_weight(self, node_id: str) -> float:
+        """Importance weight recorded for a node but not yet flushed"""
+        pending = self._pending.get(node_id)
+        return pending.weight if pending else 0.0
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take every pending update as UNWIND-ready rows, sorted by node id"""
+        pending, self._pending = self._pending, {}
+        return [
+            {"id": node_id, "count": access.count, "weight": access.weight}
+            for node_id, access in sorted(pending.items())
+        ]
+
+    def requeue(self, updates: List[Dict[str, Any]]):
+        """Put updates from a failed flush back into the buffer"""
+        for update in updates:
+            pending = self._pending.get(update["id"])
+            if pending is None:
+                pending = self._pending[update["id"]] = PendingAccess()
+            pending.count += update["count"]
+            pending.weight += update["weight"]
+
+    async def flush(self) -> int:
+        """Write every pending update in one batch, returning the number of nodes flushed
+
+        The callback runs even when nothing is buffered so that it can piggyback
+        periodic maintenance (such as importance decay) on the same job.
+        """
+        async with self._flush_lock:
+            updates = self.drain()
+
+            try:
+                await self.flush_callback(updates)
+            except Exception:
+                self.requeue(updates)
+                raise
+
+            if updates:
+                self.flushes += 1
+            self.flushed_accesses += sum(update["count"] for update in updates)
+            return len(updates)
+
+    def start(self):
+        """Start the periodic flush loop"""
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and flush whatever is still buffered"""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _flush_quietly(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Access flush failed, will retry: {e}")
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            if self._stopping.is_set():
+                break
+
+            await self._flush_quietly()
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregator statistics for health reporting"""
+        return {
+            "pending_nodes": self.pending_nodes,
+            "flush_interval": self.flush_interval,
+            "flushes": self.flushes,
+            "flushed_accesses": self.flushed_accesses
+        }
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Graph Recall Cache
+Read-through result cache for graph memory recall with write-driven invalidation
+"""
+
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+
+@dataclass
+class CacheEntry:
+    """A cached recall result and the graph keys it depends on"""
+    value: Any
+    expires_at: float
+    tags: Set[str]
+
+
+class RecallCache:
+    """TTL + LRU cache for recall results, invalidated by node id or entity name"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped by every invalidate/clear; a put computed under an older
+        # generation may have missed a write and is dropped
+        self.generation = 0
+        self.stale_puts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def normalize_entities(entities: Iterable[str]) -> Tuple[str, ...]:
+        """Normalize an entity set so that order and duplicates don't split the cache"""
+        return tuple(sorted(set(entities)))
+
+    # Tag for entries whose traversed neighborhood was too large to tag node
+    # by node; any relationship write invalidates them
+    ANY_EDGE_TAG = "edges:*"
+
+    @staticmethod
+    def id_tag(node_id: str) -> str:
+        return f"id:{node_id}"
+
+    @staticmethod
+    def name_tag(name: str) -> str:
+        return f"name:{name.lower()}"
+
+    def make_key(self, operation: str, entities: Iterable[str], **params: Any) -> Hashable:
+        """Build a cache key from the operation, normalized entities and parameters"""
+        return (
+            operation,
+            self.normalize_entities(entities),
+            tuple(sorted((name, self._freeze(value)) for name, value in params.items()))
+        )
+
+    def _freeze(self, value: Any) -> Hashable:
+        if isinstance(value, (list, tuple, set, frozenset)):
+            items = [self._freeze(v) for v in value]
+            return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else tuple(items)
+        if isinstance(value, dict):
+            return tuple(sorted((k, self._freeze(v)) for k, v in value.items()))
+        return value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a copy of the cached value, or None on miss/expiry"""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry.value)
+
+    def put(self, key: Hashable, value: Any, tags: Iterable[str], generation: Optional[int] = None):
+        """Store a value along with the node ids / entity names it was derived from
+
+        Pass the generation read before computing the value: if any
+        invalidation happened since, the value may be stale and is not stored.
+        """
+        if not self.enabled:
+            return
+        if generation is not None and generation != self.generation:
+            self.stale_puts += 1
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        entry = CacheEntry(
+            value=copy.deepcopy(value),
+            expires_at=time.monotonic() + self.ttl_seconds,
+            tags=set(tags)
+        )
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def invalidate(
+        self,
+        node_ids: Iterable[str] = (),
+        names: Iterable[str] = (),
+        edges_changed: bool = False
+    ) -> int:
+        """Drop every entry that depends on any of the given node ids or entity names
+
+        edges_changed also drops entries tagged ANY_EDGE_TAG, for relationship writes.
+        """
+        self.generation += 1
+        tags = [self.id_tag(node_id) for node_id in node_ids]
+        tags.extend(self.name_tag(name) for name in names)
+        if edges_changed:
+            tags.append(self.ANY_EDGE_TAG)
+
+        keys: Set[Hashable] = set()
+        for tag in tags:
+            keys.update(self._tag_index.get(tag, ()))
+
+        for key in keys:
+            self._remove(key)
+
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        """Drop all cached entries"""
+        self.generation += 1
+        self._entries.clear()
+        self._tag_index.clear()
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for health reporting"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts
+        }
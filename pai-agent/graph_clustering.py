@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Graph Memory Clustering
+Community detection over the memory graph with paged export, in-process
+label propagation on a CSR adjacency and batched write-back
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from neo4j import AsyncManagedTransaction
+
+from graph_writes import sorted_rows
+
+logger = logging.getLogger("pai-graph-clustering")
+
+
+@dataclass
+class CSRGraph:
+    """Undirected weighted adjacency in compressed sparse row form"""
+    node_ids: List[str]
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.indices.shape[0]) // 2
+
+    @classmethod
+    def from_edges(cls, node_ids: List[str], src: np.ndarray, dst: np.ndarray, weights: np.ndarray) -> "CSRGraph":
+        """Build a symmetric CSR graph from directed edge arrays of node indices"""
+        n = len(node_ids)
+        all_src = np.concatenate([src, dst])
+        all_dst = np.concatenate([dst, src])
+        all_weights = np.concatenate([weights, weights])
+
+        order = np.argsort(all_src, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(all_src, minlength=n), out=indptr[1:])
+
+        return cls(
+            node_ids=node_ids,
+            indptr=indptr,
+            indices=all_dst[order].astype(np.int64),
+            weights=all_weights[order].astype(np.float64)
+        )
+
+    def weighted_degree(self) -> np.ndarray:
+        src = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        return np.bincount(src, weights=self.weights, minlength=self.num_nodes)
+
+
+def label_propagation(
+    graph: CSRGraph,
+    max_iterations: int = 20,
+    update_fraction: float = 0.5,
+    seed: int = 42
+) -> np.ndarray:
+    """Weighted label propagation, vectorized over the CSR arrays
+
+    Each node keeps its own label with weight equal to its strongest edge and
+    only a random fraction of nodes updates per round; together these stop the
+    label flip-flopping that plain synchronous propagation shows on bipartite
+    graphs such as conversation/entity memory.
+    """
+    n = graph.num_nodes
+    labels = np.arange(n, dtype=np.int64)
+    if n == 0 or graph.indices.shape[0] == 0:
+        return labels
+
+    rng = np.random.default_rng(seed)
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(graph.indptr))
+    self_weight = np.zeros(n, dtype=np.float64)
+    np.maximum.at(self_weight, src, graph.weights)
+
+    pair_src = np.concatenate([src, np.arange(n, dtype=np.int64)])
+    pair_weights = np.concatenate([graph.weights, self_weight])
+
+    for _ in range(max_iterations):
+        pair_labels = np.concatenate([labels[graph.indices], labels])
+
+        # Sum edge weight per (node, candidate label)
+        order = np.lexsort((pair_labels, pair_src))
+        sorted_src = pair_src[order]
+        sorted_labels = pair_labels[order]
+        boundaries = np.flatnonzero(
+            (np.diff(sorted_src) != 0) | (np.diff(sorted_labels) != 0)
+        ) + 1
+        starts = np.concatenate([[0], boundaries])
+        sums = np.add.reduceat(pair_weights[order], starts)
+        cand_src = sorted_src[starts]
+        cand_labels = sorted_labels[starts]
+
+        # Strongest label per node, ties broken by the smallest label
+        best = np.lexsort((cand_labels, -sums, cand_src))
+        first = np.concatenate([[True], cand_src[best][1:] != cand_src[best][:-1]])
+        best = best[first]
+
+        proposed = labels.copy()
+        proposed[cand_src[best]] = cand_labels[best]
+
+        update_mask = rng.random(n) < update_fraction
+        changed = update_mask & (proposed != labels)
+        if not changed.any():
+            if (proposed == labels).all():
+                break
+            continue
+        labels[changed] = proposed[changed]
+
+    return labels
+
+
+class MemoryClustering:
+    """Community detection and incremental community maintenance for graph memory"""
+
+    def __init__(self, memory: "GraphMemorySystem"):
+        self.memory = memory
+        self._dirty: Set[str] = set()
+
+    @property
+    def config(self):
+        return self.memory.config
+
+    def _session(self):
+        return self.memory.driver.session(database=self.config.database)
+
+    def mark_dirty(self, node_ids: Iterable[str]):
+        """Queue nodes whose community needs (re)assignment"""
+        self._dirty.update(node_ids)
+
+    @property
+    def has_pending_updates(self) -> bool:
+        return bool(self._dirty)
+
+    async def export_adjacency(self, min_strength: float) -> CSRGraph:
+        """Load the weighted adjacency; from Neo4j it is streamed in keyset-paged batches"""
+        if self.memory.store is not None:
+            node_ids, src, dst, weights = self.memory.store.adjacency(min_strength)
+            return CSRGraph.from_edges(
+                node_ids,
+                np.frombuffer(src, dtype=np.int64),
+                np.frombuffer(dst, dtype=np.int64),
+                np.frombuffer(weights, dtype=np.float64)
+            )
+
+        query = """
+        MATCH (a:Node)
+        WHERE a.id > $after
+        WITH a ORDER BY a.id
+        LIMIT $page_size
+        OPTIONAL MATCH (a)-[r]->(b:Node)
+        WHERE coalesce(r.strength, 0.5) >= $min_strength
+        RETURN a.id AS id, collect([b.id, coalesce(r.strength, 0.5)]) AS edges
+        ORDER BY id
+        """
+
+        index: Dict[str, int] = {}
+        node_ids: List[str] = []
+        src: List[int] = []
+        dst: List[int] = []
+        weights: List[float] = []
+
+        def node_index(node_id: str) -> int:
+            position = index.get(node_id)
+            if position is None:
+                position = index[node_id] = len(node_ids)
+                node_ids.append(node_id)
+            return position
+
+        after = ""
+        async with self._session() as session:
+            while True:
+                result = await session.run(
+                    query,
+                    after=after,
+                    page_size=self.config.clustering_page_size,
+                    min_strength=min_strength
+                )
+                records = [record async for record in result]
+                if not records:
+                    break
+
+                for record in records:
+                    a = node_index(record["id"])
+                    for neighbor_id, strength in record["edges"]:
+                        if neighbor_id is None:
+                            continue
+                        src.append(a)
+                        dst.append(node_index(neighbor_id))
+                        weights.append(float(strength))
+
+                after = records[-1]["id"]
+
+        return CSRGraph.from_edges(
+            node_ids,
+            np.asarray(src, dtype=np.int64),
+            np.asarray(dst, dtype=np.int64),
+            np.asarray(weights, dtype=np.float64)
+        )
+
+    async def detect_communities(self, min_strength: Optional[float] = None) -> Dict[str, Any]:
+        """Recompute every community from scratch and write the ids back"""
+        if min_strength is None:
+            min_strength = self.config.clustering_min_strength
+
+        graph = await self.export_adjacency(min_strength)
+        labels = label_propagation(graph, max_iterations=self.config.clustering_max_iterations)
+        degree = graph.weighted_degree()
+
+        assignments = [
+            {"id": node_id, "community_id": graph.node_ids[label]}
+            for node_id, label in zip(graph.node_ids, labels.tolist())
+        ]
+
+        communities: Dict[str, Dict[str, Any]] = {}
+        for position, label in enumerate(labels.tolist()):
+            community_id = graph.node_ids[label]
+            community = communities.setdefault(
+                community_id, {"id": community_id, "size": 0, "central_node": None, "_degree": -1.0}
+            )
+            community["size"] += 1
+            if degree[position] > community["_degree"]:
+                community["_degree"] = float(degree[position])
+                community["central_node"] = graph.node_ids[position]
+
+        summaries = [
+            {"id": c["id"], "size": c["size"], "central_node": c["central_node"]}
+            for c in communities.values()
+        ]
+
+        await self._write_assignments(assignments)
+        await self._replace_communities(summaries)
+        self._dirty.clear()
+        self.memory.recall_cache.clear()
+
+        logger.info(
+            f"Detected {len(summaries)} communities over {graph.num_nodes} nodes "
+            f"and {graph.num_edges} edges"
+        )
+        return {
+            "nodes": graph.num_nodes,
+            "edges": graph.num_edges,
+            "communities": len(summaries),
+            "min_strength": min_strength
+        }
+
+    async def apply_incremental(self, min_strength: Optional[float] = None) -> int:
+        """Assign communities to queued nodes from their already-labelled neighbourhood"""
+        if not self._dirty:
+            return 0
+        if min_strength is None:
+            min_strength = self.config.clustering_min_strength
+
+        dirty, self._dirty = sorted(self._dirty), set()
+
+        query = """
+        UNWIND $ids AS node_id
+        MATCH (n:Node {id: node_id})
+        OPTIONAL MATCH (n)-[r]-(m:Node)
+        WHERE coalesce(r.strength, 0.5) >= $min_strength
+        RETURN n.id AS id,
+               n.community_id AS community_id,
+               collect([m.id, m.community_id, coalesce(r.strength, 0.5)]) AS neighbors
+        """
+
+        if self.memory.store is not None:
+            records = []
+            for node_id in dirty:
+                node = self.memory.store.get_node(node_id)
+                if node is not None:
+                    records.append({
+                        "id": node_id,
+                        "community_id": node.community_id,
+                        "neighbors": self.memory.store.neighborhood(node_id, min_strength)
+                    })
+        else:
+            try:
+                async with self._session() as session:
+                    result = await session.run(query, ids=dirty, min_strength=min_strength)
+                    records = [record async for record in result]
+            except Exception:
+                self._dirty.update(dirty)
+                raise
+
+        previous = {record["id"]: record["community_id"] for record in records}
+        neighbors = {
+            record["id"]: [tuple(item) for item in record["neighbors"] if item[0] is not None]
+            for record in records
+        }
+
+        # Local label propagation: outside nodes are fixed seeds, queued nodes vote
+        labels: Dict[str, Optional[str]] = dict(previous)
+        for _ in range(self.config.clustering_max_iterations):
+            changed = False
+            for node_id in labels:
+                votes: Dict[str, float] = {}
+                for neighbor_id, neighbor_community, strength in neighbors[node_id]:
+                    label = labels[neighbor_id] if neighbor_id in labels else neighbor_community
+                    if label is not None:
+                        votes[label] = votes.get(label, 0.0) + float(strength)
+
+                if votes:
+                    new_label = min(votes, key=lambda label: (-votes[label], label))
+                else:
+                    new_label = labels[node_id] or node_id
+
+                if new_label != labels[node_id]:
+                    labels[node_id] = new_label
+                    changed = True
+            if not changed:
+                break
+
+        assignments = [
+            {"id": node_id, "community_id": label}
+            for node_id, label in labels.items()
+            if label != previous.get(node_id)
+        ]
+        if not assignments:
+            return 0
+
+        deltas: Dict[str, int] = {}
+        for assignment in assignments:
+            old = previous.get(assignment["id"])
+            if old is not None:
+                deltas[old] = deltas.get(old, 0) - 1
+            deltas[assignment["community_id"]] = deltas.get(assignment["community_id"], 0) + 1
+
+        await self._write_assignments(assignments)
+        await self._apply_community_deltas(
+            [{"id": community_id, "delta": delta} for community_id, delta in sorted(deltas.items()) if delta]
+        )
+        return len(assignments)
+
+    async def _write_assignments(self, assignments: List[Dict[str, Any]]):
+        """Write community ids back in UNWIND batches"""
+        if self.memory.store is not None:
+            self.memory.store.set_communities(assignments)
+            return
+
+        query = """
+        UNWIND $rows AS row
+        MATCH (n:Node {id: row.id})
+        SET n.community_id = row.community_id
+        """
+        rows = sorted_rows(assignments)
+        batch_size = self.config.clustering_write_batch_size
+        for start in range(0, len(rows), batch_size):
+            await self.memory.writer.run("write_communities", query, rows=rows[start:start + batch_size])
+
+    async def _replace_communities(self, summaries: List[Dict[str, Any]]):
+        """Replace the Community summary nodes after a full recompute"""
+        if self.memory.store is not None:
+            self.memory.store.communities = {summary["id"]: dict(summary) for summary in summaries}
+            return
+
+        batch_size = self.config.clustering_write_batch_size
+
+        # One transaction, so a retry starts from a clean slate and readers
+        # never see the summaries half replaced
+        async def work(tx: AsyncManagedTransaction):
+            await (await tx.run("MATCH (c:Community) DETACH DELETE c")).consume()
+            for start in range(0, len(summaries), batch_size):
+                result = await tx.run(
+                    """
+                    UNWIND $rows AS row
+                    CREATE (c:Community {id: row.id, size: row.size, central_node: row.central_node})
+                    """,
+                    rows=summaries[start:start + batch_size]
+                )
+                await result.consume()
+
+        await self.memory.execute_write("replace_communities", work)
+
+    async def _apply_community_deltas(self, deltas: List[Dict[str, Any]]):
+        """Adjust community sizes after incremental assignment"""
+        if self.memory.store is not None:
+            communities = self.memory.store.communities
+            for row in deltas:
+                community = communities.setdefault(
+                    row["id"], {"id": row["id"], "size": 0, "central_node": row["id"]}
+                )
+                community["size"] += row["delta"]
+                if community["size"] <= 0:
+                    del communities[row["id"]]
+            return
+
+        query = """
+        UNWIND $rows AS row
+        MERGE (c:Community {id: row.id})
+        ON CREATE SET c.size = 0, c.central_node = row.id
+        SET c.size = c.size + row.delta
+        WITH c WHERE c.size <= 0
+        DELETE c
+        """
+        await self.memory.writer.run("apply_community_deltas", query, rows=sorted_rows(deltas))
+
+    async def get_clusters(
+        self,
+        min_cluster_size: int,
+        limit: int,
+        max_members: int
+    ) -> List[Dict[str, Any]]:
+        """Read communities through the size and community_id indexes"""
+        if self.memory.store is not None:
+            return self._get_clusters_embedded(min_cluster_size, limit, max_members)
+
+        query = """
+        MATCH (c:Community)
+        WHERE c.size >= $min_size
+        WITH c ORDER BY c.size DESC
+        LIMIT $limit
+        OPTIONAL MATCH (central:Node {id: c.central_node})
+        CALL (c) {
+            MATCH (n:Node {community_id: c.id})
+            WITH n LIMIT $max_members
+            RETURN collect({id: n.id, name: n.name, type: n.type}) AS members
+        }
+        RETURN c.id AS community_id,
+               c.central_node AS central_node,
+               central.name AS central_name,
+               central.type AS central_type,
+               members AS cluster_nodes,
+               c.size AS cluster_size
+        ORDER BY cluster_size DESC
+        """
+
+        async with self._session() as session:
+            result = await session.run(
+                query,
+                min_size=min_cluster_size,
+                limit=limit,
+                max_members=max_members
+            )
+            return [
+                {
+                    "community_id": record["community_id"],
+                    "central_node": record["central_node"],
+                    "central_name": record["central_name"],
+                    "central_type": record["central_type"],
+                    "cluster_nodes": record["cluster_nodes"],
+                    "cluster_size": record["cluster_size"]
+                }
+                async for record in result
+            ]
+
+    def _get_clusters_embedded(self, min_cluster_size: int, limit: int, max_members: int) -> List[Dict[str, Any]]:
+        store = self.memory.store
+        communities = sorted(
+            (c for c in store.communities.values() if c["size"] >= min_cluster_size),
+            key=lambda c: c["size"],
+            reverse=True
+        )[:limit]
+
+        members: Dict[str, List[Dict[str, Any]]] = {c["id"]: [] for c in communities}
+        for node in store.nodes:
+            bucket = members.get(node.community_id)
+            if bucket is not None and len(bucket) < max_members:
+                bucket.append({"id": node.id, "name": node.name, "type": node.type})
+
+        clusters = []
+        for community in communities:
+            central = store.get_node(community["central_node"])
+            clusters.append({
+                "community_id": community["id"],
+                "central_node": community["central_node"],
+                "central_name": central.name if central else None,
+                "central_type": central.type if central else None,
+                "cluster_nodes": members[community["id"]],
+                "cluster_size": community["size"]
+            })
+        return clusters
+
+    async def has_communities(self) -> bool:
+        if self.memory.store is not None:
+            return bool(self.memory.store.communities)
+
+        async with self._session() as session:
+            result = await session.run("MATCH (c:Community) RETURN c.id AS id LIMIT 1")
+            return await result.single() is not None
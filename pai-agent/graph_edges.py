@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Graph Edge Compaction
+Periodic maintenance for aggregated relationships: prunes weak, stale,
+rarely mentioned edges and folds reverse duplicates so traversal fan-out
+stays bounded as the memory graph ages
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict
+
+logger = logging.getLogger("pai-graph-edges")
+
+
+class EdgeCompactor:
+    """Prune-and-merge job over relationship aggregates
+
+    Relationships carry mention_count, an EMA strength and first_seen /
+    last_seen, maintained by GraphMemorySystem.create_relationships. Strength
+    is decayed by time since last_seen when judging whether an edge is weak.
+    Only edge_compaction_types are touched, so conversation links survive.
+    """
+
+    def __init__(self, memory: "GraphMemorySystem"):
+        self.memory = memory
+        self.runs = 0
+        self.pruned = 0
+        self.merged = 0
+
+    @property
+    def config(self):
+        return self.memory.config
+
+    async def compact(self) -> Dict[str, int]:
+        """Run one full compaction pass; returns the number of edges pruned and merged"""
+        half_life_seconds = self.config.edge_strength_half_life_days * 86400
+        min_idle_seconds = self.config.edge_compaction_min_idle_days * 86400
+        rel_types = self.config.edge_compaction_types
+        if not rel_types:
+            return {"pruned": 0, "merged": 0}
+
+        if self.memory.store is not None:
+            pruned, merged = self.memory.store.compact_edges(
+                self.config.edge_compaction_min_strength,
+                self.config.edge_compaction_max_mentions,
+                min_idle_seconds,
+                half_life_seconds,
+                rel_types
+            )
+        else:
+            pruned = await self._prune_neo4j(min_idle_seconds, half_life_seconds)
+            merged = await self._merge_reverse_neo4j()
+
+        self.runs += 1
+        self.pruned += pruned
+        self.merged += merged
+        if pruned or merged:
+            logger.info(f"Edge compaction pruned {pruned} and merged {merged} relationships")
+        return {"pruned": pruned, "merged": merged}
+
+    def _type_filter(self) -> str:
+        return "|".join(f"`{rel_type}`" for rel_type in self.config.edge_compaction_types)
+
+    async def _walk_nodes(self, operation: str, query: str, **parameters: Any) -> int:
+        """Run a per-node-batch write over every node in id order
+
+        Each batch is anchored on the node id constraint index and resumes
+        after the last id of the previous one, so a pass touches each
+        relationship once instead of rescanning the whole graph per batch.
+        The query receives $after and $batch_size and returns nodes,
+        last_id and count.
+        """
+        batch_size = self.config.edge_compaction_batch_size
+        after = ""
+        total = 0
+        while True:
+            records = await self.memory.writer.run(
+                operation, query, after=after, batch_size=batch_size, **parameters
+            )
+            if not records:
+                return total
+            total += records[0]["count"]
+            if records[0]["nodes"] < batch_size:
+                return total
+            after = records[0]["last_id"]
+
+    async def _prune_neo4j(self, min_idle_seconds: float, half_life_seconds: float) -> int:
+        query = f"""
+        MATCH (a:Node)
+        WHERE a.id > $after
+        WITH a ORDER BY a.id LIMIT $batch_size
+        WITH collect(a) AS batch
+        WITH batch, batch[-1].id AS last_id
+        UNWIND batch AS a
+        OPTIONAL MATCH (a)-[r:{self._type_filter()}]->(:Node)
+        WHERE coalesce(r.mention_count, 1) <= $max_mentions
+          AND coalesce(r.last_seen, r.updated_at, r.created_at) < datetime() - $min_idle
+          AND coalesce(r.strength, 0.5)
+              * 0.5 ^ (duration.inSeconds(coalesce(r.last_seen, r.updated_at, r.created_at), datetime()).seconds
+                       / $half_life) < $min_strength
+        DELETE r
+        RETURN size(batch) AS nodes, last_id, count(r) AS count
+        """
+        return await self._walk_nodes(
+            "prune_edges",
+            query,
+            max_mentions=self.config.edge_compaction_max_mentions,
+            min_idle=timedelta(seconds=min_idle_seconds),
+            half_life=half_life_seconds,
+            min_strength=self.config.edge_compaction_min_strength
+        )
+
+    async def _merge_reverse_neo4j(self) -> int:
+        query = f"""
+        MATCH (a:Node)
+        WHERE a.id > $after
+        WITH a ORDER BY a.id LIMIT $batch_size
+        WITH collect(a) AS batch
+        WITH batch, batch[-1].id AS last_id
+        UNWIND batch AS a
+        OPTIONAL MATCH (a)-[r1:{self._type_filter()}]->(b:Node)-[r2]->(a)
+        WHERE a.id < b.id AND type(r1) = type(r2)
+        WITH batch, last_id, r1, r2,
+             coalesce(r1.first_seen, r1.created_at) AS first1, coalesce(r2.first_seen, r2.created_at) AS first2,
+             coalesce(r1.last_seen, r1.updated_at) AS last1, coalesce(r2.last_seen, r2.updated_at) AS last2
+        SET r1.mention_count = coalesce(r1.mention_count, 1) + coalesce(r2.mention_count, 1),
+            r1.strength = CASE WHEN coalesce(r2.strength, 0.5) > coalesce(r1.strength, 0.5)
+                               THEN r2.strength ELSE coalesce(r1.strength, 0.5) END,
+            r1.first_seen = CASE WHEN first2 < first1 THEN first2 ELSE first1 END,
+            r1.last_seen = CASE WHEN last2 > last1 THEN last2 ELSE last1 END
+        DELETE r2
+        RETURN size(batch) AS nodes, last_id, count(r2) AS count
+        """
+        return await self._walk_nodes("merge_reverse_edges", query)
+
+    def stats(self) -> Dict[str, int]:
+        return {"runs": self.runs, "pruned": self.pruned, "merged": self.merged}
@@ -7,15 +7,29 @@ Advanced graph-based memory for PAI Agent with relationship tracking and context
 import asyncio
 import json
 import os
-from typing import List, Dict, Any, Optional, Set, Tuple
+from typing import List, Dict, Any, Awaitable, Callable, Iterable, Optional, Set, Tuple
 from dataclasses import dataclass, asdict, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+import base64
 import hashlib
+import logging
 import re
+import time
 
 from neo4j import AsyncGraphDatabase, AsyncManagedTransaction
-from neo4j.exceptions import ServiceUnavailable, TransientError
+
+from graph_access import AccessAggregator
+from graph_cache import RecallCache
+from graph_clustering import MemoryClustering
+from graph_edges import EdgeCompactor
+from graph_snapshot import GraphSnapshotter
+from graph_stats import GraphStats
+from graph_summaries import NeighborhoodSummaries
+from graph_store import EmbeddedGraphStore
+from graph_writes import GraphWriter, sorted_rows
+
+logger = logging.getLogger("pai-graph-memory")
 
 
 class NodeType(Enum):
@@ -52,6 +66,15 @@ class RelationType(Enum):
     TRIGGERED_BY = "TRIGGERED_BY"
 
 
+# Entity-to-entity relationship types, the only ones edge compaction may prune
+# or merge. MENTIONED_IN and DISCUSSED_IN link entities to conversations and
+# keep a memory recallable however old it is.
+COMPACTABLE_RELATION_TYPES = tuple(
+    rt.value for rt in RelationType
+    if rt not in (RelationType.MENTIONED_IN, RelationType.DISCUSSED_IN)
+)
+
+
 @dataclass
 class GraphNode:
     """Represents a node in the knowledge graph"""
@@ -88,18 +111,171 @@ class GraphConfig:
     max_connection_lifetime: int = 30
     max_connection_pool_size: int = 50
     connection_timeout: float = 5.0
+    # "neo4j" or "embedded" (in-process store, no server required)
+    backend: str = os.getenv("PAI_GRAPH_BACKEND", "neo4j")
+    snapshot_path: Optional[str] = os.getenv("PAI_GRAPH_SNAPSHOT")
+    recall_cache_size: int = 1024
+    recall_cache_ttl: float = 60.0
+    # Past this many nodes, a cached recall's neighborhood is not tagged node
+    # by node and any relationship write invalidates it instead
+    recall_cache_max_neighborhood: int = 2000
+    access_flush_interval: float = float(os.getenv("PAI_GRAPH_ACCESS_FLUSH_INTERVAL", "5.0"))
+    access_max_pending_nodes: int = 10000
+    importance_half_life_days: float = 30.0
+    importance_decay_sweep_interval: float = 3600.0
+    importance_decay_batch_size: int = 5000
+    timeline_page_size: int = 100
+    clustering_min_strength: float = 0.0
+    clustering_max_iterations: int = 20
+    clustering_page_size: int = 5000
+    clustering_write_batch_size: int = 5000
+    write_retry_time: float = 15.0
+    write_retry_initial_delay: float = 0.05
+    write_retry_jitter: float = 0.5
+    edge_strength_ema_alpha: float = 0.3
+    edge_strength_half_life_days: float = 90.0
+    edge_compaction_interval: float = 21600.0
+    edge_compaction_min_strength: float = 0.1
+    edge_compaction_max_mentions: int = 1
+    edge_compaction_min_idle_days: float = 90.0
+    edge_compaction_batch_size: int = 5000
+    edge_compaction_types: Tuple[str, ...] = COMPACTABLE_RELATION_TYPES
+    snapshot_page_size: int = 5000
+    snapshot_write_batch_size: int = 5000
+    summary_max_entities: int = 2048
+    summary_top_k: int = 5
+    summary_snippet_length: int = 200
+    summary_refresh_batch_size: int = 100
+    stats_ttl: float = float(os.getenv("PAI_GRAPH_STATS_TTL", "10.0"))
+    stats_activity_window_days: int = 7
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware now, stored by the driver as a native Neo4j DateTime"""
+    return datetime.now(timezone.utc)
+
+
+def _parse_legacy_timestamp(value: str) -> Optional[datetime]:
+    """Parse a legacy ISO timestamp string; naive values are taken as UTC, garbage gives None"""
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def _to_iso(value: Any) -> Any:
+    """Render Neo4j/Python temporal values as ISO strings for API output"""
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _encode_cursor(position: Dict[str, Any]) -> str:
+    """Opaque keyset cursor for paged graph queries"""
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> Dict[str, Any]:
+    if not cursor:
+        return {}
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(position, dict):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return position
+
+
+# Conversation properties that graph queries can project, and which are text
+CONVERSATION_FIELDS = ("name", "user_message", "assistant_response", "created_at")
+TEXT_FIELDS = {"name", "user_message", "assistant_response"}
+
+
+def _conversation_projection(
+    alias: str,
+    fields: Optional[List[str]],
+    snippet_length: Optional[int],
+    ids_only: bool
+) -> Tuple[str, List[str]]:
+    """Build the Cypher RETURN items for a projected conversation row"""
+    if ids_only:
+        selected: List[str] = []
+    elif fields is None:
+        selected = list(CONVERSATION_FIELDS)
+    else:
+        unknown = set(fields) - set(CONVERSATION_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown conversation fields: {sorted(unknown)}")
+        selected = [name for name in CONVERSATION_FIELDS if name in fields]
+
+    items = [f"{alias}.id as id"]
+    for name in selected:
+        if snippet_length is not None and name in TEXT_FIELDS:
+            items.append(f"left({alias}.{name}, $snippet_length) as {name}")
+        else:
+            items.append(f"{alias}.{name} as {name}")
+
+    return ",\n               ".join(items), selected
+
+
+def _project_record(record: Any, fields: List[str]) -> Dict[str, Any]:
+    row = {"id": record["id"]}
+    for name in fields:
+        row[name] = _to_iso(record[name]) if name == "created_at" else record[name]
+    return row
+
+
+def _project_node(node: Any, fields: List[str], snippet_length: Optional[int]) -> Dict[str, Any]:
+    """Apply the same projection as _conversation_projection to an embedded node"""
+    row = {"id": node.id}
+    for name in fields:
+        value = node.get(name)
+        if snippet_length is not None and name in TEXT_FIELDS and isinstance(value, str):
+            value = value[:snippet_length]
+        row[name] = _to_iso(value) if name == "created_at" else value
+    return row
 
 
 class GraphMemorySystem:
-    """Advanced Neo4j-based graph memory system"""
+    """Advanced graph memory system backed by Neo4j or the embedded store"""
 
     def __init__(self, config: Optional[GraphConfig] = None):
         self.config = config or GraphConfig()
         self.driver = None
+        self.store: Optional[EmbeddedGraphStore] = None
         self._initialized = False
+        self.recall_cache = RecallCache(
+            max_entries=self.config.recall_cache_size,
+            ttl_seconds=self.config.recall_cache_ttl
+        )
+        self.access_aggregator = AccessAggregator(
+            self._flush_access_updates,
+            flush_interval=self.config.access_flush_interval,
+            max_pending_nodes=self.config.access_max_pending_nodes
+        )
+        self._last_decay_sweep = 0.0
+        self._last_edge_compaction = time.monotonic()
+        self.writer = GraphWriter(self)
+        self.clustering = MemoryClustering(self)
+        self.edge_compactor = EdgeCompactor(self)
+        self.snapshotter = GraphSnapshotter(self)
+        self.summaries = NeighborhoodSummaries(self)
+        self.stats = GraphStats(
+            self,
+            ttl_seconds=self.config.stats_ttl,
+            activity_window_days=self.config.stats_activity_window_days
+        )
 
     async def initialize(self):
-        """Initialize Neo4j connection and create constraints"""
+        """Initialize the configured backend; for Neo4j, connect and create constraints"""
+        if self.config.backend == "embedded":
+            self._initialize_embedded()
+            return
+
         try:
             self.driver = AsyncGraphDatabase.driver(
                 self.config.uri,
@@ -114,16 +290,65 @@ class GraphMemorySystem:
 
             # Create constraints and indexes
             await self._create_constraints()
+            await self.migrate_temporal_properties()
             self._initialized = True
+            self.access_aggregator.start()
 
         except Exception as e:
             raise ConnectionError(f"Failed to initialize Neo4j connection: {e}")
 
+    def _initialize_embedded(self):
+        """Open the in-process store, warm-starting from the snapshot if present"""
+        snapshot_path = self.config.snapshot_path
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.store = EmbeddedGraphStore.load_snapshot(snapshot_path)
+            logger.info(f"Loaded embedded graph snapshot with {self.store.node_count} nodes")
+        else:
+            self.store = EmbeddedGraphStore()
+
+        self._initialized = True
+        self.access_aggregator.start()
+
     async def close(self):
-        """Close Neo4j connection"""
+        """Flush buffered accesses and close the backend"""
+        if self.driver or self.store is not None:
+            try:
+                await self.access_aggregator.stop()
+            except Exception as e:
+                logger.warning(f"Failed to flush buffered accesses on shutdown: {e}")
+
         if self.driver:
             await self.driver.close()
 
+        if self.store is not None and self.config.snapshot_path:
+            await self.save_snapshot(self.config.snapshot_path)
+
+    async def save_snapshot(self, path: str):
+        """Persist the embedded store to a snapshot file"""
+        if self.store is None:
+            raise RuntimeError("Snapshots are only available with the embedded backend")
+        await asyncio.to_thread(self.store.save_snapshot, path)
+
+    async def export_snapshot(self, path: str) -> Dict[str, Any]:
+        """Export the whole graph to a columnar snapshot file (see graph_snapshot)"""
+        if not self._initialized:
+            await self.initialize()
+
+        # Include accesses still buffered in memory
+        await self.access_aggregator.flush()
+        return await self.snapshotter.export(path)
+
+    async def import_snapshot(self, path: str) -> Dict[str, int]:
+        """Bulk-load a columnar snapshot, merging it into the current graph"""
+        if not self._initialized:
+            await self.initialize()
+
+        counts = await self.snapshotter.import_(path)
+        self.recall_cache.clear()
+        self.summaries.clear()
+        self.stats.invalidate(reseed_activity=True)
+        return counts
+
     async def _create_constraints(self):
         """Create database constraints and indexes"""
         constraints = [
@@ -132,23 +357,126 @@ class GraphMemorySystem:
             "CREATE INDEX node_name_index IF NOT EXISTS FOR (n:Node) ON (n.name)",
             "CREATE INDEX node_importance_index IF NOT EXISTS FOR (n:Node) ON (n.importance_score)",
             "CREATE INDEX node_created_index IF NOT EXISTS FOR (n:Node) ON (n.created_at)",
+            "CREATE RANGE INDEX conversation_created_index IF NOT EXISTS FOR (c:Conversation) ON (c.created_at)",
+            "CREATE INDEX node_community_index IF NOT EXISTS FOR (n:Node) ON (n.community_id)",
+            "CREATE CONSTRAINT community_id_unique IF NOT EXISTS FOR (c:Community) REQUIRE c.id IS UNIQUE",
+            "CREATE INDEX community_size_index IF NOT EXISTS FOR (c:Community) ON (c.size)",
             "CREATE INDEX relationship_type_index IF NOT EXISTS FOR ()-[r:RELATIONSHIP]-() ON (r.type)",
             "CREATE INDEX relationship_strength_index IF NOT EXISTS FOR ()-[r:RELATIONSHIP]-() ON (r.strength)"
         ]
 
+        for constraint in constraints:
+            try:
+                await self.writer.run("create_constraints", constraint)
+            except Exception as e:
+                # Constraints may already exist
+                pass
+
+    async def migrate_temporal_properties(self, batch_size: int = 10000) -> int:
+        """Convert legacy ISO-string and local timestamps to native DateTime values
+
+        Runs once per database; a SchemaMigration marker node records completion.
+        Unparsable strings are logged and left as they are. Returns the number
+        of nodes and relationships converted.
+        """
+        marker = "temporal_datetime_v1"
+
         async with self.driver.session(database=self.config.database) as session:
-            for constraint in constraints:
-                try:
-                    await session.run(constraint)
-                except Exception as e:
-                    # Constraints may already exist
-                    pass
+            result = await session.run(
+                "MATCH (m:SchemaMigration {id: $marker}) RETURN m.id AS id",
+                marker=marker
+            )
+            if await result.single() is not None:
+                return 0
+
+        converted = 0
+        skipped = 0
+        for pattern, alias in (("(x:Node)", "x"), ("()-[x]->()", "x")):
+            for prop in ("created_at", "updated_at", "last_accessed"):
+                local_query = f"""
+                MATCH {pattern}
+                WHERE {alias}.{prop} IS :: LOCAL DATETIME NOT NULL
+                WITH {alias} LIMIT $batch_size
+                SET {alias}.{prop} = datetime(toString({alias}.{prop}))
+                RETURN count(*) AS converted
+                """
+                while True:
+                    # Each batch is its own transaction, so a retry only redoes one batch
+                    records = await self.writer.run("migrate_temporal_properties", local_query, batch_size=batch_size)
+                    batch = records[0]["converted"]
+                    converted += batch
+                    if batch < batch_size:
+                        break
+
+                # Strings are parsed here rather than by Cypher datetime(), which would
+                # abort the whole migration (and initialize) on one unparsable value
+                read_query = f"""
+                MATCH {pattern}
+                WHERE {alias}.{prop} IS :: STRING NOT NULL AND elementId({alias}) > $after
+                RETURN elementId({alias}) AS element_id, {alias}.{prop} AS value
+                ORDER BY element_id
+                LIMIT $batch_size
+                """
+                write_query = f"""
+                UNWIND $rows AS row
+                MATCH {pattern}
+                WHERE elementId({alias}) = row.element_id
+                SET {alias}.{prop} = row.value
+                """
+                after = ""
+                while True:
+                    records = await self.writer.run(
+                        "migrate_temporal_properties", read_query, after=after, batch_size=batch_size
+                    )
+                    if not records:
+                        break
+                    after = records[-1]["element_id"]
+
+                    rows = []
+                    for record in records:
+                        value = _parse_legacy_timestamp(record["value"])
+                        if value is None:
+                            skipped += 1
+                            logger.warning(
+                                f"Leaving unparsable {prop} {record['value']!r} on {record['element_id']} unconverted"
+                            )
+                        else:
+                            rows.append({"element_id": record["element_id"], "value": value})
+                    if rows:
+                        await self.writer.run("migrate_temporal_properties", write_query, rows=rows)
+                        converted += len(rows)
+                    if len(records) < batch_size:
+                        break
+
+        await self.writer.run(
+            "migrate_temporal_properties",
+            "MERGE (m:SchemaMigration {id: $marker}) SET m.applied_at = datetime()",
+            marker=marker
+        )
+
+        if converted:
+            logger.info(f"Migrated {converted} temporal properties to native DateTime")
+        if skipped:
+            logger.warning(f"Skipped {skipped} unparsable temporal properties during migration")
+        return converted
+
+    async def execute_write(
+        self,
+        operation: str,
+        work: Callable[[AsyncManagedTransaction], Awaitable[Any]]
+    ) -> Any:
+        """Run work as a managed write transaction with retry and latency metrics"""
+        return await self.writer.execute_write(operation, work)
 
     def _generate_node_id(self, name: str, node_type: NodeType) -> str:
         """Generate unique node ID"""
         content = f"{node_type.value}:{name}".lower()
         return hashlib.md5(content.encode()).hexdigest()
 
+    def conversation_node_id(self, conversation_id: str) -> str:
+        """Node id that store_conversation_memory will use for a conversation"""
+        return self._generate_node_id(f"Conversation {conversation_id}", NodeType.CONVERSATION)
+
     async def create_node(
         self,
         name: str,
@@ -156,33 +484,78 @@ class GraphMemorySystem:
         properties: Optional[Dict[str, Any]] = None
     ) -> str:
         """Create a new node in the graph"""
-        if not self._initialized:
-            await self.initialize()
+        return (await self.create_nodes([(name, node_type, properties)]))[0]
 
-        node_id = self._generate_node_id(name, node_type)
-        now = datetime.now()
-
-        node_properties = {
-            "id": node_id,
-            "name": name,
-            "type": node_type.value,
-            "created_at": now.isoformat(),
-            "updated_at": now.isoformat(),
-            "importance_score": 0.5,
-            "access_count": 0,
-            **(properties or {})
-        }
+    async def create_nodes(
+        self,
+        nodes: List[Tuple[str, NodeType, Optional[Dict[str, Any]]]]
+    ) -> List[str]:
+        """Create or update (name, type, properties) nodes in one write transaction
 
-        query = """
-        MERGE (n:Node {id: $node_id})
-        SET n += $properties, n:""" + node_type.value + """
-        RETURN n.id as id
+        Returns node ids in input order. Rows are merged per node type in id
+        order, so concurrent batches touching the same entities lock them in
+        the same order instead of deadlocking.
         """
+        if not self._initialized:
+            await self.initialize()
 
-        async with self.driver.session(database=self.config.database) as session:
-            result = await session.run(query, node_id=node_id, properties=node_properties)
-            record = await result.single()
-            return record["id"] if record else node_id
+        node_ids = []
+        rows: Dict[str, Dict[str, Any]] = {}
+        for name, node_type, properties in nodes:
+            node_id = self._generate_node_id(name, node_type)
+            node_ids.append(node_id)
+            row = rows.setdefault(node_id, {
+                "id": node_id,
+                "name": name,
+                "type": node_type.value,
+                "properties": {"id": node_id, "name": name, "type": node_type.value}
+            })
+            row["properties"].update(properties or {})
+
+        if not rows:
+            return node_ids
+
+        now = _utcnow()
+        names = [row["name"] for row in rows.values()]
+
+        if self.store is not None:
+            for row in rows.values():
+                created = self.store.get_node(row["id"]) is None
+                self.store.merge_node(row["id"], row["name"], row["type"], row["properties"], now)
+                if created:
+                    self.stats.record_node_created(now)
+            self.recall_cache.invalidate(node_ids=list(rows), names=names)
+            self.summaries.mark_dirty(names=names)
+            return node_ids
+
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows.values():
+            by_type.setdefault(row["type"], []).append({"id": row["id"], "properties": row["properties"]})
+
+        async def work(tx: AsyncManagedTransaction) -> int:
+            created = 0
+            for type_label in sorted(by_type):
+                # Timestamps are native DateTime values; created_at and the initial
+                # scores are only set when the node is first created
+                query = """
+                UNWIND $rows AS row
+                MERGE (n:Node {id: row.id})
+                ON CREATE SET n.created_at = $now,
+                              n.importance_score = 0.5,
+                              n.access_count = 0
+                SET n += row.properties, n.updated_at = $now, n:""" + type_label + """
+                RETURN count(CASE WHEN n.created_at = $now THEN 1 END) as created
+                """
+                result = await tx.run(query, rows=sorted_rows(by_type[type_label]), now=now)
+                created += (await result.single())["created"]
+            return created
+
+        created = await self.execute_write("create_nodes", work)
+        if created:
+            self.stats.activity.record(now, created)
+        self.recall_cache.invalidate(node_ids=list(rows), names=names)
+        self.summaries.mark_dirty(names=names)
+        return node_ids
 
     async def create_relationship(
         self,
@@ -193,33 +566,103 @@ class GraphMemorySystem:
         strength: float = 0.5
     ) -> bool:
         """Create a relationship between two nodes"""
+        return (await self.create_relationships([
+            (from_node_id, to_node_id, relationship_type, properties, strength)
+        ]))[0]
+
+    async def create_relationships(
+        self,
+        relationships: List[Tuple[str, str, RelationType, Optional[Dict[str, Any]], float]]
+    ) -> List[bool]:
+        """Record (from, to, type, properties, strength) mentions in one write transaction
+
+        Each row is one mention. A new relationship starts at the given
+        strength. A repeat mention increments mention_count, folds its
+        strength into an exponential moving average (edge_strength_ema_alpha)
+        and advances last_seen; first_seen is kept.
+
+        Returns, in input order, whether each relationship exists afterwards
+        (False when an endpoint node is missing). Rows are written per type in
+        endpoint id order to keep lock acquisition consistent across writers.
+        """
         if not self._initialized:
             await self.initialize()
 
-        now = datetime.now()
-        rel_properties = {
-            "type": relationship_type.value,
-            "strength": strength,
-            "created_at": now.isoformat(),
-            "updated_at": now.isoformat(),
-            **(properties or {})
-        }
+        rows = []
+        for from_id, to_id, relationship_type, properties, strength in relationships:
+            properties = dict(properties or {})
+            rows.append({
+                "from_id": from_id,
+                "to_id": to_id,
+                "type": relationship_type.value,
+                "strength": float(properties.pop("strength", strength)),
+                "properties": {"type": relationship_type.value, **properties}
+            })
+        if not rows:
+            return []
 
-        query = f"""
-        MATCH (a:Node {{id: $from_id}}), (b:Node {{id: $to_id}})
-        MERGE (a)-[r:{relationship_type.value}]->(b)
-        SET r += $properties
-        RETURN r
-        """
+        now = _utcnow()
+        touched = sorted({row["from_id"] for row in rows} | {row["to_id"] for row in rows})
 
-        async with self.driver.session(database=self.config.database) as session:
-            result = await session.run(
-                query,
-                from_id=from_node_id,
-                to_id=to_node_id,
-                properties=rel_properties
-            )
-            return await result.single() is not None
+        alpha = self.config.edge_strength_ema_alpha
+
+        if self.store is not None:
+            created = [
+                self.store.merge_relationship(
+                    row["from_id"], row["to_id"], row["type"],
+                    {**row["properties"], "strength": row["strength"]}, now, ema_alpha=alpha
+                )
+                for row in rows
+            ]
+            self.recall_cache.invalidate(node_ids=touched, edges_changed=True)
+            self.summaries.mark_dirty(self._mention_endpoints(rows))
+            return created
+
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_type.setdefault(row["type"], []).append(row)
+
+        async def work(tx: AsyncManagedTransaction) -> Set[Tuple[str, str, str]]:
+            written = set()
+            for rel_type in sorted(by_type):
+                query = f"""
+                UNWIND $rows AS row
+                MATCH (a:Node {{id: row.from_id}}), (b:Node {{id: row.to_id}})
+                MERGE (a)-[r:{rel_type}]->(b)
+                ON CREATE SET r.created_at = $now, r.first_seen = $now, r.mention_count = 0
+                WITH r, row, coalesce(r.mention_count, 1) AS mentions, r.strength AS previous_strength
+                SET r += row.properties,
+                    r.mention_count = mentions + 1,
+                    r.strength = CASE WHEN mentions = 0 OR previous_strength IS NULL THEN row.strength
+                                      ELSE $alpha * row.strength + (1 - $alpha) * previous_strength END,
+                    r.first_seen = coalesce(r.first_seen, r.created_at),
+                    r.last_seen = $now,
+                    r.updated_at = $now
+                RETURN row.from_id as from_id, row.to_id as to_id
+                """
+                result = await tx.run(
+                    query,
+                    rows=sorted_rows(by_type[rel_type], "from_id", "to_id"),
+                    now=now,
+                    alpha=alpha
+                )
+                async for record in result:
+                    written.add((record["from_id"], record["to_id"], rel_type))
+            return written
+
+        written = await self.execute_write("create_relationships", work)
+        self.recall_cache.invalidate(node_ids=touched, edges_changed=True)
+        self.summaries.mark_dirty(self._mention_endpoints(rows))
+        return [(row["from_id"], row["to_id"], row["type"]) in written for row in rows]
+
+    @staticmethod
+    def _mention_endpoints(rows: List[Dict[str, Any]]) -> Set[str]:
+        """Node ids on MENTIONED_IN rows, whose entity summaries are now stale"""
+        mentioned = set()
+        for row in rows:
+            if row["type"] == RelationType.MENTIONED_IN.value:
+                mentioned.update((row["from_id"], row["to_id"]))
+        return mentioned
 
     async def store_conversation_memory(
         self,
@@ -245,43 +688,29 @@ class GraphMemorySystem:
             }
         )
 
-        # Extract and create entity nodes
-        entity_nodes = []
+        # Entity nodes and their MENTIONED_IN links are each written as one batch
         if entities:
-            for entity in entities:
-                entity_id = await self.create_node(
-                    name=entity["name"],
-                    node_type=NodeType(entity.get("type", "CONCEPT")),
-                    properties=entity.get("properties", {})
-                )
-                entity_nodes.append(entity_id)
-
-                # Connect entity to conversation
-                await self.create_relationship(
-                    conv_node_id,
-                    entity_id,
-                    RelationType.MENTIONED_IN,
-                    properties={"confidence": entity.get("confidence", 0.8)}
-                )
-
-        # Auto-extract entities from text if not provided
-        if not entities:
+            node_specs = [
+                (entity["name"], NodeType(entity.get("type", "CONCEPT")), entity.get("properties", {}))
+                for entity in entities
+            ]
+            link_properties = [{"confidence": entity.get("confidence", 0.8)} for entity in entities]
+        else:
+            # Auto-extract entities from text if not provided
             extracted_entities = await self._extract_entities(user_message + " " + assistant_response)
-            for entity_name, entity_type in extracted_entities:
-                entity_id = await self.create_node(
-                    name=entity_name,
-                    node_type=entity_type,
-                    properties={"auto_extracted": True}
-                )
-                entity_nodes.append(entity_id)
-
-                await self.create_relationship(
-                    conv_node_id,
-                    entity_id,
-                    RelationType.MENTIONED_IN,
-                    properties={"auto_extracted": True, "confidence": 0.6}
-                )
-
+            node_specs = [
+                (entity_name, entity_type, {"auto_extracted": True})
+                for entity_name, entity_type in extracted_entities
+            ]
+            link_properties = [{"auto_extracted": True, "confidence": 0.6} for _ in extracted_entities]
+
+        entity_nodes = await self.create_nodes(node_specs)
+        await self.create_relationships([
+            (conv_node_id, entity_id, RelationType.MENTIONED_IN, properties, 0.5)
+            for entity_id, properties in zip(entity_nodes, link_properties)
+        ])
+
+        self.clustering.mark_dirty([conv_node_id, *entity_nodes])
         return conv_node_id
 
     async def _extract_entities(self, text: str) -> List[Tuple[str, NodeType]]:
@@ -308,43 +737,172 @@ class GraphMemorySystem:
         query_entities: List[str],
         relationship_types: Optional[List[RelationType]] = None,
         max_depth: int = 2,
-        limit: int = 10
+        limit: int = 10,
+        fields: Optional[List[str]] = None,
+        snippet_length: Optional[int] = None,
+        ids_only: bool = False
     ) -> List[Dict[str, Any]]:
         """Find memories related to given entities"""
+        page = await self.find_related_memories_page(
+            query_entities,
+            relationship_types=relationship_types,
+            max_depth=max_depth,
+            limit=limit,
+            fields=fields,
+            snippet_length=snippet_length,
+            ids_only=ids_only
+        )
+        return page["items"]
+
+    async def find_related_memories_page(
+        self,
+        query_entities: List[str],
+        relationship_types: Optional[List[RelationType]] = None,
+        max_depth: int = 2,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        snippet_length: Optional[int] = None,
+        ids_only: bool = False
+    ) -> Dict[str, Any]:
+        """Find one page of related memories, ranked by relevance
+
+        fields selects which conversation properties to return, snippet_length
+        truncates text fields server-side and ids_only drops content entirely,
+        so Neo4j only ships the bytes the caller needs. Pass the returned
+        next_cursor to fetch the following page.
+        """
         if not self._initialized:
             await self.initialize()
 
         if not query_entities:
-            return []
+            return {"items": [], "next_cursor": None}
+
+        cache_key = self.recall_cache.make_key(
+            "find_related_memories",
+            query_entities,
+            relationship_types=[rt.value for rt in relationship_types or []],
+            max_depth=max_depth,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            snippet_length=snippet_length,
+            ids_only=ids_only
+        )
+        cached = self.recall_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        generation = self.recall_cache.generation
+
+        after = _decode_cursor(cursor)
+        if self.store is not None:
+            memories, touched_ids = self._related_memories_embedded(
+                query_entities, relationship_types, max_depth, limit, after,
+                fields, snippet_length, ids_only
+            )
+        else:
+            memories, touched_ids = await self._related_memories_neo4j(
+                query_entities, relationship_types, max_depth, limit, after,
+                fields, snippet_length, ids_only
+            )
+
+        next_cursor = None
+        if len(memories) == limit:
+            next_cursor = _encode_cursor({
+                "score": memories[-1]["relevance_score"],
+                "id": memories[-1]["id"]
+            })
+
+        page = {"items": memories, "next_cursor": next_cursor}
+        if self.recall_cache.enabled:
+            # A new edge changes this recall only if an endpoint lies within
+            # max_depth - 1 hops of a query node, so tag that whole neighborhood
+            neighborhood = await self._recall_neighborhood(query_entities, relationship_types, max_depth - 1)
+            self.recall_cache.put(
+                cache_key,
+                page,
+                self._recall_cache_tags(query_entities, touched_ids, neighborhood),
+                generation=generation
+            )
+        return page
 
+    async def _recall_neighborhood(
+        self,
+        query_entities: List[str],
+        relationship_types: Optional[List[RelationType]],
+        radius: int
+    ) -> Optional[Set[str]]:
+        """Ids within radius hops of the query nodes, or None past recall_cache_max_neighborhood"""
+        rel_types = [rt.value for rt in relationship_types] if relationship_types else None
+        limit = self.config.recall_cache_max_neighborhood
+        if self.store is not None:
+            return self.store.within_hops(query_entities, rel_types, radius, limit)
+
+        rel_filter = f":{'|'.join(rel_types)}" if rel_types else ""
+        query = f"""
+        MATCH (query_node:Node)
+        WHERE query_node.name IN $entity_names
+        MATCH (query_node)-[{rel_filter}*0..{max(radius, 0)}]-(n:Node)
+        RETURN DISTINCT n.id as id
+        LIMIT $limit
+        """
+        async with self.driver.session(database=self.config.database) as session:
+            result = await session.run(query, entity_names=query_entities, limit=limit + 1)
+            ids = {record["id"] async for record in result}
+        return ids if len(ids) <= limit else None
+
+    async def _related_memories_neo4j(
+        self,
+        query_entities: List[str],
+        relationship_types: Optional[List[RelationType]],
+        max_depth: int,
+        limit: int,
+        after: Dict[str, Any],
+        fields: Optional[List[str]],
+        snippet_length: Optional[int],
+        ids_only: bool
+    ) -> Tuple[List[Dict[str, Any]], Set[str]]:
+        """Ranked related-memory page from Neo4j, plus every node id on the matched paths"""
         # Build relationship type filter
         rel_filter = ""
         if relationship_types:
             rel_types = "|".join([rt.value for rt in relationship_types])
             rel_filter = f":{rel_types}"
 
+        projection, projected_fields = _conversation_projection("related", fields, snippet_length, ids_only)
+
         query = f"""
         MATCH (query_node:Node)
         WHERE query_node.name IN $entity_names
 
-        MATCH path = (query_node)-[r{rel_filter}*1..{max_depth}]-(related:Node)
-        WHERE related.type = 'Conversation'
+        MATCH path = (query_node)-[{rel_filter}*1..{max_depth}]-(related:Conversation)
+
+        WITH related, query_node, path,
+             reduce(total = 0.0, rel IN relationships(path) | total + coalesce(rel.strength, 0.5))
+                 / length(path) as path_strength
 
         WITH related,
-             length(path) as distance,
-             avg(r.strength) as avg_strength,
-             count(DISTINCT query_node) as entity_matches
-
-        RETURN related.id as id,
-               related.name as name,
-               related.user_message as user_message,
-               related.assistant_response as assistant_response,
-               related.created_at as created_at,
+             min(length(path)) as distance,
+             avg(path_strength) as avg_strength,
+             count(DISTINCT query_node) as entity_matches,
+             collect([n IN nodes(path) | n.id]) as path_node_ids
+
+        WITH related, distance, avg_strength, entity_matches, path_node_ids,
+             entity_matches * 0.5 + avg_strength * 0.3 + (1.0 / distance) * 0.2 as raw_score
+        WITH related, distance, avg_strength, entity_matches, path_node_ids,
+             CASE WHEN raw_score > 1.0 THEN 1.0 ELSE raw_score END as relevance_score
+        WHERE $after_score IS NULL
+           OR relevance_score < $after_score
+           OR (relevance_score = $after_score AND related.id > $after_id)
+
+        RETURN {projection},
                distance,
                avg_strength,
-               entity_matches
+               entity_matches,
+               relevance_score,
+               path_node_ids
 
-        ORDER BY entity_matches DESC, avg_strength DESC, distance ASC
+        ORDER BY relevance_score DESC, id ASC
         LIMIT $limit
         """
 
@@ -352,28 +910,98 @@ class GraphMemorySystem:
             result = await session.run(
                 query,
                 entity_names=query_entities,
+                after_score=after.get("score"),
+                after_id=after.get("id"),
+                snippet_length=snippet_length,
                 limit=limit
             )
 
             memories = []
+            touched_ids = set()
             async for record in result:
-                memories.append({
-                    "id": record["id"],
-                    "name": record["name"],
-                    "user_message": record["user_message"],
-                    "assistant_response": record["assistant_response"],
-                    "created_at": record["created_at"],
+                for path_ids in record["path_node_ids"]:
+                    touched_ids.update(path_ids)
+                memory = _project_record(record, projected_fields)
+                memory.update({
                     "distance": record["distance"],
                     "strength": record["avg_strength"],
                     "entity_matches": record["entity_matches"],
-                    "relevance_score": self._calculate_relevance_score(
-                        record["entity_matches"],
-                        record["avg_strength"],
-                        record["distance"]
-                    )
+                    "relevance_score": record["relevance_score"]
                 })
+                memories.append(memory)
+
+        return memories, touched_ids
+
+    def _related_memories_embedded(
+        self,
+        query_entities: List[str],
+        relationship_types: Optional[List[RelationType]],
+        max_depth: int,
+        limit: int,
+        after: Dict[str, Any],
+        fields: Optional[List[str]],
+        snippet_length: Optional[int],
+        ids_only: bool
+    ) -> Tuple[List[Dict[str, Any]], Set[str]]:
+        """Ranked related-memory page from the embedded store"""
+        _, projected_fields = _conversation_projection("related", fields, snippet_length, ids_only)
+        aggregates = self.store.related_conversations(
+            query_entities,
+            [rt.value for rt in relationship_types] if relationship_types else None,
+            max_depth
+        )
 
-            return sorted(memories, key=lambda x: x["relevance_score"], reverse=True)
+        ranked = []
+        for index, entry in aggregates.items():
+            avg_strength = entry["strength_total"] / entry["paths"]
+            entity_matches = len(entry["query_nodes"])
+            score = self._calculate_relevance_score(entity_matches, avg_strength, entry["distance"])
+            ranked.append((score, self.store.nodes[index].id, index, entry, avg_strength, entity_matches))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+
+        if after:
+            ranked = [
+                item for item in ranked
+                if item[0] < after["score"] or (item[0] == after["score"] and item[1] > after["id"])
+            ]
+
+        memories = []
+        touched_ids = set()
+        for score, _, index, entry, avg_strength, entity_matches in ranked[:limit]:
+            touched_ids.update(self.store.nodes[i].id for i in entry["path_nodes"])
+            memory = _project_node(self.store.nodes[index], projected_fields, snippet_length)
+            memory.update({
+                "distance": entry["distance"],
+                "strength": avg_strength,
+                "entity_matches": entity_matches,
+                "relevance_score": score
+            })
+            memories.append(memory)
+
+        return memories, touched_ids
+
+    def _recall_cache_tags(
+        self,
+        entity_names: List[str],
+        result_ids: Iterable[str],
+        neighborhood: Optional[Iterable[str]] = ()
+    ) -> Set[str]:
+        """Cache tags for a recall: every id an entity name can map to, plus traversed ids
+
+        A neighborhood of None means it was too large to enumerate; the entry
+        is then tagged to be dropped on any relationship write.
+        """
+        tags = set()
+        if neighborhood is None:
+            tags.add(RecallCache.ANY_EDGE_TAG)
+        else:
+            tags.update(RecallCache.id_tag(node_id) for node_id in neighborhood)
+        for name in entity_names:
+            tags.add(RecallCache.name_tag(name))
+            for node_type in NodeType:
+                tags.add(RecallCache.id_tag(self._generate_node_id(name, node_type)))
+        tags.update(RecallCache.id_tag(node_id) for node_id in result_ids)
+        return tags
 
     def _calculate_relevance_score(
         self,
@@ -386,139 +1014,390 @@ class GraphMemorySystem:
         score = (entity_matches * 0.5) + (avg_strength * 0.3) + ((1.0 / distance) * 0.2)
         return min(score, 1.0)
 
-    async def update_node_importance(self, node_id: str, access_weight: float = 0.1):
-        """Update node importance based on access patterns"""
+    async def update_node_importance(self, node_id: str, access_weight: float = 0.1) -> Optional[float]:
+        """Record an access to a node; persisted by the next batched flush
+
+        Initializing starts the flush loop. When it is not running (after
+        close, for example) the access is written through immediately rather
+        than buffered where nothing would ever flush it. Returns the node's
+        importance including this access, or None if the node does not exist.
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        self.access_aggregator.record(node_id, access_weight)
+        if not self.access_aggregator.running:
+            await self.access_aggregator.flush()
+        return await self._current_importance(node_id)
+
+    async def _current_importance(self, node_id: str) -> Optional[float]:
+        """Stored importance decayed to now, plus accesses still waiting for a flush"""
+        half_life_seconds = self.config.importance_half_life_days * 86400
+
+        if self.store is not None:
+            node = self.store.get_node(node_id)
+            if node is None:
+                return None
+            now = time.time()
+            score = node.importance_score
+            elapsed = now - (node.importance_decayed_at or now)
+        else:
+            query = """
+            MATCH (n:Node {id: $node_id})
+            RETURN coalesce(n.importance_score, 0.5) AS score,
+                   duration.inSeconds(coalesce(n.importance_decayed_at, datetime()), datetime()).seconds AS elapsed
+            """
+            async with self.driver.session(database=self.config.database) as session:
+                result = await session.run(query, node_id=node_id)
+                record = await result.single()
+            if record is None:
+                return None
+            score, elapsed = record["score"], record["elapsed"]
+
+        return score * 0.5 ** (elapsed / half_life_seconds) + self.access_aggregator.pending_weight(node_id)
+
+    async def flush_access_updates(self) -> int:
+        """Persist buffered access counts and importance weights immediately"""
         if not self._initialized:
             await self.initialize()
 
-        query = """
-        MATCH (n:Node {id: $node_id})
-        SET n.access_count = n.access_count + 1,
-            n.last_accessed = datetime(),
-            n.importance_score = n.importance_score + $access_weight
-        RETURN n.importance_score as new_score
+        return await self.access_aggregator.flush()
+
+    async def _flush_access_updates(self, updates: List[Dict[str, Any]]):
+        """Apply coalesced accesses and importance decay, then background maintenance, in one batch job"""
+        half_life_seconds = self.config.importance_half_life_days * 86400
+
+        if self.store is not None:
+            self.store.apply_access_updates(updates, half_life_seconds)
+            if updates:
+                self.recall_cache.invalidate(node_ids=[update["id"] for update in updates])
+            now = time.monotonic()
+            if now - self._last_decay_sweep >= self.config.importance_decay_sweep_interval:
+                self.store.decay_sweep(
+                    self.config.importance_decay_sweep_interval,
+                    self.config.importance_decay_batch_size,
+                    half_life_seconds
+                )
+                self._last_decay_sweep = now
+            await self._run_background_maintenance()
+            return
+
+        if updates:
+            # Decay the accumulated score for the time since its last decay,
+            # then add this batch's weight on top; rows arrive sorted by id
+            query = """
+            UNWIND $updates AS update
+            MATCH (n:Node {id: update.id})
+            WITH n, update,
+                 duration.inSeconds(coalesce(n.importance_decayed_at, datetime()), datetime()).seconds AS elapsed
+            SET n.access_count = coalesce(n.access_count, 0) + update.count,
+                n.last_accessed = datetime(),
+                n.importance_score = coalesce(n.importance_score, 0.5) * 0.5 ^ (elapsed / $half_life)
+                                     + update.weight,
+                n.importance_decayed_at = datetime()
+            """
+            await self.writer.run("flush_access_updates", query, updates=updates, half_life=half_life_seconds)
+            self.recall_cache.invalidate(node_ids=[update["id"] for update in updates])
+
+        now = time.monotonic()
+        if now - self._last_decay_sweep >= self.config.importance_decay_sweep_interval:
+            # Decay nodes that haven't been accessed recently, one bounded page per sweep
+            query = """
+            MATCH (n:Node)
+            WHERE n.importance_decayed_at IS NULL
+               OR n.importance_decayed_at < datetime() - duration({seconds: $sweep_interval})
+            WITH n ORDER BY n.id LIMIT $batch_size
+            WITH n, duration.inSeconds(coalesce(n.importance_decayed_at, datetime()), datetime()).seconds AS elapsed
+            SET n.importance_score = coalesce(n.importance_score, 0.5) * 0.5 ^ (elapsed / $half_life),
+                n.importance_decayed_at = datetime()
+            """
+            await self.writer.run(
+                "importance_decay_sweep",
+                query,
+                sweep_interval=int(self.config.importance_decay_sweep_interval),
+                batch_size=self.config.importance_decay_batch_size,
+                half_life=half_life_seconds
+            )
+            self._last_decay_sweep = now
+
+        await self._run_background_maintenance()
+
+    async def _run_background_maintenance(self):
+        """Work piggybacked on each access flush: dirty summaries, then due compaction"""
+        try:
+            await self.summaries.refresh_dirty()
+        except Exception as e:
+            logger.warning(f"Entity summary refresh failed: {e}")
+        await self._maybe_compact_edges()
+
+    async def _maybe_compact_edges(self):
+        """Run edge compaction from the flush loop once per edge_compaction_interval"""
+        now = time.monotonic()
+        if now - self._last_edge_compaction >= self.config.edge_compaction_interval:
+            self._last_edge_compaction = now
+            await self.compact_edges()
+
+    async def compact_edges(self) -> Dict[str, int]:
+        """Prune weak stale relationships and fold reverse duplicates"""
+        if not self._initialized:
+            await self.initialize()
+
+        result = await self.edge_compactor.compact()
+        if result["pruned"] or result["merged"]:
+            # Removed edges can change any cached traversal
+            self.recall_cache.clear()
+            self.summaries.clear()
+            self.stats.invalidate()
+        return result
+
+    async def get_entity_summaries(self, entity_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Materialized neighborhood summaries for entities, keyed by name
+
+        Each summary holds the entity's most recent conversations, its strongest
+        co-mentioned neighbors, its mention count and last mention. Hot entities
+        are served from memory; summaries are rebuilt when new MENTIONED_IN edges
+        touch them.
         """
+        if not self._initialized:
+            await self.initialize()
 
-        async with self.driver.session(database=self.config.database) as session:
-            result = await session.run(query, node_id=node_id, access_weight=access_weight)
-            record = await result.single()
-            return record["new_score"] if record else None
+        return await self.summaries.get(entity_names)
 
     async def find_memory_clusters(
         self,
         min_cluster_size: int = 3,
-        relationship_strength_threshold: float = 0.6
+        relationship_strength_threshold: Optional[float] = None,
+        limit: int = 20,
+        max_members: int = 50,
+        recompute: bool = False
     ) -> List[Dict[str, Any]]:
-        """Find clusters of related memories"""
+        """Find clusters of related memories from precomputed communities
+
+        Communities are detected once over the whole graph (or when recompute is
+        set) and kept current incrementally as conversations are stored, so this
+        is an indexed lookup on Community nodes and Node.community_id.
+        relationship_strength_threshold only applies when communities are computed.
+        """
         if not self._initialized:
             await self.initialize()
 
-        query = """
-        MATCH (n:Node)-[r:RELATIONSHIP]-(m:Node)
-        WHERE r.strength >= $strength_threshold
-        WITH n, collect(m) as connected_nodes
-        WHERE size(connected_nodes) >= $min_size
-
-        RETURN n.id as central_node,
-               n.name as central_name,
-               n.type as central_type,
-               [node in connected_nodes | {id: node.id, name: node.name, type: node.type}] as cluster_nodes,
-               size(connected_nodes) as cluster_size
-
-        ORDER BY cluster_size DESC
-        """
+        if recompute or not await self.clustering.has_communities():
+            await self.clustering.detect_communities(relationship_strength_threshold)
+        elif self.clustering.has_pending_updates:
+            await self.clustering.apply_incremental(relationship_strength_threshold)
 
-        async with self.driver.session(database=self.config.database) as session:
-            result = await session.run(
-                query,
-                strength_threshold=relationship_strength_threshold,
-                min_size=min_cluster_size
-            )
+        return await self.clustering.get_clusters(
+            min_cluster_size=min_cluster_size,
+            limit=limit,
+            max_members=max_members
+        )
 
-            clusters = []
-            async for record in result:
-                clusters.append({
-                    "central_node": record["central_node"],
-                    "central_name": record["central_name"],
-                    "central_type": record["central_type"],
-                    "cluster_nodes": record["cluster_nodes"],
-                    "cluster_size": record["cluster_size"]
-                })
+    async def detect_memory_communities(
+        self,
+        relationship_strength_threshold: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Recompute memory communities over the whole graph"""
+        if not self._initialized:
+            await self.initialize()
 
-            return clusters
+        return await self.clustering.detect_communities(relationship_strength_threshold)
 
     async def get_memory_timeline(
         self,
         entity_name: str,
-        days_back: int = 30
+        days_back: int = 30,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        snippet_length: Optional[int] = None,
+        ids_only: bool = False
     ) -> List[Dict[str, Any]]:
-        """Get timeline of memories related to an entity"""
+        """Get timeline of memories related to an entity, newest first"""
+        timeline: List[Dict[str, Any]] = []
+        cursor = None
+
+        while True:
+            page_size = self.config.timeline_page_size
+            if limit is not None:
+                page_size = min(page_size, limit - len(timeline))
+
+            page = await self.get_memory_timeline_page(
+                entity_name,
+                days_back=days_back,
+                limit=page_size,
+                cursor=cursor,
+                fields=fields,
+                snippet_length=snippet_length,
+                ids_only=ids_only
+            )
+            timeline.extend(page["items"])
+            cursor = page["next_cursor"]
+
+            if cursor is None or (limit is not None and len(timeline) >= limit):
+                return timeline
+
+    async def get_memory_timeline_page(
+        self,
+        entity_name: str,
+        days_back: int = 30,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        snippet_length: Optional[int] = None,
+        ids_only: bool = False
+    ) -> Dict[str, Any]:
+        """Get one page of an entity's timeline using a keyset cursor
+
+        Returns conversations newest first, leaving the planner to start from
+        the entity or the Conversation.created_at index, whichever is more
+        selective; pass the returned next_cursor to continue. Projection options
+        behave as in find_related_memories_page.
+        """
         if not self._initialized:
             await self.initialize()
 
-        cutoff_date = (datetime.now() - timedelta(days=days_back)).isoformat()
+        cache_key = self.recall_cache.make_key(
+            "get_memory_timeline",
+            [entity_name],
+            days_back=days_back,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            snippet_length=snippet_length,
+            ids_only=ids_only
+        )
+        cached = self.recall_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        generation = self.recall_cache.generation
+
+        cutoff = _utcnow() - timedelta(days=days_back)
+        after = _decode_cursor(cursor)
+        before = datetime.fromisoformat(after["t"]) if after else None
+
+        if self.store is not None:
+            timeline, last_created_at = self._timeline_embedded(
+                entity_name, cutoff, before, after.get("id"), limit,
+                fields, snippet_length, ids_only
+            )
+        else:
+            timeline, last_created_at = await self._timeline_neo4j(
+                entity_name, cutoff, before, after.get("id"), limit,
+                fields, snippet_length, ids_only
+            )
+
+        next_cursor = None
+        if len(timeline) == limit and last_created_at is not None:
+            next_cursor = _encode_cursor({"t": _to_iso(last_created_at), "id": timeline[-1]["id"]})
 
-        query = """
-        MATCH (entity:Node {name: $entity_name})-[:MENTIONED_IN]-(conv:Conversation)
-        WHERE conv.created_at >= $cutoff_date
+        page = {"items": timeline, "next_cursor": next_cursor}
+        self.recall_cache.put(
+            cache_key,
+            page,
+            self._recall_cache_tags([entity_name], [item["id"] for item in timeline]),
+            generation=generation
+        )
+        return page
 
-        RETURN conv.id as id,
-               conv.name as name,
-               conv.user_message as user_message,
-               conv.assistant_response as assistant_response,
-               conv.created_at as created_at
+    async def _timeline_neo4j(
+        self,
+        entity_name: str,
+        cutoff: datetime,
+        before: Optional[datetime],
+        before_id: Optional[str],
+        limit: int,
+        fields: Optional[List[str]],
+        snippet_length: Optional[int],
+        ids_only: bool
+    ) -> Tuple[List[Dict[str, Any]], Any]:
+        """One timeline page from Neo4j and the created_at of its last row"""
+        projection, projected_fields = _conversation_projection("conv", fields, snippet_length, ids_only)
 
-        ORDER BY conv.created_at DESC
+        query = f"""
+        MATCH (conv:Conversation)
+        WHERE conv.created_at >= $cutoff
+          AND ($before IS NULL OR conv.created_at <= $before)
+        WITH conv
+        WHERE ($before IS NULL OR conv.created_at < $before OR conv.id < $before_id)
+          AND EXISTS {{ (conv)-[:MENTIONED_IN]-(:Node {{name: $entity_name}}) }}
+
+        RETURN {projection},
+               conv.created_at as sort_created_at
+
+        ORDER BY sort_created_at DESC, id DESC
+        LIMIT $limit
         """
 
         async with self.driver.session(database=self.config.database) as session:
             result = await session.run(
                 query,
                 entity_name=entity_name,
-                cutoff_date=cutoff_date
+                cutoff=cutoff,
+                before=before,
+                before_id=before_id,
+                snippet_length=snippet_length,
+                limit=limit
             )
 
             timeline = []
+            last_created_at = None
             async for record in result:
-                timeline.append({
-                    "id": record["id"],
-                    "name": record["name"],
-                    "user_message": record["user_message"],
-                    "assistant_response": record["assistant_response"],
-                    "created_at": record["created_at"]
-                })
+                last_created_at = record["sort_created_at"]
+                timeline.append(_project_record(record, projected_fields))
+
+        return timeline, last_created_at
+
+    def _timeline_embedded(
+        self,
+        entity_name: str,
+        cutoff: datetime,
+        before: Optional[datetime],
+        before_id: Optional[str],
+        limit: int,
+        fields: Optional[List[str]],
+        snippet_length: Optional[int],
+        ids_only: bool
+    ) -> Tuple[List[Dict[str, Any]], Any]:
+        """One timeline page from the embedded store"""
+        _, projected_fields = _conversation_projection("conv", fields, snippet_length, ids_only)
+        # Compare at microsecond precision, the resolution cursors carry
+        cutoff_us = round(cutoff.timestamp() * 1_000_000)
+        before_us = round(before.timestamp() * 1_000_000) if before else None
+
+        conversations = [
+            conv for conv in self.store.mentioned_conversations(entity_name)
+            if round(conv.created_at * 1_000_000) >= cutoff_us
+            and (before_us is None or (round(conv.created_at * 1_000_000), conv.id) < (before_us, before_id))
+        ]
+        conversations.sort(key=lambda conv: (conv.created_at, conv.id), reverse=True)
+        conversations = conversations[:limit]
 
-            return timeline
+        timeline = [_project_node(conv, projected_fields, snippet_length) for conv in conversations]
+        last_created_at = conversations[-1].get("created_at") if conversations else None
+        return timeline, last_created_at
 
     async def health_check(self) -> Dict[str, Any]:
-        """Check graph database health"""
+        """Check graph database health from cached count-store stats"""
         try:
             if not self._initialized:
                 await self.initialize()
 
-            async with self.driver.session(database=self.config.database) as session:
-                # Count nodes and relationships
-                node_count_result = await session.run("MATCH (n:Node) RETURN count(n) as count")
-                node_count = (await node_count_result.single())["count"]
-
-                rel_count_result = await session.run("MATCH ()-[r]->() RETURN count(r) as count")
-                rel_count = (await rel_count_result.single())["count"]
-
-                # Check recent activity
-                recent_result = await session.run("""
-                MATCH (n:Node)
-                WHERE n.created_at >= datetime() - duration('P7D')
-                RETURN count(n) as recent_nodes
-                """)
-                recent_nodes = (await recent_result.single())["recent_nodes"]
-
-                return {
-                    "connected": True,
-                    "node_count": node_count,
-                    "relationship_count": rel_count,
-                    "recent_nodes": recent_nodes,
-                    "database": self.config.database
-                }
+            stats = await self.stats.snapshot()
+            health = {
+                "connected": True,
+                "backend": "embedded" if self.store is not None else "neo4j",
+                **stats,
+                "recall_cache": self.recall_cache.stats(),
+                "access_aggregator": self.access_aggregator.stats(),
+                "writes": self.writer.stats(),
+                "edge_compaction": self.edge_compactor.stats(),
+                "entity_summaries": self.summaries.stats(),
+                "stats": self.stats.stats()
+            }
+            if self.store is not None:
+                health["snapshot_path"] = self.config.snapshot_path
+            else:
+                health["database"] = self.config.database
+            return health
 
         except Exception as e:
             return {
@@ -528,10 +1407,26 @@ class GraphMemorySystem:
             }
 
     async def query_graph(self, cypher_query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Execute custom Cypher query"""
+        """Execute custom Cypher query
+
+        The embedded backend has no Cypher engine; it returns a single
+        unsupported-backend error row instead of results.
+        """
         if not self._initialized:
             await self.initialize()
 
+        if self.store is not None:
+            return [{
+                "error": "unsupported_on_embedded_backend",
+                "message": "Custom Cypher queries require the Neo4j backend",
+                "backend": "embedded"
+            }]
+
+        # Arbitrary Cypher may write, so cached recall and stats can no longer be trusted
+        self.recall_cache.clear()
+        self.summaries.clear()
+        self.stats.invalidate()
+
         async with self.driver.session(database=self.config.database) as session:
             result = await session.run(cypher_query, parameters or {})
             return [record.data() for record in await result.data()]
@@ -581,20 +1476,26 @@ async def store_graph_memory(
         return f"Graph storage error: {str(e)}"
 
 
+def extract_query_entities(query: str, max_entities: int = 3) -> List[str]:
+    """Pick candidate entity names out of a free-text query (simple approach)"""
+    words = [word.strip('.,!?') for word in query.split() if len(word) > 3]
+    entity_candidates = [word.title() for word in words if word[0].isupper()]
+
+    if not entity_candidates:
+        entity_candidates = words  # Fallback to all words
+
+    return entity_candidates[:max_entities]
+
+
 async def query_graph_memory_tool(query: str) -> str:
     """Query graph memory - used by PydanticAI tools"""
     try:
-        # Extract entities from query (simple approach)
-        words = [word.strip('.,!?') for word in query.split() if len(word) > 3]
-        entity_candidates = [word.title() for word in words if word[0].isupper()]
-
-        if not entity_candidates:
-            entity_candidates = words  # Fallback to all words
-
         memories = await graph_memory.find_related_memories(
-            query_entities=entity_candidates[:3],  # Limit to top 3 entities
+            query_entities=extract_query_entities(query),
             max_depth=2,
-            limit=5
+            limit=5,
+            fields=["user_message", "assistant_response"],
+            snippet_length=100
         )
 
         if not memories:
@@ -611,4 +1512,32 @@ async def query_graph_memory_tool(query: str) -> str:
         return "\n\n".join(result_parts)
 
     except Exception as e:
-        return f"Graph query error: {str(e)}"
\ No newline at end of file
+        return f"Graph query error: {str(e)}"
+
+
+async def entity_summaries_tool(query: str) -> str:
+    """Summarize the entities in a query from materialized neighborhoods - used by tools and prompts"""
+    try:
+        summaries = await graph_memory.get_entity_summaries(extract_query_entities(query))
+
+        if not summaries:
+            return f"No known entities found for: {query}"
+
+        result_parts = []
+        for entity, summary in summaries.items():
+            neighbors = ", ".join(neighbor["name"] for neighbor in summary["neighbors"])
+            lines = [
+                f"Entity {entity} ({summary['mention_count']} mentions, last {summary['last_mentioned']})"
+                + (f"; related: {neighbors}" if neighbors else "")
+            ]
+            for conversation in summary["conversations"]:
+                lines.append(
+                    f"Memory: {(conversation['user_message'] or '')[:100]}... -> "
+                    f"{(conversation['assistant_response'] or '')[:100]}..."
+                )
+            result_parts.append("\n".join(lines))
+
+        return "\n\n".join(result_parts)
+
+    except Exception as e:
+        return f"Entity summary error: {str(e)}"
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+Graph Snapshot Export/Import
+Columnar binary snapshots of the memory graph for backup, migration between
+backends, staging seeds and offline analysis with NumPy
+
+A snapshot is an .npz archive of flat arrays, readable with numpy.load:
+
+- meta: UTF-8 JSON with format version, export time, counts and the
+  interned node_types, rel_types and property_keys tables
+- node id and name string tables (utf-8 blob + int64 offsets)
+- per-node columns: type code, timestamps (epoch seconds, NaN when unset),
+  importance, access count and community code
+- node properties as [key code, value] pairs, JSON per node
+- edges in CSR order by source node: indptr, dst, type code, strength,
+  mention count, first/last seen, plus sparse extra properties
+- communities: id table, size and central node index
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from graph_store import decode_json_value, encode_json_value
+
+logger = logging.getLogger("pai-graph-snapshot")
+
+# Version 2 tags temporal and bytes property values; version 1 stored them as strings
+FORMAT_VERSION = 2
+READABLE_FORMAT_VERSIONS = (1, 2)
+
+# Node/relationship attributes stored in dedicated columns rather than properties
+NODE_COLUMNS = {
+    "id", "name", "type", "created_at", "updated_at", "importance_score", "access_count",
+    "last_accessed", "importance_decayed_at", "community_id"
+}
+EDGE_COLUMNS = {"type", "strength", "mention_count", "first_seen", "last_seen", "created_at", "updated_at"}
+
+_LABEL_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _epoch(value: Any) -> float:
+    """Neo4j/Python temporal value or epoch float to epoch seconds; NaN when unset"""
+    if value is None:
+        return float("nan")
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _json_default(value: Any) -> Any:
+    """Property encoder: Neo4j temporal values as their Python equivalents, tagged"""
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    return encode_json_value(value)
+
+
+def _from_epoch(value: float) -> Optional[datetime]:
+    if np.isnan(value):
+        return None
+    return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+
+def _encode_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    blob = data.tobytes()
+    return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+def _checked_label(label: str) -> str:
+    """Labels and relationship types are spliced into Cypher, so only accept identifiers"""
+    if not _LABEL_PATTERN.match(label):
+        raise ValueError(f"Invalid label in graph snapshot: {label!r}")
+    return label
+
+
+@dataclass
+class GraphSnapshot:
+    """Decoded snapshot columns"""
+    meta: Dict[str, Any]
+    node_ids: List[str]
+    node_names: List[str]
+    node_type: np.ndarray
+    node_created: np.ndarray
+    node_updated: np.ndarray
+    node_last_accessed: np.ndarray
+    node_decayed_at: np.ndarray
+    node_importance: np.ndarray
+    node_access_count: np.ndarray
+    node_community: np.ndarray
+    node_properties: List[Dict[str, Any]]
+    edge_indptr: np.ndarray
+    edge_dst: np.ndarray
+    edge_type: np.ndarray
+    edge_strength: np.ndarray
+    edge_mentions: np.ndarray
+    edge_first_seen: np.ndarray
+    edge_last_seen: np.ndarray
+    edge_properties: List[Optional[Dict[str, Any]]]
+    community_ids: List[str]
+    community_size: np.ndarray
+    community_central: np.ndarray
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.edge_dst.shape[0])
+
+    def edge_src(self) -> np.ndarray:
+        """Source node index per edge, expanded from the CSR indptr"""
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int64), np.diff(self.edge_indptr))
+
+    def node_rows(self) -> Iterator[Dict[str, Any]]:
+        node_types = self.meta["node_types"]
+        for i in range(self.num_nodes):
+            community = int(self.node_community[i])
+            yield {
+                "id": self.node_ids[i],
+                "name": self.node_names[i],
+                "type": node_types[int(self.node_type[i])],
+                "properties": self.node_properties[i],
+                "created_at": _from_epoch(self.node_created[i]),
+                "updated_at": _from_epoch(self.node_updated[i]),
+                "last_accessed": _from_epoch(self.node_last_accessed[i]),
+                "importance_decayed_at": _from_epoch(self.node_decayed_at[i]),
+                "importance_score": float(self.node_importance[i]),
+                "access_count": int(self.node_access_count[i]),
+                "community_id": self.community_ids[community] if community >= 0 else None
+            }
+
+    def edge_rows(self) -> Iterator[Dict[str, Any]]:
+        rel_types = self.meta["rel_types"]
+        src = self.edge_src()
+        for edge in range(self.num_edges):
+            yield {
+                "from_id": self.node_ids[int(src[edge])],
+                "to_id": self.node_ids[int(self.edge_dst[edge])],
+                "type": rel_types[int(self.edge_type[edge])],
+                "strength": float(self.edge_strength[edge]),
+                "mention_count": int(self.edge_mentions[edge]),
+                "first_seen": _from_epoch(self.edge_first_seen[edge]),
+                "last_seen": _from_epoch(self.edge_last_seen[edge]),
+                "properties": self.edge_properties[edge] or {}
+            }
+
+    def community_rows(self) -> Iterator[Dict[str, Any]]:
+        for i, community_id in enumerate(self.community_ids):
+            central = int(self.community_central[i])
+            yield {
+                "id": community_id,
+                "size": int(self.community_size[i]),
+                "central_node": self.node_ids[central] if central >= 0 else None
+            }
+
+
+class SnapshotBuilder:
+    """Accumulates streamed nodes and edges and lays them out as snapshot columns"""
+
+    def __init__(self):
+        self._node_index: Dict[str, int] = {}
+        self._nodes: List[Tuple] = []
+        self._edges: List[Tuple] = []
+        self._communities: List[Tuple[str, int, Optional[str]]] = []
+        self._node_types: Dict[str, int] = {}
+        self._rel_types: Dict[str, int] = {}
+        self._property_keys: Dict[str, int] = {}
+        self._community_codes: Dict[str, int] = {}
+
+    @staticmethod
+    def _intern(table: Dict[str, int], value: str) -> int:
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(table)
+        return code
+
+    def add_node(
+        self,
+        node_id: str,
+        name: str,
+        node_type: str,
+        properties: Dict[str, Any],
+        created_at: Any = None,
+        updated_at: Any = None,
+        importance_score: Optional[float] = None,
+        access_count: Optional[int] = None,
+        last_accessed: Any = None,
+        importance_decayed_at: Any = None,
+        community_id: Optional[str] = None
+    ):
+        self._node_index[node_id] = len(self._nodes)
+        encoded_properties = [
+            [self._intern(self._property_keys, key), value]
+            for key, value in sorted(properties.items())
+            if key not in NODE_COLUMNS and value is not None
+        ]
+        self._nodes.append((
+            node_id,
+            name or "",
+            self._intern(self._node_types, node_type or ""),
+            encoded_properties,
+            _epoch(created_at),
+            _epoch(updated_at),
+            _epoch(last_accessed),
+            _epoch(importance_decayed_at),
+            0.5 if importance_score is None else float(importance_score),
+            0 if access_count is None else int(access_count),
+            self._intern(self._community_codes, community_id) if community_id else -1
+        ))
+
+    def add_edge(
+        self,
+        from_id: str,
+        to_id: str,
+        rel_type: str,
+        strength: Optional[float],
+        mention_count: Optional[int],
+        first_seen: Any,
+        last_seen: Any,
+        properties: Optional[Dict[str, Any]] = None
+    ):
+        extra = {key: value for key, value in (properties or {}).items() if key not in EDGE_COLUMNS}
+        self._edges.append((
+            from_id,
+            to_id,
+            self._intern(self._rel_types, rel_type),
+            0.5 if strength is None else float(strength),
+            1 if mention_count is None else int(mention_count),
+            _epoch(first_seen),
+            _epoch(last_seen),
+            extra or None
+        ))
+
+    def add_community(self, community_id: str, size: int, central_node: Optional[str]):
+        self._intern(self._community_codes, community_id)
+        self._communities.append((community_id, int(size), central_node))
+
+    def build(self, backend: str) -> GraphSnapshot:
+        """Resolve edge endpoints and sort edges into CSR order by source node"""
+        edges = [
+            (self._node_index[edge[0]], self._node_index[edge[1]], *edge[2:])
+            for edge in self._edges
+            if edge[0] in self._node_index and edge[1] in self._node_index
+        ]
+        dropped = len(self._edges) - len(edges)
+        if dropped:
+            logger.warning(f"Dropped {dropped} snapshot edges with endpoints outside the export")
+        edges.sort(key=lambda edge: edge[0])
+
+        n = len(self._nodes)
+        src = np.fromiter((edge[0] for edge in edges), dtype=np.int64, count=len(edges))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+        community_ids = list(self._community_codes)
+        sizes = {community_id: size for community_id, size, _ in self._communities}
+        centrals = {community_id: central for community_id, _, central in self._communities}
+
+        def column(rows, position, dtype):
+            return np.fromiter((row[position] for row in rows), dtype=dtype, count=len(rows))
+
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "backend": backend,
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "node_count": n,
+            "edge_count": len(edges),
+            "community_count": len(self._communities),
+            "node_types": list(self._node_types),
+            "rel_types": list(self._rel_types),
+            "property_keys": list(self._property_keys)
+        }
+
+        return GraphSnapshot(
+            meta=meta,
+            node_ids=[node[0] for node in self._nodes],
+            node_names=[node[1] for node in self._nodes],
+            node_type=column(self._nodes, 2, np.int16),
+            node_created=column(self._nodes, 4, np.float64),
+            node_updated=column(self._nodes, 5, np.float64),
+            node_last_accessed=column(self._nodes, 6, np.float64),
+            node_decayed_at=column(self._nodes, 7, np.float64),
+            node_importance=column(self._nodes, 8, np.float64),
+            node_access_count=column(self._nodes, 9, np.int64),
+            node_community=column(self._nodes, 10, np.int32),
+            node_properties=[
+                {meta["property_keys"][code]: value for code, value in node[3]} for node in self._nodes
+            ],
+            edge_indptr=indptr,
+            edge_dst=column(edges, 1, np.int64),
+            edge_type=column(edges, 2, np.int16),
+            edge_strength=column(edges, 3, np.float64),
+            edge_mentions=column(edges, 4, np.int64),
+            edge_first_seen=column(edges, 5, np.float64),
+            edge_last_seen=column(edges, 6, np.float64),
+            edge_properties=[edge[7] for edge in edges],
+            community_ids=community_ids,
+            community_size=np.array([sizes.get(c, 0) for c in community_ids], dtype=np.int64),
+            community_central=np.array(
+                [self._node_index.get(centrals.get(c), -1) for c in community_ids], dtype=np.int64
+            )
+        )
+
+
+def write_snapshot(snapshot: GraphSnapshot, path: str):
+    """Write a snapshot archive atomically"""
+    property_codes = {key: code for code, key in enumerate(snapshot.meta["property_keys"])}
+    node_properties = [
+        json.dumps([[property_codes[key], value] for key, value in properties.items()], default=_json_default)
+        for properties in snapshot.node_properties
+    ]
+    edge_properties = [
+        json.dumps(properties, default=_json_default) if properties else "" for properties in snapshot.edge_properties
+    ]
+
+    arrays = {"meta": np.frombuffer(json.dumps(snapshot.meta).encode("utf-8"), dtype=np.uint8)}
+    for name, values in (
+        ("node_ids", snapshot.node_ids),
+        ("node_names", snapshot.node_names),
+        ("node_properties", node_properties),
+        ("edge_properties", edge_properties),
+        ("community_ids", snapshot.community_ids)
+    ):
+        arrays[f"{name}_data"], arrays[f"{name}_offsets"] = _encode_strings(values)
+
+    for name in (
+        "node_type", "node_created", "node_updated", "node_last_accessed", "node_decayed_at",
+        "node_importance", "node_access_count", "node_community",
+        "edge_indptr", "edge_dst", "edge_type", "edge_strength", "edge_mentions",
+        "edge_first_seen", "edge_last_seen", "community_size", "community_central"
+    ):
+        arrays[name] = getattr(snapshot, name)
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(buffer.getbuffer())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str) -> GraphSnapshot:
+    """Load a snapshot archive written by write_snapshot"""
+    with np.load(path, allow_pickle=False) as archive:
+        meta = json.loads(archive["meta"].tobytes())
+        if meta.get("format_version") not in READABLE_FORMAT_VERSIONS:
+            raise ValueError(f"Unsupported graph snapshot format {meta.get('format_version')}")
+
+        def strings(name: str) -> List[str]:
+            return _decode_strings(archive[f"{name}_data"], archive[f"{name}_offsets"])
+
+        property_keys = meta["property_keys"]
+        return GraphSnapshot(
+            meta=meta,
+            node_ids=strings("node_ids"),
+            node_names=strings("node_names"),
+            node_properties=[
+                {property_keys[code]: value for code, value in json.loads(encoded, object_hook=decode_json_value)}
+                for encoded in strings("node_properties")
+            ],
+            edge_properties=[
+                json.loads(encoded, object_hook=decode_json_value) if encoded else None
+                for encoded in strings("edge_properties")
+            ],
+            community_ids=strings("community_ids"),
+            **{
+                name: archive[name]
+                for name in (
+                    "node_type", "node_created", "node_updated", "node_last_accessed", "node_decayed_at",
+                    "node_importance", "node_access_count", "node_community",
+                    "edge_indptr", "edge_dst", "edge_type", "edge_strength", "edge_mentions",
+                    "edge_first_seen", "edge_last_seen", "community_size", "community_central"
+                )
+            }
+        )
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class GraphSnapshotter:
+    """Streams the memory graph into snapshots and bulk-loads them back"""
+
+    def __init__(self, memory: "GraphMemorySystem"):
+        self.memory = memory
+
+    @property
+    def config(self):
+        return self.memory.config
+
+    async def export(self, path: str) -> Dict[str, Any]:
+        """Export nodes, edges and communities to path; returns the snapshot meta"""
+        builder = SnapshotBuilder()
+        if self.memory.store is not None:
+            self._collect_embedded(builder)
+            backend = "embedded"
+        else:
+            await self._collect_neo4j(builder)
+            backend = "neo4j"
+
+        snapshot = builder.build(backend)
+        await asyncio.to_thread(write_snapshot, snapshot, path)
+        logger.info(f"Exported graph snapshot with {snapshot.num_nodes} nodes and {snapshot.num_edges} edges")
+        return snapshot.meta
+
+    def _collect_embedded(self, builder: SnapshotBuilder):
+        store = self.memory.store
+        for node in store.nodes:
+            builder.add_node(
+                node.id, node.name, node.type, node.properties,
+                node.created_at, node.updated_at, node.importance_score, node.access_count,
+                node.last_accessed, node.importance_decayed_at, node.community_id
+            )
+        for edge in store.iter_edges():
+            builder.add_edge(**edge)
+        for community in store.communities.values():
+            builder.add_community(community["id"], community["size"], community.get("central_node"))
+
+    async def _collect_neo4j(self, builder: SnapshotBuilder):
+        # Keyset-paged over Node.id; each node brings its outgoing edges along
+        query = """
+        MATCH (n:Node)
+        WHERE $after IS NULL OR n.id > $after
+        WITH n ORDER BY n.id LIMIT $page_size
+        RETURN n.id AS id, n.name AS name, n.type AS type, properties(n) AS properties,
+               COLLECT {
+                   MATCH (n)-[r]->(m:Node)
+                   RETURN {to_id: m.id, type: type(r), properties: properties(r)}
+               } AS edges
+        """
+        after = None
+        async with self.memory.driver.session(database=self.config.database) as session:
+            while True:
+                result = await session.run(query, after=after, page_size=self.config.snapshot_page_size)
+                records = [record async for record in result]
+                for record in records:
+                    properties = record["properties"]
+                    builder.add_node(
+                        record["id"], record["name"], record["type"], properties,
+                        properties.get("created_at"), properties.get("updated_at"),
+                        properties.get("importance_score"), properties.get("access_count"),
+                        properties.get("last_accessed"), properties.get("importance_decayed_at"),
+                        properties.get("community_id")
+                    )
+                    for edge in record["edges"]:
+                        edge_properties = edge["properties"]
+                        builder.add_edge(
+                            record["id"], edge["to_id"], edge["type"],
+                            edge_properties.get("strength"),
+                            edge_properties.get("mention_count"),
+                            edge_properties.get("first_seen", edge_properties.get("created_at")),
+                            edge_properties.get("last_seen", edge_properties.get("updated_at")),
+                            edge_properties
+                        )
+                if len(records) < self.config.snapshot_page_size:
+                    break
+                after = records[-1]["id"]
+
+            result = await session.run(
+                "MATCH (c:Community) RETURN c.id AS id, c.size AS size, c.central_node AS central_node"
+            )
+            async for record in result:
+                builder.add_community(record["id"], record["size"] or 0, record["central_node"])
+
+    async def import_(self, path: str) -> Dict[str, int]:
+        """Merge a snapshot into the current graph; returns node/edge/community counts"""
+        snapshot = await asyncio.to_thread(read_snapshot, path)
+        if self.memory.store is not None:
+            self._load_embedded(snapshot)
+        else:
+            await self._load_neo4j(snapshot)
+
+        return {
+            "nodes": snapshot.num_nodes,
+            "edges": snapshot.num_edges,
+            "communities": len(snapshot.community_ids)
+        }
+
+    def _load_embedded(self, snapshot: GraphSnapshot):
+        store = self.memory.store
+        for row in snapshot.node_rows():
+            store.load_node(**row)
+        for row in snapshot.edge_rows():
+            store.load_edge(**row)
+        for row in snapshot.community_rows():
+            store.communities[row["id"]] = row
+
+    async def _load_neo4j(self, snapshot: GraphSnapshot):
+        batch_size = self.config.snapshot_write_batch_size
+
+        for node_type, rows in self._group(snapshot.node_rows(), self._neo4j_node_row).items():
+            query = """
+            UNWIND $rows AS row
+            MERGE (n:Node {id: row.id})
+            SET n += row.properties, n:""" + _checked_label(node_type)
+            for batch in _batches(rows, batch_size):
+                await self.memory.writer.run("import_snapshot_nodes", query, rows=batch)
+
+        for rel_type, rows in self._group(snapshot.edge_rows(), self._neo4j_edge_row).items():
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (a:Node {{id: row.from_id}}), (b:Node {{id: row.to_id}})
+            MERGE (a)-[r:{_checked_label(rel_type)}]->(b)
+            SET r += row.properties
+            """
+            for batch in _batches(rows, batch_size):
+                await self.memory.writer.run("import_snapshot_edges", query, rows=batch)
+
+        query = """
+        UNWIND $rows AS row
+        MERGE (c:Community {id: row.id})
+        SET c.size = row.size, c.central_node = row.central_node
+        """
+        for batch in _batches(snapshot.community_rows(), batch_size):
+            await self.memory.writer.run("import_snapshot_communities", query, rows=batch)
+
+    @staticmethod
+    def _group(rows: Iterable[Dict[str, Any]], convert) -> Dict[str, List[Dict[str, Any]]]:
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            grouped.setdefault(row["type"], []).append(convert(row))
+        return grouped
+
+    @staticmethod
+    def _neo4j_node_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        properties = {
+            **row["properties"],
+            **{key: value for key, value in row.items() if key in NODE_COLUMNS and value is not None}
+        }
+        return {"id": row["id"], "properties": properties}
+
+    @staticmethod
+    def _neo4j_edge_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        properties = {
+            **row["properties"],
+            "type": row["type"],
+            "strength": row["strength"],
+            "mention_count": row["mention_count"],
+            "first_seen": row["first_seen"],
+            "last_seen": row["last_seen"],
+            "created_at": row["first_seen"],
+            "updated_at": row["last_seen"]
+        }
+        return {
+            "from_id": row["from_id"],
+            "to_id": row["to_id"],
+            "properties": {key: value for key, value in properties.items() if value is not None}
+        }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Graph Memory Stats
+Cheap health/stats for graph memory: totals from the Neo4j count store,
+recent activity from in-memory counters fed by writes, and a short-TTL
+snapshot so status polling never scans the graph
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger("pai-graph-stats")
+
+SECONDS_PER_HOUR = 3600
+
+
+class ActivityCounter:
+    """Node creations bucketed by UTC hour over a sliding window"""
+
+    def __init__(self, window_days: int = 7):
+        self.window_hours = window_days * 24
+        self._buckets: Dict[int, int] = {}
+
+    @staticmethod
+    def _hour(when: datetime) -> int:
+        return int(when.timestamp()) // SECONDS_PER_HOUR
+
+    def _current_hour(self) -> int:
+        return int(time.time()) // SECONDS_PER_HOUR
+
+    def record(self, when: datetime, count: int = 1):
+        hour = self._hour(when)
+        self._buckets[hour] = self._buckets.get(hour, 0) + count
+
+    def seed(self, hourly_counts: Iterable[Tuple[int, int]]):
+        """Replace the buckets with (epoch hour, count) pairs from a backend scan"""
+        self._buckets = {}
+        for hour, count in hourly_counts:
+            self._buckets[int(hour)] = self._buckets.get(int(hour), 0) + int(count)
+        self._prune()
+
+    def _prune(self):
+        oldest = self._current_hour() - self.window_hours
+        for hour in [h for h in self._buckets if h <= oldest]:
+            del self._buckets[hour]
+
+    def recent(self) -> int:
+        """Creations within the window, to hour resolution"""
+        self._prune()
+        return sum(self._buckets.values())
+
+
+class GraphStats:
+    """Cached graph memory statistics backing health_check"""
+
+    def __init__(self, memory, ttl_seconds: float = 10.0, activity_window_days: int = 7):
+        self.memory = memory
+        self.ttl_seconds = ttl_seconds
+        self.activity = ActivityCounter(activity_window_days)
+        self._activity_seeded = False
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+
+    def record_node_created(self, when: Optional[datetime] = None):
+        """Count a newly created node; called from the write path"""
+        self.activity.record(when or datetime.now(timezone.utc))
+
+    def invalidate(self, reseed_activity: bool = False):
+        """Drop the cached totals so the next read refreshes them
+
+        reseed_activity also reloads the activity counters, for bulk loads
+        that bypass the write path.
+        """
+        self._expires_at = 0.0
+        if reseed_activity:
+            self._activity_seeded = False
+
+    async def snapshot(self, force: bool = False) -> Dict[str, Any]:
+        """Return totals and recent activity, refreshing counts at most once per TTL
+
+        Concurrent callers share a single refresh. Recent activity is always
+        read from the live counters, so it reflects writes made since the
+        totals were cached.
+        """
+        if force or self._snapshot is None or self._expires_at <= time.monotonic():
+            async with self._lock:
+                if force or self._snapshot is None or self._expires_at <= time.monotonic():
+                    self._snapshot = await self._refresh()
+                    self._expires_at = time.monotonic() + self.ttl_seconds
+                    self.refreshes += 1
+
+        stats = copy.deepcopy(self._snapshot)
+        stats["recent_nodes"] = self.activity.recent()
+        stats["cache_age_seconds"] = round(
+            max(0.0, self.ttl_seconds - (self._expires_at - time.monotonic())), 3
+        )
+        return stats
+
+    async def _refresh(self) -> Dict[str, Any]:
+        if self.memory.store is not None:
+            return self._refresh_embedded()
+
+        async with self.memory.driver.session(database=self.memory.config.database) as session:
+            if not self._activity_seeded:
+                await self._seed_activity(session)
+
+            # Single-label and untyped-relationship counts with no predicates
+            # are answered from the count store rather than by scanning
+            result = await session.run("""
+            CALL { MATCH (n:Node) RETURN count(n) AS node_count }
+            CALL { MATCH ()-[r]->() RETURN count(r) AS relationship_count }
+            CALL { MATCH (c:Conversation) RETURN count(c) AS conversation_count }
+            CALL { MATCH (c:Community) RETURN count(c) AS community_count }
+            RETURN node_count, relationship_count, conversation_count, community_count
+            """)
+            record = await result.single()
+
+        return {
+            "node_count": record["node_count"],
+            "relationship_count": record["relationship_count"],
+            "conversation_count": record["conversation_count"],
+            "community_count": record["community_count"]
+        }
+
+    async def _seed_activity(self, session):
+        """Load the activity window once from the created_at range index"""
+        since = datetime.now(timezone.utc).timestamp() - self.activity.window_hours * SECONDS_PER_HOUR
+        result = await session.run("""
+        MATCH (n:Node)
+        WHERE n.created_at >= datetime({epochSeconds: $since})
+        RETURN n.created_at.epochSeconds / 3600 AS hour, count(*) AS count
+        """, since=int(since))
+        self.activity.seed([(record["hour"], record["count"]) async for record in result])
+        self._activity_seeded = True
+
+    def _refresh_embedded(self) -> Dict[str, Any]:
+        store = self.memory.store
+        if not self._activity_seeded:
+            self.activity.seed(
+                (int(node.created_at) // SECONDS_PER_HOUR, 1) for node in store.nodes
+            )
+            self._activity_seeded = True
+
+        return {
+            "node_count": store.node_count,
+            "relationship_count": store.relationship_count,
+            "conversation_count": store.type_count("Conversation"),
+            "community_count": len(store.communities)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "refreshes": self.refreshes,
+            "activity_seeded": self._activity_seeded
+        }
@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+Embedded Graph Store
+In-process graph backend for GraphMemorySystem with compact array-backed
+adjacency and optional snapshot persistence
+"""
+
+import base64
+import json
+import os
+import sys
+import time
+from array import array
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+SNAPSHOT_MAGIC = b"PAIGRAPH"
+# Version 2 tags temporal and bytes property values; version 1 stored them as strings
+SNAPSHOT_VERSION = 2
+SNAPSHOT_READABLE_VERSIONS = (1, 2)
+SNAPSHOT_HEADER_SIZE = len(SNAPSHOT_MAGIC) + 4
+
+
+def _timestamp(value: datetime) -> float:
+    return value.timestamp()
+
+
+def _datetime(value: Optional[float]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def encode_json_value(value: Any) -> Dict[str, Any]:
+    """json.dumps default: tag the property types Neo4j stores but JSON lacks
+
+    Anything else is a TypeError rather than being silently stringified.
+    """
+    if isinstance(value, datetime):
+        return {"$type": "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {"$type": "date", "value": value.isoformat()}
+    if isinstance(value, dt_time):
+        return {"$type": "time", "value": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {"$type": "duration", "value": value.total_seconds()}
+    if isinstance(value, (bytes, bytearray)):
+        return {"$type": "bytes", "value": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, (set, frozenset)):
+        return {"$type": "set", "value": list(value)}
+    raise TypeError(f"Cannot serialize {type(value).__name__} graph property")
+
+
+_JSON_DECODERS = {
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": dt_time.fromisoformat,
+    "duration": lambda seconds: timedelta(seconds=seconds),
+    "bytes": base64.b64decode,
+    "set": set
+}
+
+
+def decode_json_value(obj: Dict[str, Any]) -> Any:
+    """json.loads object_hook reversing encode_json_value"""
+    if len(obj) == 2 and "value" in obj and obj.get("$type") in _JSON_DECODERS:
+        return _JSON_DECODERS[obj["$type"]](obj["value"])
+    return obj
+
+
+class NodeRecord:
+    """A node in the embedded store"""
+
+    __slots__ = (
+        "index", "id", "name", "type", "properties",
+        "created_at", "updated_at", "importance_score", "access_count",
+        "last_accessed", "importance_decayed_at", "community_id",
+        "out_edges", "in_edges"
+    )
+
+    def __init__(self, index: int, node_id: str, name: str, node_type: str, created_at: float):
+        self.index = index
+        self.id = node_id
+        self.name = name
+        self.type = node_type
+        self.properties: Dict[str, Any] = {}
+        self.created_at = created_at
+        self.updated_at = created_at
+        self.importance_score = 0.5
+        self.access_count = 0
+        self.last_accessed: Optional[float] = None
+        self.importance_decayed_at: Optional[float] = None
+        self.community_id: Optional[str] = None
+        self.out_edges = array("q")
+        self.in_edges = array("q")
+
+    def get(self, name: str) -> Any:
+        """Read a property the way a Cypher projection would"""
+        if name in ("id", "name", "type"):
+            return getattr(self, name)
+        if name in ("created_at", "updated_at", "last_accessed"):
+            return _datetime(getattr(self, name))
+        return self.properties.get(name)
+
+
+class EmbeddedGraphStore:
+    """Array-backed property graph kept entirely in process memory
+
+    Nodes are __slots__ records addressed by a dense index; edges live in
+    parallel typed arrays, with per-node arrays of outgoing and incoming edge
+    indexes. Type strings are interned and edges store a small type code.
+    """
+
+    def __init__(self):
+        self.nodes: List[NodeRecord] = []
+        self._by_id: Dict[str, int] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._type_counts: Dict[str, int] = {}
+
+        self._rel_types: List[str] = []
+        self._rel_type_codes: Dict[str, int] = {}
+        self._edge_src = array("q")
+        self._edge_dst = array("q")
+        self._edge_type = array("H")
+        self._edge_strength = array("d")
+        self._edge_created = array("d")
+        self._edge_updated = array("d")
+        self._edge_mentions = array("q")
+        self._edge_props: List[Optional[Dict[str, Any]]] = []
+        self._edge_index: Dict[Tuple[int, int, int], int] = {}
+
+        self.communities: Dict[str, Dict[str, Any]] = {}
+
+    # Nodes and relationships
+
+    @property
+    def node_count(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def relationship_count(self) -> int:
+        return len(self._edge_src)
+
+    def type_count(self, node_type: str) -> int:
+        return self._type_counts.get(node_type, 0)
+
+    def get_node(self, node_id: str) -> Optional[NodeRecord]:
+        index = self._by_id.get(node_id)
+        return self.nodes[index] if index is not None else None
+
+    def nodes_named(self, name: str) -> List[NodeRecord]:
+        return [self.nodes[index] for index in self._by_name.get(name, ())]
+
+    def merge_node(
+        self,
+        node_id: str,
+        name: str,
+        node_type: str,
+        properties: Dict[str, Any],
+        now: datetime
+    ) -> NodeRecord:
+        """Create or update a node, mirroring the Neo4j MERGE in create_node"""
+        stamp = _timestamp(now)
+        node = self.get_node(node_id)
+        if node is None:
+            node = NodeRecord(len(self.nodes), node_id, sys.intern(name), sys.intern(node_type), stamp)
+            self.nodes.append(node)
+            self._by_id[node_id] = node.index
+            self._by_name.setdefault(node.name, []).append(node.index)
+            self._type_counts[node.type] = self._type_counts.get(node.type, 0) + 1
+
+        for key, value in properties.items():
+            if key not in ("id", "name", "type"):
+                node.properties[key] = value
+        node.updated_at = stamp
+        return node
+
+    def _rel_type_code(self, rel_type: str) -> int:
+        code = self._rel_type_codes.get(rel_type)
+        if code is None:
+            code = self._rel_type_codes[rel_type] = len(self._rel_types)
+            self._rel_types.append(sys.intern(rel_type))
+        return code
+
+    def merge_relationship(
+        self,
+        from_id: str,
+        to_id: str,
+        rel_type: str,
+        properties: Dict[str, Any],
+        now: datetime,
+        ema_alpha: float = 1.0
+    ) -> bool:
+        """Record a mention of a typed relationship; False if either node is missing
+
+        Mirrors create_relationships: a repeat mention bumps the mention count
+        and folds its strength into an exponential moving average.
+        created/updated double as first and last seen.
+        """
+        src = self._by_id.get(from_id)
+        dst = self._by_id.get(to_id)
+        if src is None or dst is None:
+            return False
+
+        stamp = _timestamp(now)
+        code = self._rel_type_code(rel_type)
+        key = (src, dst, code)
+        edge = self._edge_index.get(key)
+        if edge is None:
+            edge = len(self._edge_src)
+            self._edge_index[key] = edge
+            self._edge_src.append(src)
+            self._edge_dst.append(dst)
+            self._edge_type.append(code)
+            self._edge_strength.append(float(properties.get("strength", 0.5)))
+            self._edge_created.append(stamp)
+            self._edge_updated.append(stamp)
+            self._edge_mentions.append(0)
+            self._edge_props.append(None)
+            self.nodes[src].out_edges.append(edge)
+            self.nodes[dst].in_edges.append(edge)
+        elif "strength" in properties:
+            self._edge_strength[edge] = (
+                ema_alpha * float(properties["strength"]) + (1 - ema_alpha) * self._edge_strength[edge]
+            )
+
+        self._edge_mentions[edge] += 1
+        extra = {k: v for k, v in properties.items() if k not in ("type", "strength")}
+        if extra:
+            if self._edge_props[edge] is None:
+                self._edge_props[edge] = {}
+            self._edge_props[edge].update(extra)
+        self._edge_updated[edge] = stamp
+        return True
+
+    def _neighbors(self, node: NodeRecord, type_codes: Optional[Set[int]]) -> Iterable[Tuple[int, int]]:
+        """Yield (edge, neighbor index) pairs in either direction"""
+        for edge in node.out_edges:
+            if type_codes is None or self._edge_type[edge] in type_codes:
+                yield edge, self._edge_dst[edge]
+        for edge in node.in_edges:
+            if type_codes is None or self._edge_type[edge] in type_codes:
+                yield edge, self._edge_src[edge]
+
+    # Recall
+
+    def related_conversations(
+        self,
+        entity_names: List[str],
+        rel_types: Optional[List[str]],
+        max_depth: int
+    ) -> Dict[int, Dict[str, Any]]:
+        """Aggregate every path of length 1..max_depth from named nodes to conversations
+
+        Like the Cypher pattern, paths never reuse a relationship. Returns, per
+        conversation index: minimum distance, mean per-path strength, matched
+        query node count and every node index seen on a path.
+        """
+        type_codes = None
+        if rel_types:
+            type_codes = {self._rel_type_codes[t] for t in rel_types if t in self._rel_type_codes}
+
+        results: Dict[int, Dict[str, Any]] = {}
+        start_nodes = {index for name in set(entity_names) for index in self._by_name.get(name, ())}
+
+        for start in start_nodes:
+            stack = [(start, 0, 0.0, (start,), frozenset())]
+            while stack:
+                current, depth, strength_sum, path_nodes, used_edges = stack.pop()
+                if depth >= max_depth:
+                    continue
+                for edge, neighbor in self._neighbors(self.nodes[current], type_codes):
+                    if edge in used_edges:
+                        continue
+                    new_depth = depth + 1
+                    new_sum = strength_sum + self._edge_strength[edge]
+                    new_path = path_nodes + (neighbor,)
+
+                    if self.nodes[neighbor].type == "Conversation":
+                        entry = results.get(neighbor)
+                        if entry is None:
+                            entry = results[neighbor] = {
+                                "distance": new_depth,
+                                "strength_total": 0.0,
+                                "paths": 0,
+                                "query_nodes": set(),
+                                "path_nodes": set()
+                            }
+                        entry["distance"] = min(entry["distance"], new_depth)
+                        entry["strength_total"] += new_sum / new_depth
+                        entry["paths"] += 1
+                        entry["query_nodes"].add(start)
+                        entry["path_nodes"].update(new_path)
+
+                    stack.append((neighbor, new_depth, new_sum, new_path, used_edges | {edge}))
+
+        return results
+
+    def within_hops(
+        self,
+        entity_names: List[str],
+        rel_types: Optional[List[str]],
+        radius: int,
+        limit: int
+    ) -> Optional[Set[str]]:
+        """Ids of nodes at most radius hops from the named nodes; None past limit nodes"""
+        type_codes = None
+        if rel_types:
+            type_codes = {self._rel_type_codes[t] for t in rel_types if t in self._rel_type_codes}
+
+        seen = {index for name in set(entity_names) for index in self._by_name.get(name, ())}
+        frontier = list(seen)
+        for _ in range(radius):
+            next_frontier = []
+            for current in frontier:
+                for _, neighbor in self._neighbors(self.nodes[current], type_codes):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+            if len(seen) > limit:
+                return None
+            frontier = next_frontier
+        return {self.nodes[index].id for index in seen}
+
+    def mentioned_conversations(self, entity_name: str) -> List[NodeRecord]:
+        """Conversations linked to any node with this name by MENTIONED_IN"""
+        code = self._rel_type_codes.get("MENTIONED_IN")
+        if code is None:
+            return []
+
+        found: Dict[int, NodeRecord] = {}
+        for node in self.nodes_named(entity_name):
+            for _, neighbor in self._neighbors(node, {code}):
+                record = self.nodes[neighbor]
+                if record.type == "Conversation":
+                    found[neighbor] = record
+        return list(found.values())
+
+    def mention_neighborhood(
+        self,
+        entity_name: str
+    ) -> Tuple[List[Tuple[NodeRecord, float]], Dict[int, Tuple[float, int]]]:
+        """Conversations mentioning a named entity and the entities co-mentioned with it
+
+        Returns (conversation, strongest mention strength) pairs and, per
+        co-mentioned node index, (summed mention strength, shared conversations).
+        """
+        code = self._rel_type_codes.get("MENTIONED_IN")
+        if code is None:
+            return [], {}
+
+        conversations: Dict[int, float] = {}
+        for node in self.nodes_named(entity_name):
+            for edge, neighbor in self._neighbors(node, {code}):
+                if self.nodes[neighbor].type == "Conversation":
+                    conversations[neighbor] = max(conversations.get(neighbor, 0.0), self._edge_strength[edge])
+
+        neighbors: Dict[int, Tuple[float, int]] = {}
+        for conversation in conversations:
+            for edge, neighbor in self._neighbors(self.nodes[conversation], {code}):
+                if self.nodes[neighbor].name == entity_name:
+                    continue
+                weight, shared = neighbors.get(neighbor, (0.0, 0))
+                neighbors[neighbor] = (weight + self._edge_strength[edge], shared + 1)
+
+        return [(self.nodes[index], strength) for index, strength in conversations.items()], neighbors
+
+    # Importance
+
+    def apply_access_updates(self, updates: List[Dict[str, Any]], half_life_seconds: float):
+        """Apply coalesced accesses with decay, mirroring the Neo4j UNWIND flush"""
+        now = time.time()
+        for update in updates:
+            node = self.get_node(update["id"])
+            if node is None:
+                continue
+            elapsed = now - (node.importance_decayed_at or now)
+            node.access_count += update["count"]
+            node.last_accessed = now
+            node.importance_score = node.importance_score * 0.5 ** (elapsed / half_life_seconds) + update["weight"]
+            node.importance_decayed_at = now
+
+    def decay_sweep(self, sweep_interval: float, batch_size: int, half_life_seconds: float) -> int:
+        """Decay a bounded batch of nodes not decayed within sweep_interval"""
+        now = time.time()
+        swept = 0
+        for node in self.nodes:
+            if swept >= batch_size:
+                break
+            if node.importance_decayed_at is not None and now - node.importance_decayed_at < sweep_interval:
+                continue
+            elapsed = now - (node.importance_decayed_at or now)
+            node.importance_score *= 0.5 ** (elapsed / half_life_seconds)
+            node.importance_decayed_at = now
+            swept += 1
+        return swept
+
+    # Clustering
+
+    def adjacency(self, min_strength: float) -> Tuple[List[str], array, array, array]:
+        """Directed edge arrays over all nodes, filtered by strength"""
+        src = array("q")
+        dst = array("q")
+        weights = array("d")
+        for edge in range(len(self._edge_src)):
+            strength = self._edge_strength[edge]
+            if strength >= min_strength:
+                src.append(self._edge_src[edge])
+                dst.append(self._edge_dst[edge])
+                weights.append(strength)
+        return [node.id for node in self.nodes], src, dst, weights
+
+    def neighborhood(self, node_id: str, min_strength: float) -> List[Tuple[str, Optional[str], float]]:
+        """(neighbor id, neighbor community, strength) for every incident edge"""
+        node = self.get_node(node_id)
+        if node is None:
+            return []
+        neighbors = []
+        for edge, neighbor in self._neighbors(node, None):
+            strength = self._edge_strength[edge]
+            if strength >= min_strength:
+                other = self.nodes[neighbor]
+                neighbors.append((other.id, other.community_id, strength))
+        return neighbors
+
+    def set_communities(self, assignments: List[Dict[str, Any]]):
+        for assignment in assignments:
+            node = self.get_node(assignment["id"])
+            if node is not None:
+                node.community_id = assignment["community_id"]
+
+    # Bulk export/import
+
+    def iter_edges(self) -> Iterable[Dict[str, Any]]:
+        """Every edge as a flat row, in edge index order"""
+        for edge in range(len(self._edge_src)):
+            yield {
+                "from_id": self.nodes[self._edge_src[edge]].id,
+                "to_id": self.nodes[self._edge_dst[edge]].id,
+                "rel_type": self._rel_types[self._edge_type[edge]],
+                "strength": self._edge_strength[edge],
+                "mention_count": self._edge_mentions[edge],
+                "first_seen": self._edge_created[edge],
+                "last_seen": self._edge_updated[edge],
+                "properties": self._edge_props[edge]
+            }
+
+    def load_node(
+        self,
+        id: str,
+        name: str,
+        type: str,
+        properties: Dict[str, Any],
+        created_at: Optional[datetime],
+        updated_at: Optional[datetime],
+        last_accessed: Optional[datetime],
+        importance_decayed_at: Optional[datetime],
+        importance_score: float,
+        access_count: int,
+        community_id: Optional[str]
+    ) -> NodeRecord:
+        """Create or overwrite a node with every stored attribute, as read from an export"""
+        now = datetime.now(timezone.utc)
+        node = self.merge_node(id, name, type, properties, created_at or now)
+        node.created_at = _timestamp(created_at or now)
+        node.updated_at = _timestamp(updated_at or created_at or now)
+        node.last_accessed = _timestamp(last_accessed) if last_accessed else None
+        node.importance_decayed_at = _timestamp(importance_decayed_at) if importance_decayed_at else None
+        node.importance_score = importance_score
+        node.access_count = access_count
+        node.community_id = community_id
+        return node
+
+    def load_edge(
+        self,
+        from_id: str,
+        to_id: str,
+        type: str,
+        strength: float,
+        mention_count: int,
+        first_seen: Optional[datetime],
+        last_seen: Optional[datetime],
+        properties: Dict[str, Any]
+    ) -> bool:
+        """Create or overwrite an edge with its aggregates, as read from an export"""
+        now = datetime.now(timezone.utc)
+        if not self.merge_relationship(from_id, to_id, type, properties, last_seen or now):
+            return False
+        edge = self._edge_index[(self._by_id[from_id], self._by_id[to_id], self._rel_type_codes[type])]
+        self._edge_strength[edge] = strength
+        self._edge_mentions[edge] = mention_count
+        self._edge_created[edge] = _timestamp(first_seen or last_seen or now)
+        self._edge_updated[edge] = _timestamp(last_seen or now)
+        return True
+
+    # Edge compaction
+
+    def compact_edges(
+        self,
+        min_strength: float,
+        max_mentions: int,
+        min_idle_seconds: float,
+        half_life_seconds: float,
+        rel_types: Iterable[str]
+    ) -> Tuple[int, int]:
+        """Prune weak stale edges and fold reverse duplicates; returns (pruned, merged)
+
+        Only edges of rel_types are considered. An edge is pruned when it has
+        at most max_mentions mentions, has not been seen for min_idle_seconds
+        and its strength, decayed over that idle time, is below min_strength.
+        A reverse edge of the same type is folded into the edge running from
+        the lower to the higher node id.
+        """
+        now = time.time()
+        keep = [True] * len(self._edge_src)
+        pruned = merged = 0
+        type_codes = {self._rel_type_codes[t] for t in rel_types if t in self._rel_type_codes}
+
+        for edge in range(len(self._edge_src)):
+            if self._edge_type[edge] not in type_codes:
+                continue
+            idle = now - self._edge_updated[edge]
+            decayed = self._edge_strength[edge] * 0.5 ** (idle / half_life_seconds)
+            if self._edge_mentions[edge] <= max_mentions and idle >= min_idle_seconds and decayed < min_strength:
+                keep[edge] = False
+                pruned += 1
+
+        for (src, dst, code), edge in self._edge_index.items():
+            if code not in type_codes or not keep[edge] or self.nodes[src].id >= self.nodes[dst].id:
+                continue
+            reverse = self._edge_index.get((dst, src, code))
+            if reverse is None or not keep[reverse]:
+                continue
+            self._edge_mentions[edge] += self._edge_mentions[reverse]
+            self._edge_strength[edge] = max(self._edge_strength[edge], self._edge_strength[reverse])
+            self._edge_created[edge] = min(self._edge_created[edge], self._edge_created[reverse])
+            self._edge_updated[edge] = max(self._edge_updated[edge], self._edge_updated[reverse])
+            if self._edge_props[reverse]:
+                self._edge_props[edge] = {**self._edge_props[reverse], **(self._edge_props[edge] or {})}
+            keep[reverse] = False
+            merged += 1
+
+        if pruned or merged:
+            self._rebuild_edges(keep)
+        return pruned, merged
+
+    def _rebuild_edges(self, keep: List[bool]):
+        columns = ("_edge_src", "_edge_dst", "_edge_type", "_edge_strength",
+                   "_edge_created", "_edge_updated", "_edge_mentions")
+        for column in columns:
+            values = getattr(self, column)
+            setattr(self, column, array(values.typecode, (v for v, k in zip(values, keep) if k)))
+        self._edge_props = [props for props, k in zip(self._edge_props, keep) if k]
+        self._index_edges()
+
+    def _index_edges(self):
+        """Rebuild the edge key index and per-node incidence arrays"""
+        self._edge_index = {}
+        for node in self.nodes:
+            node.out_edges = array("q")
+            node.in_edges = array("q")
+        for edge, (src, dst, code) in enumerate(zip(self._edge_src, self._edge_dst, self._edge_type)):
+            self._edge_index[(src, dst, code)] = edge
+            self.nodes[src].out_edges.append(edge)
+            self.nodes[dst].in_edges.append(edge)
+
+    # Snapshot persistence
+
+    def save_snapshot(self, path: str):
+        """Write the whole store to path atomically"""
+        payload = {
+            "rel_types": self._rel_types,
+            "nodes": [
+                [
+                    node.id, node.name, node.type, node.properties,
+                    node.created_at, node.updated_at, node.importance_score,
+                    node.access_count, node.last_accessed, node.importance_decayed_at,
+                    node.community_id
+                ]
+                for node in self.nodes
+            ],
+            "edges": {
+                "src": self._edge_src.tolist(),
+                "dst": self._edge_dst.tolist(),
+                "type": self._edge_type.tolist(),
+                "strength": self._edge_strength.tolist(),
+                "created": self._edge_created.tolist(),
+                "updated": self._edge_updated.tolist(),
+                "mentions": self._edge_mentions.tolist(),
+                "props": self._edge_props
+            },
+            "communities": self.communities
+        }
+        body = json.dumps(payload, separators=(",", ":"), default=encode_json_value).encode()
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(SNAPSHOT_VERSION.to_bytes(4, "little"))
+            f.write(body)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "EmbeddedGraphStore":
+        """Load a store from a snapshot file"""
+        store = cls()
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < SNAPSHOT_HEADER_SIZE:
+            raise ValueError(f"Graph snapshot {path} is truncated")
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a graph snapshot")
+        version = int.from_bytes(data[len(SNAPSHOT_MAGIC):SNAPSHOT_HEADER_SIZE], "little")
+        if version not in SNAPSHOT_READABLE_VERSIONS:
+            raise ValueError(f"Unsupported graph snapshot version {version}")
+        payload = json.loads(data[SNAPSHOT_HEADER_SIZE:], object_hook=decode_json_value)
+
+        for rel_type in payload["rel_types"]:
+            store._rel_type_code(rel_type)
+
+        for (node_id, name, node_type, properties, created_at, updated_at, importance,
+             access_count, last_accessed, decayed_at, community_id) in payload["nodes"]:
+            node = NodeRecord(len(store.nodes), node_id, sys.intern(name), sys.intern(node_type), created_at)
+            node.properties = properties
+            node.updated_at = updated_at
+            node.importance_score = importance
+            node.access_count = access_count
+            node.last_accessed = last_accessed
+            node.importance_decayed_at = decayed_at
+            node.community_id = community_id
+            store.nodes.append(node)
+            store._by_id[node_id] = node.index
+            store._by_name.setdefault(node.name, []).append(node.index)
+            store._type_counts[node.type] = store._type_counts.get(node.type, 0) + 1
+
+        edges = payload["edges"]
+        store._edge_src = array("q", edges["src"])
+        store._edge_dst = array("q", edges["dst"])
+        store._edge_type = array("H", edges["type"])
+        store._edge_strength = array("d", edges["strength"])
+        store._edge_created = array("d", edges["created"])
+        store._edge_updated = array("d", edges["updated"])
+        store._edge_mentions = array("q", edges.get("mentions") or [1] * len(store._edge_src))
+        store._edge_props = edges["props"]
+        store._index_edges()
+
+        store.communities = payload["communities"]
+        return store
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Entity Neighborhood Summaries
+Materialized per-entity context (recent conversations, strongest co-mentioned
+neighbors, last mention) kept for hot entities and refreshed incrementally as
+MENTIONED_IN edges arrive, so prompt context is a key lookup rather than a
+multi-hop traversal
+"""
+
+import copy
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger("pai-graph-summaries")
+
+
+def _iso(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return datetime.fromtimestamp(float(value), tz=timezone.utc).isoformat()
+
+
+class NeighborhoodSummaries:
+    """Bounded LRU of entity summaries with write-driven dirty tracking
+
+    An entity becomes hot the first time it is looked up. New MENTIONED_IN
+    edges mark the hot entities they touch as dirty; dirty summaries are
+    rebuilt in batches by refresh_dirty (run from the graph flush loop) or on
+    their next lookup, whichever comes first.
+    """
+
+    def __init__(self, memory: "GraphMemorySystem"):
+        self.memory = memory
+        self._summaries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._names_by_node: Dict[str, Set[str]] = {}
+        self._dirty: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.refreshed = 0
+
+    @property
+    def config(self):
+        return self.memory.config
+
+    def mark_dirty(self, node_ids: Iterable[str] = (), names: Iterable[str] = ()):
+        """Flag hot summaries that include any of these node ids or entity names"""
+        for node_id in node_ids:
+            self._dirty.update(self._names_by_node.get(node_id, ()))
+        # Names catch entities that were looked up before they existed
+        self._dirty.update(name for name in names if name in self._summaries)
+
+    def clear(self):
+        self._summaries.clear()
+        self._names_by_node.clear()
+        self._dirty.clear()
+
+    async def get(self, entity_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Summaries for the given entity names; entities with no mentions are omitted"""
+        missing = []
+        for name in dict.fromkeys(entity_names):
+            if name in self._summaries and name not in self._dirty:
+                self._summaries.move_to_end(name)
+                self.hits += 1
+            else:
+                missing.append(name)
+                self.misses += 1
+
+        if missing:
+            await self._refresh(missing)
+
+        return {
+            name: copy.deepcopy(self._summaries[name])
+            for name in entity_names
+            if name in self._summaries and self._summaries[name]["mention_count"] > 0
+        }
+
+    async def refresh_dirty(self) -> int:
+        """Rebuild up to summary_refresh_batch_size dirty summaries"""
+        if not self._dirty:
+            return 0
+        names = sorted(self._dirty)[:self.config.summary_refresh_batch_size]
+        await self._refresh(names)
+        return len(names)
+
+    async def _refresh(self, names: List[str]):
+        # Clear the flags first so writes landing mid-refresh mark them again
+        self._dirty.difference_update(names)
+        try:
+            if self.memory.store is not None:
+                summaries = [self._summarize_embedded(name) for name in names]
+            else:
+                summaries = await self._summarize_neo4j(names)
+        except Exception:
+            self._dirty.update(name for name in names if name in self._summaries)
+            raise
+
+        for summary in summaries:
+            self._store(summary)
+        self.refreshed += len(summaries)
+
+    def _store(self, summary: Dict[str, Any]):
+        name = summary["entity"]
+        previous = self._summaries.pop(name, None)
+        if previous is not None:
+            self._unindex(name, previous["node_ids"])
+
+        self._summaries[name] = summary
+        for node_id in summary["node_ids"]:
+            self._names_by_node.setdefault(node_id, set()).add(name)
+
+        while len(self._summaries) > self.config.summary_max_entities:
+            evicted_name, evicted = self._summaries.popitem(last=False)
+            self._unindex(evicted_name, evicted["node_ids"])
+            self._dirty.discard(evicted_name)
+
+    def _unindex(self, name: str, node_ids: List[str]):
+        for node_id in node_ids:
+            names = self._names_by_node.get(node_id)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._names_by_node[node_id]
+
+    async def _summarize_neo4j(self, names: List[str]) -> List[Dict[str, Any]]:
+        query = """
+        UNWIND $names AS entity_name
+        CALL (entity_name) {
+            MATCH (e:Node {name: entity_name})
+            RETURN collect(e.id) AS node_ids
+        }
+        CALL (entity_name) {
+            MATCH (:Node {name: entity_name})-[:MENTIONED_IN]-(c:Conversation)
+            RETURN count(DISTINCT c) AS mention_count, max(c.created_at) AS last_mentioned
+        }
+        CALL (entity_name) {
+            MATCH (:Node {name: entity_name})-[m:MENTIONED_IN]-(c:Conversation)
+            WITH c, max(coalesce(m.strength, 0.5)) AS strength
+            ORDER BY c.created_at DESC, c.id DESC
+            LIMIT $top_k
+            RETURN collect({
+                id: c.id,
+                name: c.name,
+                user_message: left(c.user_message, $snippet_length),
+                assistant_response: left(c.assistant_response, $snippet_length),
+                created_at: c.created_at,
+                strength: strength
+            }) AS conversations
+        }
+        CALL (entity_name) {
+            MATCH (:Node {name: entity_name})-[:MENTIONED_IN]-(c:Conversation)-[m:MENTIONED_IN]-(other:Node)
+            WHERE other.name <> entity_name
+            WITH other, sum(coalesce(m.strength, 0.5)) AS weight, count(DISTINCT c) AS shared
+            ORDER BY weight DESC, other.name
+            LIMIT $top_k
+            RETURN collect({
+                id: other.id, name: other.name, type: other.type, weight: weight, shared_mentions: shared
+            }) AS neighbors
+        }
+        RETURN entity_name, node_ids, mention_count, last_mentioned, conversations, neighbors
+        """
+        async with self.memory.driver.session(database=self.config.database) as session:
+            result = await session.run(
+                query,
+                names=names,
+                top_k=self.config.summary_top_k,
+                snippet_length=self.config.summary_snippet_length
+            )
+            records = [record async for record in result]
+
+        refreshed_at = datetime.now(timezone.utc).isoformat()
+        summaries = []
+        for record in records:
+            conversations = [dict(conversation) for conversation in record["conversations"]]
+            for conversation in conversations:
+                conversation["created_at"] = _iso(conversation["created_at"])
+            summaries.append({
+                "entity": record["entity_name"],
+                "node_ids": list(record["node_ids"]),
+                "mention_count": record["mention_count"],
+                "last_mentioned": _iso(record["last_mentioned"]),
+                "conversations": conversations,
+                "neighbors": [dict(neighbor) for neighbor in record["neighbors"]],
+                "refreshed_at": refreshed_at
+            })
+        return summaries
+
+    def _summarize_embedded(self, name: str) -> Dict[str, Any]:
+        store = self.memory.store
+        top_k = self.config.summary_top_k
+        snippet_length = self.config.summary_snippet_length
+        conversations, neighbors = store.mention_neighborhood(name)
+
+        conversations.sort(key=lambda item: (item[0].created_at, item[0].id), reverse=True)
+        ranked_neighbors = sorted(neighbors.items(), key=lambda item: (-item[1][0], store.nodes[item[0]].name))
+
+        return {
+            "entity": name,
+            "node_ids": [node.id for node in store.nodes_named(name)],
+            "mention_count": len(conversations),
+            "last_mentioned": _iso(conversations[0][0].created_at) if conversations else None,
+            "conversations": [
+                {
+                    "id": node.id,
+                    "name": node.name,
+                    "user_message": (node.properties.get("user_message") or "")[:snippet_length],
+                    "assistant_response": (node.properties.get("assistant_response") or "")[:snippet_length],
+                    "created_at": _iso(node.created_at),
+                    "strength": strength
+                }
+                for node, strength in conversations[:top_k]
+            ],
+            "neighbors": [
+                {
+                    "id": store.nodes[index].id,
+                    "name": store.nodes[index].name,
+                    "type": store.nodes[index].type,
+                    "weight": weight,
+                    "shared_mentions": shared
+                }
+                for index, (weight, shared) in ranked_neighbors[:top_k]
+            ],
+            "refreshed_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entities": len(self._summaries),
+            "dirty": len(self._dirty),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshed": self.refreshed
+        }
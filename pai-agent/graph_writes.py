@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Graph Write Path
+Managed write transactions for graph memory with jittered retry on transient
+failures and per-operation latency metrics
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, TypeVar
+
+from neo4j import AsyncManagedTransaction
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+
+logger = logging.getLogger("pai-graph-writes")
+
+T = TypeVar("T")
+
+
+class OperationMetrics:
+    """Latency and retry counters for one named write operation"""
+
+    def __init__(self, sample_size: int = 512):
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.transient_failures = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._samples: Deque[float] = deque(maxlen=sample_size)
+
+    def record(self, seconds: float, attempts: int, error: Optional[BaseException] = None):
+        self.calls += 1
+        self.retries += max(0, attempts - 1)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self._samples.append(seconds)
+        if error is not None:
+            self.failures += 1
+            if isinstance(error, (TransientError, ServiceUnavailable, SessionExpired)):
+                self.transient_failures += 1
+
+    def _percentile(self, fraction: float) -> float:
+        samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "transient_failures": self.transient_failures,
+            "retries": self.retries,
+            "avg_ms": round(self.total_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+            "p50_ms": round(self._percentile(0.5) * 1000, 3),
+            "p95_ms": round(self._percentile(0.95) * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3)
+        }
+
+
+def sorted_rows(rows: Iterable[Dict[str, Any]], *keys: str) -> List[Dict[str, Any]]:
+    """Order batch rows by node id so concurrent transactions lock in the same order"""
+    keys = keys or ("id",)
+    return sorted(rows, key=lambda row: tuple(row[key] for key in keys))
+
+
+class GraphWriter:
+    """Runs graph writes as managed transactions
+
+    Transient errors (deadlocks, leader switches, lost connections) are retried
+    by the driver with exponential backoff and jitter, tuned here to short
+    delays suited to small MERGE transactions. The unit of work may run more
+    than once, so it must be idempotent and consume its results inside the
+    transaction.
+    """
+
+    def __init__(self, memory):
+        self.memory = memory
+        self.config = memory.config
+        self.metrics: Dict[str, OperationMetrics] = {}
+
+    def _session(self):
+        return self.memory.driver.session(
+            database=self.config.database,
+            max_transaction_retry_time=self.config.write_retry_time,
+            initial_retry_delay=self.config.write_retry_initial_delay,
+            retry_delay_multiplier=2.0,
+            retry_delay_jitter_factor=self.config.write_retry_jitter
+        )
+
+    async def execute_write(
+        self,
+        operation: str,
+        work: Callable[[AsyncManagedTransaction], Awaitable[T]]
+    ) -> T:
+        """Run work in a retried write transaction, recording metrics under operation"""
+        metrics = self.metrics.setdefault(operation, OperationMetrics())
+        attempts = 0
+
+        async def attempt(tx: AsyncManagedTransaction) -> T:
+            nonlocal attempts
+            attempts += 1
+            return await work(tx)
+
+        start = time.perf_counter()
+        try:
+            async with self._session() as session:
+                result = await session.execute_write(attempt)
+        except Exception as e:
+            metrics.record(time.perf_counter() - start, attempts, e)
+            logger.warning(f"Graph write '{operation}' failed after {attempts} attempt(s): {e}")
+            raise
+
+        metrics.record(time.perf_counter() - start, attempts)
+        return result
+
+    async def run(self, operation: str, query: str, **parameters: Any) -> List[Dict[str, Any]]:
+        """Run a single write query and return its records as dicts"""
+        async def work(tx: AsyncManagedTransaction) -> List[Dict[str, Any]]:
+            result = await tx.run(query, **parameters)
+            return await result.data()
+
+        return await self.execute_write(operation, work)
+
+    def stats(self) -> Dict[str, Any]:
+        return {operation: metrics.snapshot() for operation, metrics in sorted(self.metrics.items())}
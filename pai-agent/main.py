@@ -11,7 +11,7 @@ from typing import List, Optional, Dict, Any, AsyncGenerator
 from contextlib import asynccontextmanager
 import logging
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 import uvicorn
@@ -22,7 +22,10 @@ import httpx
 
 # Import RAG and Graph Memory systems
 from rag_system import rag_system, initialize_rag, get_rag_context, store_rag_knowledge
-from graph_memory import graph_memory, initialize_graph_memory, store_graph_memory, query_graph_memory_tool
+from graph_memory import (
+    graph_memory, initialize_graph_memory, store_graph_memory, query_graph_memory_tool, entity_summaries_tool
+)
+from fused_recall import get_fused_context
 
 # Import A2A system
 from a2a_system import initialize_a2a_network, a2a_manager, AgentCapability, MessageType
@@ -125,6 +128,12 @@ async def get_context_from_rag(ctx: RunContext[dict], query: str) -> str:
     return await get_rag_context(query, ctx)
 
 
+@pai_agent.tool
+async def recall_context(ctx: RunContext[dict], query: str) -> str:
+    """Recall context from graph memory and the knowledge base in one fused ranking"""
+    return await get_fused_context(query)
+
+
 @pai_agent.tool
 async def store_memory_graph(ctx: RunContext[dict], content: str, relationships: List[str]) -> str:
     """Store information in Neo4j graph memory"""
@@ -137,6 +146,12 @@ async def query_graph_memory(ctx: RunContext[dict], query: str) -> str:
     return await query_graph_memory_tool(query)
 
 
+@pai_agent.tool
+async def summarize_graph_entities(ctx: RunContext[dict], query: str) -> str:
+    """Summarize entities in graph memory: recent mentions and strongest related entities"""
+    return await entity_summaries_tool(query)
+
+
 # FastAPI app setup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -168,6 +183,7 @@ async def lifespan(app: FastAPI):
             agent_name="PAI Agent",
             endpoint=endpoint
         )
+        a2a_manager.start()
         logger.info("✅ A2A network system initialized")
     except Exception as e:
         logger.warning(f"⚠️ A2A system initialization failed: {e}")
@@ -187,6 +203,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Graph memory cleanup error: {e}")
 
+    try:
+        if a2a_manager:
+            await a2a_manager.close()
+            logger.info("🔄 A2A transport closed")
+    except Exception as e:
+        logger.warning(f"⚠️ A2A cleanup error: {e}")
+
     logger.info("🛑 PAI Agent shutting down...")
 
 
@@ -447,24 +470,80 @@ async def get_agent_profile():
                 "Graph memory with Neo4j",
                 "FastMCP 2.0",
                 "FastA2A architecture"
-            ]
+            ],
+            # Wire encodings this agent accepts, used by peers to negotiate
+            **(a2a_manager.advertise() if a2a_manager else {})
         }
     }
 
 
 @app.post("/a2a/v1/message")
-async def handle_a2a_message(message_data: Dict[str, Any]):
-    """Handle incoming A2A message"""
+async def handle_a2a_message(request: Request):
+    """Handle incoming A2A message (JSON, or a binary encoding negotiated via the profile)"""
     if not a2a_manager:
         raise HTTPException(status_code=503, detail="A2A system not initialized")
 
     try:
-        result = await a2a_manager.handle_incoming_message(message_data)
-        return result
+        result = await a2a_manager.handle_incoming_payload(
+            await request.body(),
+            request.headers.get("content-type"),
+            request.headers.get("content-encoding")
+        )
     except Exception as e:
         logger.error(f"A2A message handling error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    if result.get("status") == "overloaded":
+        raise HTTPException(
+            status_code=429,
+            detail=result["message"],
+            headers={"Retry-After": str(max(1, round(result["retry_after"])))}
+        )
+    return result
+
+
+@app.post("/a2a/v1/batch")
+async def handle_a2a_batch(request: Request):
+    """Handle a batch of A2A messages concurrently, returning one result per message"""
+    if not a2a_manager:
+        raise HTTPException(status_code=503, detail="A2A system not initialized")
+
+    try:
+        result = await a2a_manager.handle_incoming_batch(
+            await request.body(),
+            request.headers.get("content-type"),
+            request.headers.get("content-encoding")
+        )
+    except Exception as e:
+        logger.error(f"A2A batch handling error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    results = result.get("results") or []
+    if results and all(item.get("status") == "overloaded" for item in results):
+        raise HTTPException(
+            status_code=429,
+            detail="Inbound queue is full",
+            headers={"Retry-After": str(max(1, round(results[0]["retry_after"])))}
+        )
+    return result
+
+
+@app.post("/a2a/v1/stream")
+async def stream_a2a_task(request: Request):
+    """Run a delegated task and stream its partial results back as server-sent events"""
+    if not a2a_manager:
+        raise HTTPException(status_code=503, detail="A2A system not initialized")
+
+    return StreamingResponse(
+        a2a_manager.handle_incoming_stream(
+            await request.body(),
+            request.headers.get("content-type"),
+            request.headers.get("content-encoding")
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 @app.post("/a2a/v1/delegate")
 async def delegate_task(
@@ -473,7 +552,8 @@ async def delegate_task(
     parameters: Dict[str, Any],
     required_capabilities: List[str],
     deadline: Optional[str] = None,
-    priority: int = 0
+    priority: int = 0,
+    hedge: bool = False
 ):
     """Delegate a task to another agent in the network"""
     if not a2a_manager:
@@ -489,7 +569,8 @@ async def delegate_task(
             parameters=parameters,
             required_capabilities=caps,
             deadline=deadline_dt,
-            priority=priority
+            priority=priority,
+            hedge=hedge
         )
 
         if task_id:
@@ -502,6 +583,24 @@ async def delegate_task(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/a2a/v1/tasks/{task_id}")
+async def get_task_status(task_id: str, wait: Optional[float] = None):
+    """Get the status of a delegated task, optionally waiting up to `wait` seconds for it to finish"""
+    if not a2a_manager:
+        raise HTTPException(status_code=503, detail="A2A system not initialized")
+
+    task = a2a_manager.get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Unknown task {task_id}")
+
+    if wait and not task.finished:
+        try:
+            await a2a_manager.wait_for_task(task_id, timeout=wait)
+        except TimeoutError:
+            pass
+    return task.to_dict()
+
+
 @app.get("/a2a/v1/network")
 async def get_network_status():
     """Get A2A network status"""
@@ -515,6 +614,21 @@ async def get_network_status():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/a2a/v1/messages")
+async def get_message_history(
+    message_id: Optional[str] = None,
+    correlation_id: Optional[str] = None,
+    peer: Optional[str] = None,
+    limit: int = 50
+):
+    """Look up recent A2A messages by id, correlation id or peer"""
+    if not a2a_manager:
+        raise HTTPException(status_code=503, detail="A2A system not initialized")
+
+    messages = a2a_manager.lookup_messages(message_id, correlation_id, peer, limit)
+    return {"messages": messages, "count": len(messages)}
+
+
 @app.post("/a2a/v1/discover")
 async def discover_agents(discovery_endpoints: List[str]):
     """Discover other agents in the network"""
@@ -543,8 +657,8 @@ async def broadcast_message(
         msg_type = MessageType(message_type)
         exclude_set = set(exclude_agents) if exclude_agents else set()
 
-        successful = await a2a_manager.broadcast_message(msg_type, content, exclude_set)
-        return {"successful_sends": successful, "count": len(successful)}
+        result = await a2a_manager.broadcast_message(msg_type, content, exclude_set)
+        return {"successful_sends": result.delivered, "count": len(result.delivered), **result.to_dict()}
     except Exception as e:
         logger.error(f"Broadcast error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
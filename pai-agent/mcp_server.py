@@ -20,7 +20,8 @@ from pydantic import BaseModel
 
 # Import our systems
 from rag_system import rag_system, get_rag_context, store_rag_knowledge
-from graph_memory import graph_memory, store_graph_memory, query_graph_memory_tool
+from graph_memory import graph_memory, store_graph_memory, query_graph_memory_tool, entity_summaries_tool
+from fused_recall import GRAPH_NODE_KEY, get_fused_context
 
 logger = logging.getLogger("pai-mcp-server")
 
@@ -127,6 +128,25 @@ class PAIMCPServer:
                         "required": ["query"]
                     }
                 ),
+                types.Tool(
+                    name="recall_context",
+                    description="Recall context from graph memory and the knowledge base in one fused, deduplicated ranking",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "Query to recall context for"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of results",
+                                "default": 5
+                            }
+                        },
+                        "required": ["query"]
+                    }
+                ),
                 types.Tool(
                     name="get_system_status",
                     description="Get the status of PAI Agent systems",
@@ -218,6 +238,10 @@ class PAIMCPServer:
                     result = await query_graph_memory_tool(arguments["query"])
                     return [types.TextContent(type="text", text=result)]
 
+                elif name == "recall_context":
+                    result = await get_fused_context(arguments["query"], arguments.get("limit", 5))
+                    return [types.TextContent(type="text", text=result)]
+
                 elif name == "get_system_status":
                     status = await self._get_system_status()
                     return [types.TextContent(type="text", text=json.dumps(status, indent=2))]
@@ -449,21 +473,27 @@ class PAIMCPServer:
     ) -> str:
         """Store conversation in both systems"""
         try:
-            # Store in RAG system
             conversation_text = f"User: {user_message}\nAssistant: {assistant_response}"
-            rag_result = await store_rag_knowledge(
-                conversation_text,
-                f"conversation_{session_id}",
-                {"session_id": session_id, **metadata}
-            )
-
-            # Store in graph memory
             conv_id = f"{session_id}_{int(datetime.now().timestamp())}"
-            graph_result = await graph_memory.store_conversation_memory(
-                conversation_id=conv_id,
-                user_message=user_message,
-                assistant_response=assistant_response,
-                context=metadata
+
+            # Store in RAG and graph memory concurrently; the chunks carry the
+            # graph node id so fused recall can deduplicate across both
+            rag_result, graph_result = await asyncio.gather(
+                store_rag_knowledge(
+                    conversation_text,
+                    f"conversation_{session_id}",
+                    {
+                        "session_id": session_id,
+                        GRAPH_NODE_KEY: graph_memory.conversation_node_id(conv_id),
+                        **metadata
+                    }
+                ),
+                graph_memory.store_conversation_memory(
+                    conversation_id=conv_id,
+                    user_message=user_message,
+                    assistant_response=assistant_response,
+                    context=metadata
+                )
             )
 
             return f"Conversation stored: RAG={rag_result}, Graph={graph_result}"
@@ -481,8 +511,8 @@ class PAIMCPServer:
                 return f"RAG Summary:\n{rag_results}\n\nGraph Summary:\n{graph_results}"
 
             elif analysis_type == "entities":
-                # Extract entities from graph
-                graph_results = await query_graph_memory_tool(f"entities related to {scope}")
+                # Materialized entity neighborhoods from graph
+                graph_results = await entity_summaries_tool(scope)
                 return f"Entities:\n{graph_results}"
 
             elif analysis_type == "relationships":
@@ -522,19 +552,15 @@ class PAIMCPServer:
 
     async def _analyze_conversation_prompt(self, conversation_text: str, depth: str) -> str:
         """Generate conversation analysis prompt"""
-        rag_context = await get_rag_context(conversation_text[:200])  # First 200 chars
-        graph_context = await query_graph_memory_tool(conversation_text[:200])
+        context = await get_fused_context(conversation_text[:200])  # First 200 chars
 
         return f"""Analyze the following conversation with {depth} depth:
 
 Conversation:
 {conversation_text}
 
-Related RAG Context:
-{rag_context}
-
-Related Graph Context:
-{graph_context}
+Related Context (knowledge base and graph memory):
+{context}
 
 Please provide a {depth} analysis covering:
 1. Key topics and entities mentioned
@@ -546,18 +572,14 @@ Please provide a {depth} analysis covering:
 
     async def _knowledge_synthesis_prompt(self, query: str, sources: List[str]) -> str:
         """Generate knowledge synthesis prompt"""
-        rag_context = await get_rag_context(query)
-        graph_context = await query_graph_memory_tool(query)
+        context = await get_fused_context(query)
 
         source_filter = f" from sources: {', '.join(sources)}" if sources else ""
 
         return f"""Synthesize knowledge for the query: "{query}"{source_filter}
 
-RAG Retrieved Context:
-{rag_context}
-
-Graph Memory Context:
-{graph_context}
+Retrieved Context (knowledge base and graph memory):
+{context}
 
 Please synthesize this information to provide:
 1. A comprehensive answer to the query
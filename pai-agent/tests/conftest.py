@@ -0,0 +1,64 @@
+import httpx
+import pytest
+
+from graph_memory import GraphConfig, GraphMemorySystem
+
+
+@pytest.fixture
+async def embedded_graph():
+    """A GraphMemorySystem on a fresh embedded store"""
+    system = GraphMemorySystem(GraphConfig(backend="embedded", snapshot_path=None))
+    await system.initialize()
+    yield system
+    await system.close()
+
+
+@pytest.fixture
+async def a2a_network():
+    """Factory for started in-process A2A networks, closed after the test"""
+    from a2a_bench import A2ASimulation, SimulationConfig
+
+    simulations = []
+
+    async def start(**config):
+        config.setdefault("latency", 0.0)
+        config.setdefault("jitter", 0.0)
+        simulation = A2ASimulation(SimulationConfig(**config))
+        await simulation.start()
+        simulations.append(simulation)
+        return simulation
+
+    yield start
+    for simulation in simulations:
+        await simulation.close()
+
+
+@pytest.fixture
+async def peer_manager():
+    """Factory for a manager named "local" whose one peer, "peer", is served by an httpx handler"""
+    from a2a_history import MessageHistory
+    from a2a_registry import AgentRegistry
+    from a2a_system import A2ANetworkManager, AgentCapability
+    from a2a_transport import A2ATransport, A2ATransportConfig
+
+    managers = []
+
+    async def start(handler, metadata=None, **options):
+        manager = A2ANetworkManager(
+            "local",
+            "local",
+            "http://local",
+            transport=A2ATransport(A2ATransportConfig(http2=False), transport=httpx.MockTransport(handler)),
+            history=MessageHistory(capacity=100, spill_path=None),
+            registry=AgentRegistry(A2ANetworkManager._profile_from_record, path=None),
+            **options
+        )
+        await manager.register_agent(
+            "peer", "peer", "Test peer", {AgentCapability.RAG_RETRIEVAL}, "http://peer", metadata=metadata
+        )
+        managers.append(manager)
+        return manager
+
+    yield start
+    for manager in managers:
+        await manager.close()
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+
+from a2a_batching import MessageCoalescer
+from a2a_system import BATCH_KEY, MessageType
+
+
+class RecordingFlush:
+    def __init__(self, delay=0.0, error=None):
+        self.calls = []
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self, destination, items):
+        self.calls.append((destination, list(items)))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [f"{destination}:{item}" for item in items]
+
+
+async def test_items_within_linger_share_one_batch():
+    flush = RecordingFlush()
+    coalescer = MessageCoalescer(flush, max_items=10, linger=0.01)
+
+    results = await asyncio.gather(*(coalescer.submit("peer", index) for index in range(3)))
+
+    assert results == ["peer:0", "peer:1", "peer:2"]
+    assert flush.calls == [("peer", [0, 1, 2])]
+    assert coalescer.stats()["avg_batch_size"] == 3.0
+
+
+async def test_full_buffer_flushes_without_waiting_for_linger():
+    flush = RecordingFlush()
+    coalescer = MessageCoalescer(flush, max_items=2, linger=60.0)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(coalescer.submit("peer", index) for index in range(4))),
+        timeout=1.0
+    )
+
+    assert results == ["peer:0", "peer:1", "peer:2", "peer:3"]
+    assert flush.calls == [("peer", [0, 1]), ("peer", [2, 3])]
+
+
+async def test_destinations_are_batched_separately():
+    flush = RecordingFlush()
+    coalescer = MessageCoalescer(flush, max_items=10, linger=0.01)
+
+    results = await asyncio.gather(
+        coalescer.submit("a", 1), coalescer.submit("b", 2), coalescer.submit("a", 3)
+    )
+
+    assert results == ["a:1", "b:2", "a:3"]
+    assert sorted(flush.calls) == [("a", [1, 3]), ("b", [2])]
+
+
+async def test_flush_errors_reach_every_waiter():
+    coalescer = MessageCoalescer(RecordingFlush(error=ConnectionError("peer down")), max_items=10, linger=0.01)
+
+    results = await asyncio.gather(
+        coalescer.submit("peer", 1), coalescer.submit("peer", 2), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+async def test_close_sends_buffered_items():
+    flush = RecordingFlush()
+    coalescer = MessageCoalescer(flush, max_items=10, linger=60.0)
+
+    pending = asyncio.ensure_future(coalescer.submit("peer", 1))
+    await asyncio.sleep(0)
+    assert coalescer.stats()["buffered"] == 1
+
+    await coalescer.close()
+
+    assert await pending == "peer:1"
+    assert coalescer.stats()["buffered"] == 0
+
+
+def test_single_item_batches_disable_coalescing():
+    assert not MessageCoalescer(RecordingFlush(), max_items=1).enabled
+    assert MessageCoalescer(RecordingFlush(), max_items=2).enabled
+
+
+async def test_short_flush_fails_the_unanswered_items():
+    async def short_flush(destination, items):
+        return items[:1]
+
+    coalescer = MessageCoalescer(short_flush, max_items=10, linger=0.01)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(coalescer.submit("peer", index) for index in range(3)), return_exceptions=True),
+        timeout=1.0
+    )
+
+    assert results[0] == 0
+    assert all(isinstance(result, RuntimeError) for result in results[1:])
+
+
+async def test_short_batch_reply_fails_every_message(peer_manager):
+    manager = await peer_manager(
+        lambda request: httpx.Response(200, json={"results": [{"status": "success"}]}),
+        metadata={BATCH_KEY: True}
+    )
+
+    results = await asyncio.wait_for(asyncio.gather(
+        manager.send_message("peer", MessageType.NOTIFICATION, {"n": 1}),
+        manager.send_message("peer", MessageType.NOTIFICATION, {"n": 2})
+    ), timeout=1.0)
+
+    assert results == [None, None]
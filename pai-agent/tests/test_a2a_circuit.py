@@ -0,0 +1,163 @@
+import httpx
+import pytest
+
+import a2a_circuit
+from a2a_circuit import CLOSED, HALF_OPEN, OPEN, BreakerConfig, CircuitBreakers
+from a2a_routing import LatencyEWMA
+from a2a_system import AgentCapability, MessageType
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(a2a_circuit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_consecutive_failures_open_the_circuit(clock):
+    breakers = CircuitBreakers(BreakerConfig(failure_threshold=3, reset_timeout=10.0))
+
+    for _ in range(2):
+        breakers.record_failure("peer")
+    assert breakers.state("peer") == CLOSED
+
+    breakers.record_success("peer")
+    for _ in range(2):
+        breakers.record_failure("peer")
+    assert breakers.state("peer") == CLOSED
+
+    breakers.record_failure("peer")
+    assert breakers.state("peer") == OPEN
+    assert not breakers.available("peer")
+    assert not breakers.allow("peer")
+    assert breakers.get("peer").rejected == 1
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breakers = CircuitBreakers(BreakerConfig(failure_threshold=1, reset_timeout=10.0))
+    breakers.record_failure("peer")
+
+    clock[0] += 10.0
+    assert breakers.available("peer")
+    assert breakers.allow("peer")
+    assert breakers.state("peer") == HALF_OPEN
+    assert not breakers.available("peer")
+    assert not breakers.allow("peer")
+
+    breakers.record_success("peer")
+    assert breakers.state("peer") == CLOSED
+    assert breakers.allow("peer")
+
+
+def test_failed_probe_doubles_the_cool_down(clock):
+    breakers = CircuitBreakers(BreakerConfig(failure_threshold=1, reset_timeout=10.0, max_reset_timeout=15.0))
+    breakers.record_failure("peer")
+
+    clock[0] += 10.0
+    assert breakers.allow("peer")
+    breakers.record_failure("peer")
+    assert breakers.state("peer") == OPEN
+    assert breakers.get("peer").open_for == 15.0
+
+    clock[0] += 10.0
+    assert not breakers.available("peer")
+    clock[0] += 5.0
+    assert breakers.allow("peer")
+
+    breakers.record_success("peer")
+    assert breakers.get("peer").open_for == 10.0
+
+
+def test_unknown_peers_are_available():
+    breakers = CircuitBreakers()
+
+    assert breakers.available("never-seen")
+    assert breakers.state("never-seen") == CLOSED
+    assert breakers.stats() == {"open": 0, "agents": {}}
+
+
+def test_timeout_follows_the_latency_tail():
+    config = BreakerConfig(timeout_multiplier=4.0, min_timeout=1.0, max_timeout=30.0, min_samples=3)
+    breakers = CircuitBreakers(config)
+    latency = LatencyEWMA(alpha=0.2)
+
+    assert breakers.timeout_for(None) == 30.0
+    latency.update(0.5)
+    assert breakers.timeout_for(latency) == 30.0
+
+    latency.update(0.5)
+    latency.update(0.5)
+    assert breakers.timeout_for(latency) == pytest.approx(latency.p95 * 4.0)
+
+    fast = LatencyEWMA(alpha=0.2)
+    for _ in range(3):
+        fast.update(0.01)
+    assert breakers.timeout_for(fast) == 1.0
+
+    slow = LatencyEWMA(alpha=0.2)
+    for _ in range(3):
+        slow.update(20.0)
+    assert breakers.timeout_for(slow) == 30.0
+
+
+async def test_send_reads_under_the_adaptive_timeout_only(peer_manager):
+    seen = {}
+
+    def handler(request):
+        seen.update(request.extensions["timeout"])
+        return httpx.Response(200, json={"status": "success"})
+
+    manager = await peer_manager(handler)
+    for _ in range(manager.breakers.config.min_samples):
+        manager.router.begin_request("peer")
+        manager.router.end_request("peer", 0.5)
+    expected = manager.breakers.timeout_for(manager.router.peers["peer"].request)
+
+    assert await manager.send_message("peer", MessageType.NOTIFICATION, {"n": 1}, batch=False) is not None
+
+    config = manager.transport.config
+    assert seen["read"] == pytest.approx(expected)
+    assert seen["connect"] == config.connect_timeout
+    assert seen["write"] == config.write_timeout
+    assert seen["pool"] == config.pool_timeout
+
+
+async def test_unencodable_message_leaves_the_probe_alone(peer_manager):
+    manager = await peer_manager(
+        lambda request: httpx.Response(200, json={"status": "success"}),
+        breakers=CircuitBreakers(BreakerConfig(failure_threshold=1, reset_timeout=0.0))
+    )
+    manager.breakers.record_failure("peer")
+
+    def broken_encode(*args, **kwargs):
+        raise TypeError("not serializable")
+
+    manager.codec.encode = broken_encode
+
+    assert await manager.send_message("peer", MessageType.NOTIFICATION, {"n": 1}, batch=False) is None
+    result = await manager.fan_out(["peer"], MessageType.NOTIFICATION, {"n": 1})
+
+    assert result.outcomes["peer"].status == "failed"
+    assert not manager.breakers.get("peer").probing
+    assert manager.breakers.available("peer")
+
+
+async def test_fan_out_survives_a_peer_that_raises(peer_manager, monkeypatch):
+    manager = await peer_manager(lambda request: httpx.Response(200, json={"status": "success"}))
+    await manager.register_agent(
+        "other", "other", "Other peer", {AgentCapability.RAG_RETRIEVAL}, "http://other"
+    )
+    send = manager._send
+
+    async def flaky_send(agent_id, *args, **kwargs):
+        if agent_id == "other":
+            raise RuntimeError("boom")
+        return await send(agent_id, *args, **kwargs)
+
+    monkeypatch.setattr(manager, "_send", flaky_send)
+
+    result = await manager.fan_out(["peer", "other"], MessageType.NOTIFICATION, {"n": 1})
+
+    assert result.outcomes["peer"].status == "delivered"
+    assert result.outcomes["other"].status == "failed"
+    assert result.outcomes["other"].error == "boom"
@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import a2a_codec
+from a2a_codec import CODECS_KEY, COMPRESSION_KEY, JSON, MSGPACK, ZSTD, MessageCodec
+from a2a_system import A2AMessage, MessageType
+
+
+def make_message(content=None, message_id="msg_1"):
+    return A2AMessage(
+        message_id=message_id,
+        from_agent="pai-agent",
+        to_agent="research-agent",
+        message_type=MessageType.RESPONSE,
+        content=content if content is not None else {"status": "completed", "result": {"score": 0.5}},
+        timestamp=datetime(2024, 5, 1, 12, 30, 15, 250000),
+        correlation_id="task_1",
+        ttl=60,
+        priority=2
+    )
+
+
+def assert_round_trip(decoded, message):
+    assert decoded["message_id"] == message.message_id
+    assert decoded["from_agent"] == message.from_agent
+    assert decoded["message_type"] == message.message_type.value
+    assert decoded["content"] == message.content
+    assert decoded["correlation_id"] == message.correlation_id
+    assert decoded["ttl"] == message.ttl
+    assert decoded["priority"] == message.priority
+    timestamp = decoded["timestamp"]
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    # Compare instants: binary codecs return UTC, JSON the sender's naive local time
+    assert timestamp.astimezone(timezone.utc) == message.timestamp.astimezone(timezone.utc)
+
+
+@pytest.mark.parametrize("content_type", [JSON, MSGPACK])
+@pytest.mark.parametrize("compress", [False, True])
+def test_message_round_trip(content_type, compress):
+    if content_type == MSGPACK and a2a_codec.msgpack is None:
+        pytest.skip("msgpack not installed")
+    if compress and a2a_codec.zstandard is None:
+        pytest.skip("zstandard not installed")
+    codec = MessageCodec(compress_min_bytes=64)
+    message = make_message({"text": "graph memory recall snippet " * 20})
+
+    body, headers = codec.encode(message, content_type, compress)
+
+    assert headers["Content-Type"] == content_type
+    assert (headers.get("Content-Encoding") == ZSTD) == compress
+    assert_round_trip(codec.decode(body, headers["Content-Type"], headers.get("Content-Encoding")), message)
+
+
+@pytest.mark.parametrize("content_type", [JSON, MSGPACK])
+def test_batch_round_trip(content_type):
+    if content_type == MSGPACK and a2a_codec.msgpack is None:
+        pytest.skip("msgpack not installed")
+    codec = MessageCodec()
+    messages = [make_message({"index": index}, message_id=f"msg_{index}") for index in range(3)]
+
+    body, headers = codec.encode_batch(messages, content_type)
+    decoded = codec.decode_batch(body, headers["Content-Type"], headers.get("Content-Encoding"))
+
+    assert len(decoded) == 3
+    for fields, message in zip(decoded, messages):
+        assert_round_trip(fields, message)
+    assert codec.stats()["encoded"][content_type] == 3
+
+
+def test_small_bodies_are_not_compressed():
+    codec = MessageCodec(compress_min_bytes=1 << 20)
+
+    _, headers = codec.encode(make_message(), JSON, compress=True)
+
+    assert "Content-Encoding" not in headers
+
+
+def test_negotiate_falls_back_to_json():
+    codec = MessageCodec()
+
+    assert codec.negotiate(None) == (JSON, False)
+    assert codec.negotiate({CODECS_KEY: ["application/unknown"]}) == (JSON, False)
+
+
+def test_negotiate_picks_a_shared_binary_codec():
+    if a2a_codec.msgpack is None or a2a_codec.zstandard is None:
+        pytest.skip("msgpack or zstandard not installed")
+    codec = MessageCodec()
+
+    assert codec.negotiate(codec.advertise()) == (MSGPACK, True)
+    assert codec.negotiate({CODECS_KEY: [MSGPACK, JSON], COMPRESSION_KEY: []}) == (MSGPACK, False)
+
+
+def test_disabled_codec_only_speaks_json():
+    codec = MessageCodec(enabled=False)
+
+    assert codec.advertise() == {CODECS_KEY: [JSON], COMPRESSION_KEY: []}
+    with pytest.raises(ValueError):
+        codec.decode(b"\x93\x01\x02\x03", MSGPACK)
+
+
+def test_binary_timestamps_arrive_as_utc():
+    if a2a_codec.msgpack is None:
+        pytest.skip("msgpack not installed")
+    codec = MessageCodec()
+    message = make_message()
+
+    body, headers = codec.encode(message, MSGPACK)
+    decoded = codec.decode(body, MSGPACK)
+
+    assert decoded["timestamp"].tzinfo == timezone.utc
+
+
+def test_decompression_is_capped():
+    if a2a_codec.zstandard is None:
+        pytest.skip("zstandard not installed")
+    codec = MessageCodec(max_body_bytes=64 * 1024)
+    bomb = a2a_codec.zstandard.ZstdCompressor().compress(b"[" + b" " * (1 << 20) + b"]")
+
+    assert len(bomb) < codec.max_body_bytes
+    with pytest.raises(ValueError, match="exceeds"):
+        codec.decode(bomb, JSON, ZSTD)
+
+
+def test_oversized_body_is_refused():
+    codec = MessageCodec(max_body_bytes=16)
+
+    with pytest.raises(ValueError, match="exceeds"):
+        codec.decode(b'{"padding": "' + b"x" * 32 + b'"}', JSON)
+
+
+async def test_ttl_checks_accept_utc_timestamps(peer_manager):
+    if a2a_codec.msgpack is None:
+        pytest.skip("msgpack not installed")
+    manager = await peer_manager(lambda request: None)
+    message = A2AMessage(
+        message_id="msg_ttl",
+        from_agent="peer",
+        to_agent="local",
+        message_type=MessageType.HEALTH_CHECK,
+        content={},
+        timestamp=datetime.now(),
+        ttl=60
+    )
+
+    body, headers = manager.codec.encode(message, MSGPACK)
+    reply = await manager.handle_incoming_payload(body, MSGPACK)
+
+    assert reply["status"] == "success"
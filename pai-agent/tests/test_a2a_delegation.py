@@ -0,0 +1,139 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from a2a_system import A2AMessage, AgentCapability, MessageType
+
+RAG = AgentCapability.RAG_RETRIEVAL
+
+
+def _handler(result, delay=0.0):
+    async def handle(parameters):
+        await asyncio.sleep(delay)
+        return result
+    return handle
+
+
+async def _network(a2a_network, agents=2):
+    network = await a2a_network(agents=agents, capability_mix={RAG.value: 1.0})
+    return network, network.managers[0]
+
+
+def _response(task_id, from_agent, status="completed", result=None):
+    return {
+        "message_id": f"spoof-{from_agent}",
+        "from_agent": from_agent,
+        "to_agent": "agent-0",
+        "message_type": MessageType.RESPONSE.value,
+        "content": {"task_id": task_id, "status": status, "result": result},
+        "timestamp": datetime.now().isoformat(),
+        "correlation_id": task_id
+    }
+
+
+async def test_delegated_result_is_pushed_back(a2a_network):
+    network, sender = await _network(a2a_network)
+    network.managers[1].register_capability_handler(RAG, _handler({"answer": 42}))
+    done = []
+
+    task_id = await sender.delegate_task("lookup", "find it", {}, {RAG}, on_complete=done.append)
+    task = await sender.wait_for_task(task_id, timeout=5)
+
+    assert task.status == "completed"
+    assert task.completed_by == "agent-1"
+    assert task.result == {"results": {RAG.value: {"answer": 42}}, "errors": {}}
+    assert done == [task]
+    assert sender.router.peers["agent-1"].outstanding_tasks == 0
+
+
+async def test_response_from_unassigned_agent_is_rejected(a2a_network):
+    network, sender = await _network(a2a_network, agents=3)
+    for manager in network.managers[1:]:
+        manager.register_capability_handler(RAG, _handler({"genuine": True}, delay=0.2))
+
+    task_id = await sender.delegate_task("lookup", "find it", {}, {RAG})
+    task = sender.get_task(task_id)
+    bystander = next(m.agent_id for m in network.managers[1:] if m.agent_id != task.delegate_to)
+
+    reply = await sender.handle_incoming_message(_response(task_id, bystander, result={"forged": True}))
+
+    assert reply["result"] == {"acknowledged": False, "reason": "unexpected_sender"}
+    assert not task.finished
+    finished = await sender.wait_for_task(task_id, timeout=5)
+    assert finished.completed_by == task.delegate_to
+    assert finished.result == {"results": {RAG.value: {"genuine": True}}, "errors": {}}
+
+
+async def test_unknown_task_response_is_rejected(a2a_network):
+    _, sender = await _network(a2a_network)
+
+    reply = await sender.handle_incoming_message(_response("task_missing", "agent-1"))
+
+    assert reply["result"] == {"acknowledged": False, "reason": "unknown_task"}
+
+
+async def test_hedge_to_a_second_agent_wins_when_primary_is_slow(a2a_network):
+    network, sender = await _network(a2a_network, agents=3)
+    slow, fast = network.managers[1], network.managers[2]
+    slow.register_capability_handler(RAG, _handler("slow", delay=5))
+    fast.register_capability_handler(RAG, _handler("fast"))
+    sender.router.config.hedge_delay = 0.05
+    # Extra load on the fast agent makes the router pick the slow one first
+    sender.router.config.strategy = "least_outstanding"
+    sender.router.task_started(fast.agent_id)
+
+    task_id = await sender.delegate_task("lookup", "find it", {}, {RAG}, hedge=True)
+    task = await sender.wait_for_task(task_id, timeout=5)
+
+    assert task.delegate_to == slow.agent_id
+    assert task.hedged_to == fast.agent_id
+    assert task.completed_by == fast.agent_id
+    assert task.result == {"results": {RAG.value: "fast"}, "errors": {}}
+    assert sender.router.hedges == 1
+    assert sender.router.peers[slow.agent_id].outstanding_tasks == 0
+
+
+async def test_deadline_expires_unanswered_task(a2a_network):
+    network, sender = await _network(a2a_network)
+    network.managers[1].register_capability_handler(RAG, _handler("late", delay=5))
+
+    task_id = await sender.delegate_task(
+        "lookup", "find it", {}, {RAG}, deadline=datetime.now() + timedelta(seconds=0.1)
+    )
+    task = await sender.wait_for_task(task_id, timeout=5)
+
+    assert task.status == "expired"
+    assert task.result is None
+
+
+async def test_no_capable_agent_returns_none(a2a_network):
+    _, sender = await _network(a2a_network)
+
+    assert await sender.delegate_task("synth", "x", {}, {AgentCapability.CODE_EXECUTION}) is None
+
+
+async def test_task_without_deadline_expires_after_its_lifetime(a2a_network):
+    network, sender = await _network(a2a_network)
+    network.managers[1].register_capability_handler(RAG, _handler("late", delay=5))
+    sender.task_lifetime = 0.1
+
+    task_id = await sender.delegate_task("lookup", "find it", {}, {RAG})
+    task = await sender.wait_for_task(task_id, timeout=5)
+
+    assert task.status == "expired"
+    assert "lifetime" in task.error
+    assert task_id not in sender._task_futures
+    assert sender.router.peers["agent-1"].outstanding_tasks == 0
+
+
+async def test_results_only_go_to_known_agents(a2a_network):
+    network, sender = await _network(a2a_network)
+    worker = network.managers[1]
+    worker.register_capability_handler(RAG, _handler({"answer": 42}))
+    worker.registry.remove(sender.agent_id)
+    sender.task_lifetime = 0.3
+
+    task_id = await sender.delegate_task("lookup", "find it", {}, {RAG})
+    task = await sender.wait_for_task(task_id, timeout=5)
+
+    assert task.status == "expired"
+    assert sender.agent_id not in worker.agents
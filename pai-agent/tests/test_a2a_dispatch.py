@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+
+from a2a_dispatch import CapabilityDispatcher
+
+
+def _sleeper(result, delay):
+    async def handle(parameters):
+        await asyncio.sleep(delay)
+        return result
+    return handle
+
+
+async def test_handlers_run_concurrently():
+    dispatcher = CapabilityDispatcher()
+    dispatcher.register("a", _sleeper("A", 0.1))
+    dispatcher.register("b", _sleeper("B", 0.1))
+
+    started = time.monotonic()
+    outcome = await dispatcher.dispatch(["a", "b"], {})
+
+    assert outcome == {"results": {"a": "A", "b": "B"}, "errors": {}}
+    assert time.monotonic() - started < 0.18
+
+
+async def test_per_capability_parameters_and_partial_failure():
+    dispatcher = CapabilityDispatcher()
+    dispatcher.register("echo", lambda parameters: parameters)
+    dispatcher.register("slow", _sleeper("never", 1), timeout=0.01)
+
+    outcome = await dispatcher.dispatch(["echo", "slow"], {"echo": {"q": 1}, "shared": True})
+
+    assert outcome["results"] == {"echo": {"q": 1}}
+    assert outcome["errors"] == {"slow": "Timed out after 0.01s"}
+    assert dispatcher.stats()["timeouts"] == 1
+
+
+async def test_all_handlers_failing_raises():
+    dispatcher = CapabilityDispatcher()
+
+    def broken(parameters):
+        raise ValueError("broken")
+
+    dispatcher.register("a", broken)
+
+    with pytest.raises(RuntimeError, match="a: broken"):
+        await dispatcher.dispatch(["a"], {})
+
+
+async def test_cacheable_calls_share_one_execution():
+    dispatcher = CapabilityDispatcher()
+    calls = []
+
+    async def lookup(parameters):
+        calls.append(parameters)
+        await asyncio.sleep(0.01)
+        return {"q": parameters["q"]}
+
+    dispatcher.register("lookup", lookup, cacheable=True)
+
+    results = await asyncio.gather(*(dispatcher.call("lookup", {"q": 1}) for _ in range(3)))
+    again = await dispatcher.call("lookup", {"q": 1})
+
+    assert results == [{"q": 1}] * 3 and again == {"q": 1}
+    assert len(calls) == 1
+    assert dispatcher.cache_hits == 3
+
+
+async def test_failures_are_not_cached():
+    dispatcher = CapabilityDispatcher()
+    attempts = []
+
+    async def flaky(parameters):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("first call fails")
+        return "ok"
+
+    dispatcher.register("flaky", flaky, cacheable=True)
+
+    with pytest.raises(RuntimeError):
+        await dispatcher.call("flaky", {})
+    assert await dispatcher.call("flaky", {}) == "ok"
+
+
+async def test_stream_splits_long_results_into_chunks():
+    dispatcher = CapabilityDispatcher(stream_chunk_items=2)
+    dispatcher.register("list", lambda parameters: {"results": [1, 2, 3, 4, 5], "total": 5})
+
+    events = [event async for event in dispatcher.stream(["list"], {})]
+
+    assert [event.get("items") for event in events[:-1]] == [[1, 2], [3, 4], [5]]
+    assert events[-1] == {"event": "result", "capability": "list", "result": {"total": 5}, "chunks": 3}
+
+
+async def test_stream_forwards_generator_items_and_errors():
+    dispatcher = CapabilityDispatcher()
+
+    async def produce(parameters):
+        for item in ("x", "y"):
+            yield item
+
+    def broken(parameters):
+        raise ValueError("nope")
+
+    dispatcher.register("gen", lambda parameters: None, stream=produce)
+    dispatcher.register("bad", broken)
+
+    events = [event async for event in dispatcher.stream(["gen", "bad"], {})]
+
+    gen = [event for event in events if event["capability"] == "gen"]
+    assert [event.get("items") for event in gen] == [["x"], ["y"], None]
+    assert gen[-1]["chunks"] == 2
+    assert {"event": "error", "capability": "bad", "error": "nope"} in events
+
+
+async def test_closing_the_stream_cancels_running_handlers():
+    dispatcher = CapabilityDispatcher()
+    cancelled = asyncio.Event()
+
+    async def produce(parameters):
+        try:
+            yield "first"
+            await asyncio.sleep(10)
+            yield "never"
+        finally:
+            cancelled.set()
+
+    dispatcher.register("gen", lambda parameters: None, stream=produce)
+
+    stream = dispatcher.stream(["gen"], {})
+    assert (await anext(stream))["items"] == ["first"]
+    await stream.aclose()
+
+    await asyncio.wait_for(cancelled.wait(), 1)
@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from a2a_history import RECEIVED, SENT, MessageHistory
+from a2a_system import A2AMessage, MessageType
+
+
+def _message(n, from_agent="me", to_agent="peer", correlation_id=None):
+    return A2AMessage(
+        message_id=f"m{n}",
+        from_agent=from_agent,
+        to_agent=to_agent,
+        message_type=MessageType.REQUEST,
+        content={"n": n},
+        timestamp=datetime.now(timezone.utc),
+        correlation_id=correlation_id
+    )
+
+
+def test_ring_evicts_oldest_and_its_index_entries():
+    history = MessageHistory(capacity=3, spill_path=None)
+    for n in range(5):
+        history.record(_message(n, correlation_id="task"), SENT)
+
+    assert len(history) == 3
+    assert history.get("m0") is None and history.get("m1") is None
+    assert [r.message_id for r in history.recent()] == ["m4", "m3", "m2"]
+    assert [r.message_id for r in history.by_correlation("task")] == ["m2", "m3", "m4"]
+    assert history.stats()["evicted"] == 2
+
+
+def test_peer_index_uses_the_other_side_of_the_message():
+    history = MessageHistory(capacity=10, spill_path=None)
+    history.record(_message(0, to_agent="a"), SENT)
+    history.record(_message(1, from_agent="b", to_agent="me"), RECEIVED)
+    history.record(_message(2, to_agent="a"), SENT)
+
+    assert [r.message_id for r in history.by_peer("a")] == ["m2", "m0"]
+    assert [r.message_id for r in history.by_peer("a", limit=1)] == ["m2"]
+    assert [r.message_id for r in history.by_peer("b")] == ["m1"]
+
+
+def test_spill_log_keeps_full_content(tmp_path):
+    path = tmp_path / "a2a.jsonl"
+    history = MessageHistory(capacity=1, spill_path=str(path))
+    history.record(_message(0), SENT)
+    history.record(_message(1), SENT)
+    history.close()
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(e["message_id"], e["content"]) for e in entries] == [("m0", {"n": 0}), ("m1", {"n": 1})]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        MessageHistory(capacity=0)
@@ -0,0 +1,118 @@
+import os
+from datetime import datetime
+
+import a2a_registry
+from a2a_registry import ADDED, REMOVED, UPDATED, AgentRegistry
+from a2a_system import A2ANetworkManager, AgentCapability, AgentProfile
+
+
+def make_profile(agent_id, *capabilities, health_status="unknown"):
+    return AgentProfile(
+        agent_id=agent_id,
+        name=agent_id.title(),
+        description=f"{agent_id} agent",
+        capabilities=set(capabilities),
+        endpoint=f"http://{agent_id}:8181",
+        last_seen=datetime(2024, 5, 1, 12, 0, 0),
+        health_status=health_status,
+        metadata={"region": "eu"}
+    )
+
+
+def open_registry(path):
+    return AgentRegistry(A2ANetworkManager._profile_from_record, path=str(path))
+
+
+def test_profiles_survive_a_restart(tmp_path):
+    path = tmp_path / "registry.db"
+    registry = open_registry(path)
+    registry.register(make_profile("research", AgentCapability.WEB_SEARCH, AgentCapability.RAG_RETRIEVAL))
+    registry.register(make_profile("coder", AgentCapability.CODE_EXECUTION))
+    registry.agents["coder"].success_rate = 0.5
+    registry.mark_dirty("coder")
+    registry.close()
+
+    reloaded = open_registry(path)
+
+    assert set(reloaded.agents) == {"research", "coder"}
+    research = reloaded.agents["research"]
+    assert research.capabilities == {AgentCapability.WEB_SEARCH, AgentCapability.RAG_RETRIEVAL}
+    assert research.endpoint == "http://research:8181"
+    assert research.last_seen == datetime(2024, 5, 1, 12, 0, 0)
+    assert research.metadata == {"region": "eu"}
+    assert reloaded.agents["coder"].success_rate == 0.5
+    assert reloaded.with_all([AgentCapability.WEB_SEARCH]) == {"research"}
+    reloaded.close()
+
+
+def test_reloaded_peers_are_not_trusted_as_healthy(tmp_path):
+    path = tmp_path / "registry.db"
+    registry = open_registry(path)
+    registry.register(make_profile("research", AgentCapability.WEB_SEARCH, health_status="healthy"))
+    registry.close()
+
+    reloaded = open_registry(path)
+
+    assert reloaded.agents["research"].health_status == "unknown"
+    reloaded.close()
+
+
+def test_removed_profiles_stay_removed(tmp_path):
+    path = tmp_path / "registry.db"
+    registry = open_registry(path)
+    registry.register(make_profile("research", AgentCapability.WEB_SEARCH))
+    registry.remove("research")
+    registry.close()
+
+    reloaded = open_registry(path)
+
+    assert reloaded.agents == {}
+    assert reloaded.with_any([AgentCapability.WEB_SEARCH]) == set()
+    reloaded.close()
+
+
+def test_capability_index_and_events():
+    registry = AgentRegistry(A2ANetworkManager._profile_from_record, path=None)
+    events = []
+    registry.subscribe(lambda event, profile: events.append((event, profile.agent_id)))
+
+    registry.register(make_profile("research", AgentCapability.WEB_SEARCH, AgentCapability.RAG_RETRIEVAL))
+    registry.register(make_profile("rag", AgentCapability.RAG_RETRIEVAL))
+    assert registry.with_all([AgentCapability.RAG_RETRIEVAL]) == {"research", "rag"}
+    assert registry.with_all([AgentCapability.RAG_RETRIEVAL, AgentCapability.WEB_SEARCH]) == {"research"}
+    assert registry.with_any([AgentCapability.WEB_SEARCH, AgentCapability.CODE_EXECUTION]) == {"research"}
+
+    registry.register(make_profile("research", AgentCapability.CODE_EXECUTION))
+    assert registry.with_any([AgentCapability.WEB_SEARCH]) == set()
+    assert registry.with_all([AgentCapability.CODE_EXECUTION]) == {"research"}
+
+    registry.remove("rag")
+    assert events == [(ADDED, "research"), (ADDED, "rag"), (UPDATED, "research"), (REMOVED, "rag")]
+
+
+def test_default_path_is_under_the_data_directory():
+    assert os.path.dirname(a2a_registry.DEFAULT_PATH) == a2a_registry.DATA_DIR
+    assert os.path.dirname(os.path.abspath(a2a_registry.DEFAULT_PATH)) != os.getcwd()
+
+
+def test_missing_parent_directory_is_created(tmp_path):
+    path = tmp_path / "data" / "registry.db"
+    registry = open_registry(path)
+    registry.register(make_profile("research", AgentCapability.WEB_SEARCH))
+    registry.close()
+
+    assert path.exists()
+
+
+async def test_expired_peers_leave_no_routing_or_circuit_state(peer_manager):
+    manager = await peer_manager(lambda request: None, peer_expiry=60)
+    manager.router.task_started("peer")
+    manager.breakers.record_failure("peer")
+    manager.agents["peer"].last_seen = datetime(2000, 1, 1)
+
+    result = await manager.heartbeat()
+
+    assert result["expired"] == ["peer"]
+    assert "peer" not in manager.agents
+    assert "peer" not in manager.router.peers
+    assert "peer" not in manager.breakers.breakers
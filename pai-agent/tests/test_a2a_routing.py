@@ -0,0 +1,69 @@
+import pytest
+
+from a2a_routing import AgentRouter, LatencyEWMA, RoutingConfig
+
+
+def test_ewma_tracks_mean_and_tail():
+    ewma = LatencyEWMA(alpha=0.5)
+    for value in (1.0, 1.0, 3.0):
+        ewma.update(value)
+
+    assert ewma.mean == pytest.approx(2.0)
+    assert ewma.p95 > ewma.mean
+    assert ewma.samples == 3
+
+
+def test_least_outstanding_prefers_idle_fast_peers():
+    router = AgentRouter(RoutingConfig(strategy="least_outstanding"))
+    router.task_finished("slow", 2.0)
+    router.task_finished("fast", 0.1)
+
+    assert router.choose([("slow", 1.0), ("fast", 1.0)]) == "fast"
+
+    for _ in range(30):
+        router.task_started("fast")
+    assert router.choose([("slow", 1.0), ("fast", 1.0)]) == "slow"
+
+
+def test_success_rate_discounts_unreliable_peers():
+    router = AgentRouter(RoutingConfig(strategy="least_outstanding"))
+
+    assert router.choose([("flaky", 0.1), ("solid", 1.0)]) == "solid"
+
+
+def test_p2c_never_picks_the_worst_of_many():
+    router = AgentRouter(RoutingConfig(strategy="p2c"))
+    router.task_finished("worst", 10.0)
+    candidates = [("worst", 1.0)] + [(f"peer-{i}", 1.0) for i in range(4)]
+
+    assert all(router.choose(candidates) != "worst" for _ in range(50))
+
+
+def test_choose_without_candidates():
+    assert AgentRouter().choose([]) is None
+    assert AgentRouter().choose([("only", 0.0)]) == "only"
+
+
+def test_in_flight_is_released_and_sampled():
+    router = AgentRouter()
+    router.begin_request("a")
+    router.begin_request("a")
+    router.end_request("a", 0.2)
+    router.end_request("a", None)
+
+    peer = router.peers["a"]
+    assert peer.in_flight == 0
+    assert peer.request.samples == 1
+    router.end_request("a", None)
+    assert peer.in_flight == 0
+
+
+def test_hedge_delay_uses_pool_tail_once_sampled():
+    router = AgentRouter(RoutingConfig(hedge_delay=2.0, min_hedge_delay=0.05, hedge_min_samples=3))
+    assert router.hedge_delay() == 2.0
+
+    for latency in (0.2, 0.3, 0.25):
+        router.task_started("a")
+        router.task_finished("a", latency)
+
+    assert 0.2 < router.hedge_delay() < 2.0
@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+
+from a2a_scheduler import InboundScheduler, MessageExpired, SchedulerConfig, SchedulerOverloaded
+
+
+def _scheduler(**overrides):
+    config = SchedulerConfig(workers=1, max_queue_size=10, type_limits={}, type_priority={})
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return InboundScheduler(config)
+
+
+async def _occupy(scheduler, kind="bulk"):
+    """Submit a job that holds a worker until the returned event is set"""
+    release = asyncio.Event()
+    started = asyncio.Event()
+
+    async def run():
+        started.set()
+        await release.wait()
+        return "held"
+
+    task = asyncio.create_task(scheduler.submit(kind, run))
+    await started.wait()
+    return release, task
+
+
+def _recorder(order, label):
+    async def run():
+        order.append(label)
+        return label
+    return run
+
+
+async def test_higher_priority_runs_first():
+    scheduler = _scheduler()
+    release, held = await _occupy(scheduler)
+    order = []
+
+    low = asyncio.create_task(scheduler.submit("bulk", _recorder(order, "low"), priority=0))
+    high = asyncio.create_task(scheduler.submit("bulk", _recorder(order, "high"), priority=5))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(held, low, high) == ["held", "low", "high"]
+    assert order == ["high", "low"]
+    await scheduler.stop()
+
+
+async def test_type_limit_leaves_workers_for_other_traffic():
+    scheduler = _scheduler(workers=2, type_limits={"task_execution": 1})
+    release, held = await _occupy(scheduler, "task_execution")
+
+    second_task = asyncio.create_task(scheduler.submit("task_execution", _recorder([], "task")))
+    health = await asyncio.wait_for(scheduler.submit("health_check", _recorder([], "health")), 1)
+
+    assert health == "health"
+    assert not second_task.done()
+    assert scheduler.stats()["queued_by_type"] == {"task_execution": 1}
+    release.set()
+    assert await second_task == "task"
+    await held
+    await scheduler.stop()
+
+
+async def test_full_queue_refuses_equal_priority_with_retry_after():
+    scheduler = _scheduler(max_queue_size=1, retry_after=2.5)
+    release, held = await _occupy(scheduler)
+    queued = asyncio.create_task(scheduler.submit("bulk", _recorder([], "queued")))
+    await asyncio.sleep(0)
+
+    with pytest.raises(SchedulerOverloaded) as refused:
+        await scheduler.submit("bulk", _recorder([], "refused"))
+
+    assert refused.value.retry_after == 2.5
+    assert scheduler.stats()["rejected"] == 1
+    release.set()
+    assert await queued == "queued"
+    await held
+    await scheduler.stop()
+
+
+async def test_full_queue_sheds_lower_priority_for_urgent_traffic():
+    scheduler = _scheduler(max_queue_size=1)
+    release, held = await _occupy(scheduler)
+    bulk = asyncio.create_task(scheduler.submit("bulk", _recorder([], "bulk"), priority=0))
+    await asyncio.sleep(0)
+
+    urgent = asyncio.create_task(scheduler.submit("bulk", _recorder([], "urgent"), priority=9))
+    with pytest.raises(SchedulerOverloaded):
+        await bulk
+    release.set()
+
+    assert await urgent == "urgent"
+    assert scheduler.stats()["shed"] == 1
+    await held
+    await scheduler.stop()
+
+
+async def test_expired_job_is_dropped_instead_of_run():
+    scheduler = _scheduler()
+    ran = []
+
+    with pytest.raises(MessageExpired):
+        await scheduler.submit("bulk", _recorder(ran, "late"), deadline=time.monotonic() - 1)
+
+    assert ran == []
+    await scheduler.stop()
+
+
+async def test_handler_errors_reach_the_submitter():
+    scheduler = _scheduler()
+
+    async def boom():
+        raise ValueError("bad payload")
+
+    with pytest.raises(ValueError):
+        await scheduler.submit("bulk", boom)
+    assert scheduler.stats()["failed"] == 1
+    await scheduler.stop()
+
+
+async def test_stop_fails_queued_jobs():
+    scheduler = _scheduler()
+    release, held = await _occupy(scheduler)
+    queued = asyncio.create_task(scheduler.submit("bulk", _recorder([], "queued")))
+    await asyncio.sleep(0)
+
+    await scheduler.stop()
+
+    with pytest.raises(MessageExpired):
+        await queued
+    with pytest.raises(MessageExpired):
+        await held
@@ -0,0 +1,133 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from a2a_circuit import CLOSED, HALF_OPEN, OPEN, BreakerConfig, CircuitBreakers
+from a2a_system import STREAM_KEY, AgentCapability
+
+PEER = "peer"
+
+
+def sse(*events):
+    return "".join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events).encode()
+
+
+@pytest.fixture
+def streaming_manager(peer_manager):
+    """A manager whose streaming peer is served by the test's handler; the peer's circuit is half-open"""
+    async def start(handler):
+        manager = await peer_manager(
+            handler,
+            metadata={STREAM_KEY: True},
+            breakers=CircuitBreakers(BreakerConfig(failure_threshold=1, reset_timeout=0.0))
+        )
+        manager.breakers.record_failure(PEER)
+        return manager
+    return start
+
+
+async def collect(manager):
+    return [
+        event async for event in manager.stream_task(
+            "research", "find things", {"query": "x"}, {AgentCapability.RAG_RETRIEVAL}, agent_id=PEER
+        )
+    ]
+
+
+async def test_successful_probe_closes_the_circuit(streaming_manager):
+    manager = await streaming_manager(lambda request: httpx.Response(200, content=sse(
+        ("accepted", {"task_id": "t"}),
+        ("result", {"capability": "rag_retrieval", "result": [1, 2]}),
+        ("done", {"status": "completed"})
+    )))
+
+    events = await collect(manager)
+
+    assert [event["event"] for event in events] == ["accepted", "result", "done"]
+    assert manager.breakers.state(PEER) == CLOSED
+
+
+async def test_refused_stream_releases_the_probe(streaming_manager):
+    manager = await streaming_manager(lambda request: httpx.Response(400, json={"detail": "bad request"}))
+
+    with pytest.raises(RuntimeError, match="HTTP 400"):
+        await collect(manager)
+
+    assert manager.breakers.state(PEER) == CLOSED
+    assert manager.breakers.available(PEER)
+
+
+async def test_malformed_event_releases_the_probe(streaming_manager):
+    manager = await streaming_manager(
+        lambda request: httpx.Response(200, content=b"event: done\ndata: {not json\n\n")
+    )
+
+    with pytest.raises(json.JSONDecodeError):
+        await collect(manager)
+
+    breaker = manager.breakers.get(PEER)
+    assert breaker.state == OPEN
+    assert not breaker.probing
+
+
+async def test_encode_error_releases_the_probe(streaming_manager):
+    manager = await streaming_manager(lambda request: httpx.Response(200, content=sse(("done", {}))))
+
+    def broken_encode(*args, **kwargs):
+        raise TypeError("not serializable")
+
+    manager.codec.encode = broken_encode
+
+    with pytest.raises(TypeError):
+        await collect(manager)
+
+    breaker = manager.breakers.get(PEER)
+    assert breaker.state == OPEN
+    assert not breaker.probing
+
+
+async def test_cancellation_before_headers_releases_the_probe(streaming_manager):
+    requested = asyncio.Event()
+
+    async def hang(request):
+        requested.set()
+        await asyncio.sleep(60)
+
+    manager = await streaming_manager(hang)
+    stream = asyncio.ensure_future(collect(manager))
+    await requested.wait()
+    assert manager.breakers.state(PEER) == HALF_OPEN
+
+    stream.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await stream
+
+    breaker = manager.breakers.get(PEER)
+    assert breaker.state == OPEN
+    assert not breaker.probing
+    assert manager.router.peers[PEER].in_flight == 0
+
+
+async def test_stream_waits_for_events_under_the_task_latency(streaming_manager):
+    seen = {}
+
+    def handler(request):
+        seen.update(request.extensions["timeout"])
+        return httpx.Response(200, content=sse(("done", {"status": "completed"})))
+
+    manager = await streaming_manager(handler)
+    for _ in range(manager.breakers.config.min_samples):
+        manager.router.task_started(PEER)
+        manager.router.task_finished(PEER, 0.5)
+    expected = manager.breakers.timeout_for(manager.router.peers[PEER].task)
+
+    await collect(manager)
+
+    config = manager.transport.config
+    assert expected < manager.breakers.config.max_timeout
+    assert seen["read"] == pytest.approx(expected)
+    assert seen["connect"] == config.connect_timeout
+    assert seen["write"] == config.write_timeout
+    assert seen["pool"] == config.pool_timeout
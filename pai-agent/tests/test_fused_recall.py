@@ -0,0 +1,84 @@
+import pytest
+
+import fused_recall
+from fused_recall import GRAPH_NODE_KEY, FusedRecallEngine
+from graph_memory import NodeType, RelationType
+
+
+class StubRAG:
+    """Vector search returning fixed chunks"""
+
+    def __init__(self, chunks=None, error=None):
+        self.chunks = chunks or []
+        self.error = error
+
+    async def retrieve_relevant_context(self, query, max_results=5):
+        if self.error:
+            raise self.error
+        return self.chunks[:max_results]
+
+
+async def _conversation(graph):
+    entity, conversation = await graph.create_nodes([
+        ("Python", NodeType.CONCEPT, None),
+        ("Conversation c1", NodeType.CONVERSATION, {"user_message": "python?", "assistant_response": "yes"}),
+    ])
+    await graph.create_relationship(entity, conversation, RelationType.MENTIONED_IN)
+    return conversation
+
+
+async def test_chunk_and_graph_memory_fuse_into_one_result(embedded_graph):
+    conversation = await _conversation(embedded_graph)
+    rag = StubRAG([
+        {"id": 1, "content": "chunk text", "similarity": 0.9, "source": "chat",
+         "metadata": {GRAPH_NODE_KEY: conversation}},
+        {"id": 2, "content": "other", "similarity": 0.5, "source": "docs", "metadata": {}},
+    ])
+
+    result = await FusedRecallEngine(rag, embedded_graph).recall("Python", entities=["Python"])
+
+    first, second = result["results"]
+    assert first["graph_node_id"] == conversation
+    assert sorted(first["sources"]) == ["graph", "vector"]
+    assert first["content"] == "chunk text"
+    assert second["sources"] == ["vector"]
+    assert first["fused_score"] > second["fused_score"]
+
+
+async def test_failed_source_is_reported_not_raised(embedded_graph):
+    await _conversation(embedded_graph)
+    engine = FusedRecallEngine(StubRAG(error=RuntimeError("pg down")), embedded_graph)
+
+    result = await engine.recall("Python", entities=["Python"])
+
+    assert result["errors"] == {"vector": "pg down"}
+    assert [item["sources"] for item in result["results"]] == [["graph"]]
+
+
+async def test_get_fused_context_formats_fused_results(embedded_graph, monkeypatch):
+    await _conversation(embedded_graph)
+    monkeypatch.setattr(fused_recall, "fused_recall", FusedRecallEngine(StubRAG(), embedded_graph))
+
+    context = await fused_recall.get_fused_context("Python")
+
+    assert context.startswith("[Graph memory] (graph, score:")
+    assert "User: python?" in context
+
+
+async def test_chunks_of_one_graph_node_count_once(embedded_graph):
+    rag = StubRAG([
+        {"id": 1, "content": "part one", "similarity": 0.9, "source": "doc", "metadata": {GRAPH_NODE_KEY: "n1"}},
+        {"id": 2, "content": "single", "similarity": 0.8, "source": "other", "metadata": {}},
+        {"id": 3, "content": "part two", "similarity": 0.7, "source": "doc", "metadata": {GRAPH_NODE_KEY: "n1"}},
+        {"id": 4, "content": "part three", "similarity": 0.6, "source": "doc", "metadata": {GRAPH_NODE_KEY: "n1"}},
+    ])
+    engine = FusedRecallEngine(rag, embedded_graph)
+
+    result = await engine.recall("anything", entities=[])
+
+    document, single = result["results"]
+    assert document["key"] == "n1"
+    assert document["sources"] == ["vector"]
+    assert document["chunk_id"] == 1
+    assert document["fused_score"] == pytest.approx(1 / (engine.config.rrf_k + 1))
+    assert single["fused_score"] == pytest.approx(1 / (engine.config.rrf_k + 2))
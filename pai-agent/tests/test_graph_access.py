@@ -0,0 +1,82 @@
+import pytest
+
+from graph_access import AccessAggregator
+from graph_memory import GraphConfig, GraphMemorySystem, NodeType
+
+
+async def test_flush_coalesces_accesses_per_node():
+    flushed = []
+
+    async def callback(updates):
+        flushed.append(updates)
+
+    aggregator = AccessAggregator(callback)
+    aggregator.record("b", 0.1)
+    aggregator.record("a", 0.2)
+    aggregator.record("b", 0.3)
+
+    assert await aggregator.flush() == 2
+    assert flushed == [[
+        {"id": "a", "count": 1, "weight": 0.2},
+        {"id": "b", "count": 2, "weight": 0.1 + 0.3},
+    ]]
+    assert aggregator.pending_nodes == 0
+
+
+async def test_failed_flush_requeues_updates():
+    async def callback(updates):
+        raise RuntimeError("database down")
+
+    aggregator = AccessAggregator(callback)
+    aggregator.record("a", 0.5)
+
+    try:
+        await aggregator.flush()
+    except RuntimeError:
+        pass
+    assert aggregator.drain() == [{"id": "a", "count": 1, "weight": 0.5}]
+
+
+async def test_accesses_buffer_while_flush_loop_runs(embedded_graph):
+    node_id = await embedded_graph.create_node("A", NodeType.CONCEPT)
+    assert embedded_graph.access_aggregator.running
+
+    await embedded_graph.update_node_importance(node_id)
+    assert embedded_graph.access_aggregator.pending_nodes == 1
+    assert embedded_graph.store.get_node(node_id).access_count == 0
+
+    await embedded_graph.flush_access_updates()
+    assert embedded_graph.store.get_node(node_id).access_count == 1
+
+
+async def test_accesses_write_through_without_flush_loop(embedded_graph):
+    node_id = await embedded_graph.create_node("A", NodeType.CONCEPT)
+    await embedded_graph.access_aggregator.stop()
+
+    await embedded_graph.update_node_importance(node_id)
+
+    assert embedded_graph.access_aggregator.pending_nodes == 0
+    assert embedded_graph.store.get_node(node_id).access_count == 1
+
+
+async def test_first_access_initializes_and_starts_flush_loop():
+    graph = GraphMemorySystem(GraphConfig(backend="embedded", snapshot_path=None))
+    try:
+        await graph.update_node_importance("missing")
+        assert graph.access_aggregator.running
+    finally:
+        await graph.close()
+
+
+async def test_update_returns_the_score_including_buffered_accesses(embedded_graph):
+    node_id = await embedded_graph.create_node("A", NodeType.CONCEPT)
+    base = embedded_graph.store.get_node(node_id).importance_score
+
+    first = await embedded_graph.update_node_importance(node_id, access_weight=0.25)
+    second = await embedded_graph.update_node_importance(node_id, access_weight=0.25)
+    await embedded_graph.flush_access_updates()
+
+    assert first == pytest.approx(base + 0.25)
+    assert second == pytest.approx(base + 0.5)
+    assert embedded_graph.store.get_node(node_id).importance_score == pytest.approx(second)
+    assert await embedded_graph.update_node_importance("missing") is None
@@ -0,0 +1,113 @@
+from graph_cache import RecallCache
+from graph_memory import GraphConfig, GraphMemorySystem, NodeType, RelationType
+
+
+def test_invalidate_by_id_and_name():
+    cache = RecallCache()
+    cache.put("a", {"v": 1}, {RecallCache.id_tag("n1")})
+    cache.put("b", {"v": 2}, {RecallCache.name_tag("Alice")})
+
+    assert cache.invalidate(node_ids=["n1"]) == 1
+    assert cache.get("a") is None
+    assert cache.invalidate(names=["alice"]) == 1
+    assert cache.get("b") is None
+
+
+def test_any_edge_tag_only_dropped_by_relationship_writes():
+    cache = RecallCache()
+    cache.put("k", {"v": 1}, {RecallCache.ANY_EDGE_TAG})
+
+    cache.invalidate(node_ids=["unrelated"])
+    assert cache.get("k") == {"v": 1}
+    cache.invalidate(node_ids=["unrelated"], edges_changed=True)
+    assert cache.get("k") is None
+
+
+async def _build_chain(graph):
+    """A - X and Y -MENTIONED_IN-> conversation, with no path from A to it yet"""
+    a, x, y = await graph.create_nodes([
+        ("A", NodeType.CONCEPT, None),
+        ("X", NodeType.CONCEPT, None),
+        ("Y", NodeType.CONCEPT, None),
+    ])
+    conversation = await graph.create_node("Conversation c1", NodeType.CONVERSATION, {"content": "hello"})
+    await graph.create_relationships([
+        (a, x, RelationType.RELATED_TO, None, 0.5),
+        (y, conversation, RelationType.MENTIONED_IN, None, 0.5),
+    ])
+    return x, y, conversation
+
+
+async def test_edge_through_intermediate_node_invalidates_recall(embedded_graph):
+    x, y, conversation = await _build_chain(embedded_graph)
+
+    assert await embedded_graph.find_related_memories(["A"], max_depth=3) == []
+
+    # X is one hop from A, so the new X - Y edge opens A - X - Y - conversation
+    await embedded_graph.create_relationship(x, y, RelationType.RELATED_TO)
+
+    memories = await embedded_graph.find_related_memories(["A"], max_depth=3)
+    assert [memory["id"] for memory in memories] == [conversation]
+
+
+async def test_edge_outside_neighborhood_keeps_recall_cached(embedded_graph):
+    await _build_chain(embedded_graph)
+    far, other = await embedded_graph.create_nodes([
+        ("Far", NodeType.CONCEPT, None),
+        ("Other", NodeType.CONCEPT, None),
+    ])
+
+    await embedded_graph.find_related_memories(["A"], max_depth=3)
+    hits = embedded_graph.recall_cache.hits
+    await embedded_graph.create_relationship(far, other, RelationType.RELATED_TO)
+    await embedded_graph.find_related_memories(["A"], max_depth=3)
+
+    assert embedded_graph.recall_cache.hits == hits + 1
+
+
+async def test_oversized_neighborhood_falls_back_to_any_edge_tag():
+    graph = GraphMemorySystem(GraphConfig(backend="embedded", snapshot_path=None, recall_cache_max_neighborhood=1))
+    await graph.initialize()
+    try:
+        x, y, conversation = await _build_chain(graph)
+        far, other = await graph.create_nodes([
+            ("Far", NodeType.CONCEPT, None),
+            ("Other", NodeType.CONCEPT, None),
+        ])
+
+        await graph.find_related_memories(["A"], max_depth=3)
+        hits = graph.recall_cache.hits
+        await graph.create_relationship(far, other, RelationType.RELATED_TO)
+        await graph.find_related_memories(["A"], max_depth=3)
+
+        assert graph.recall_cache.hits == hits
+    finally:
+        await graph.close()
+
+
+def test_put_computed_before_an_invalidation_is_dropped():
+    cache = RecallCache()
+    generation = cache.generation
+
+    cache.invalidate(node_ids=["unrelated"])
+    cache.put("k", {"v": 1}, {RecallCache.id_tag("n1")}, generation=generation)
+
+    assert cache.get("k") is None
+    assert cache.stats()["stale_puts"] == 1
+
+
+async def test_write_during_recall_is_not_cached_over(embedded_graph, monkeypatch):
+    x, y, conversation = await _build_chain(embedded_graph)
+    neighborhood = embedded_graph._recall_neighborhood
+
+    async def racing_neighborhood(*args, **kwargs):
+        # The X - Y edge lands after the recall query but before its result is cached
+        await embedded_graph.create_relationship(x, y, RelationType.RELATED_TO)
+        monkeypatch.setattr(embedded_graph, "_recall_neighborhood", neighborhood)
+        return await neighborhood(*args, **kwargs)
+
+    monkeypatch.setattr(embedded_graph, "_recall_neighborhood", racing_neighborhood)
+
+    assert await embedded_graph.find_related_memories(["A"], max_depth=3) == []
+    memories = await embedded_graph.find_related_memories(["A"], max_depth=3)
+    assert [memory["id"] for memory in memories] == [conversation]
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+from graph_edges import EdgeCompactor
+from graph_memory import COMPACTABLE_RELATION_TYPES, NodeType, RelationType
+
+LONG_AGO = datetime.now(timezone.utc) - timedelta(days=400)
+
+
+async def _nodes(graph):
+    return await graph.create_nodes([
+        ("A", NodeType.CONCEPT, None),
+        ("B", NodeType.CONCEPT, None),
+        ("Conversation c1", NodeType.CONVERSATION, {"content": "old"}),
+    ])
+
+
+def _age(graph, from_id, to_id, rel_type, strength=0.5, mentions=1):
+    graph.store.load_edge(from_id, to_id, rel_type, strength, mentions, LONG_AGO, LONG_AGO, {})
+
+
+async def test_compaction_keeps_old_conversation_links(embedded_graph):
+    a, b, conversation = await _nodes(embedded_graph)
+    _age(embedded_graph, a, conversation, RelationType.MENTIONED_IN.value)
+    _age(embedded_graph, a, b, RelationType.RELATED_TO.value)
+
+    result = await embedded_graph.compact_edges()
+
+    assert result == {"pruned": 1, "merged": 0}
+    assert [(e["from_id"], e["rel_type"]) for e in embedded_graph.store.iter_edges()] == [
+        (a, RelationType.MENTIONED_IN.value)
+    ]
+    assert [c.id for c in embedded_graph.store.mentioned_conversations("A")] == [conversation]
+
+
+async def test_compaction_keeps_frequent_or_recent_edges(embedded_graph):
+    a, b, _ = await _nodes(embedded_graph)
+    _age(embedded_graph, a, b, RelationType.RELATED_TO.value, mentions=5)
+    await embedded_graph.create_relationship(b, a, RelationType.KNOWS, strength=0.05)
+
+    assert (await embedded_graph.compact_edges())["pruned"] == 0
+
+
+async def test_compaction_folds_reverse_duplicates_of_entity_edges_only(embedded_graph):
+    a, b, conversation = await _nodes(embedded_graph)
+    await embedded_graph.create_relationships([
+        (a, b, RelationType.RELATED_TO, None, 0.4),
+        (b, a, RelationType.RELATED_TO, None, 0.8),
+        (a, conversation, RelationType.MENTIONED_IN, None, 0.5),
+        (conversation, a, RelationType.MENTIONED_IN, None, 0.5),
+    ])
+
+    assert await embedded_graph.compact_edges() == {"pruned": 0, "merged": 1}
+
+    edges = {(e["from_id"], e["to_id"], e["rel_type"]): e for e in embedded_graph.store.iter_edges()}
+    low, high = sorted((a, b))
+    merged = edges[(low, high, RelationType.RELATED_TO.value)]
+    assert merged["mention_count"] == 2
+    assert merged["strength"] == 0.8
+    assert (a, conversation, RelationType.MENTIONED_IN.value) in edges
+    assert (conversation, a, RelationType.MENTIONED_IN.value) in edges
+
+
+def test_conversation_links_are_not_compactable():
+    assert RelationType.MENTIONED_IN.value not in COMPACTABLE_RELATION_TYPES
+    assert RelationType.DISCUSSED_IN.value not in COMPACTABLE_RELATION_TYPES
+    assert RelationType.RELATED_TO.value in COMPACTABLE_RELATION_TYPES
+
+
+class RecordingWriter:
+    """Stands in for GraphWriter, replaying one result per node batch"""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.calls = []
+
+    async def run(self, operation, query, **parameters):
+        self.calls.append((query, parameters))
+        return self.batches.pop(0)
+
+
+async def test_neo4j_prune_walks_nodes_with_keyset_cursor(embedded_graph):
+    embedded_graph.config.edge_compaction_batch_size = 2
+    writer = RecordingWriter([
+        [{"nodes": 2, "last_id": "b", "count": 1}],
+        [{"nodes": 2, "last_id": "d", "count": 0}],
+        [{"nodes": 1, "last_id": "e", "count": 3}],
+    ])
+    embedded_graph.writer = writer
+
+    pruned = await EdgeCompactor(embedded_graph)._prune_neo4j(0, 1)
+
+    assert pruned == 4
+    assert [parameters["after"] for _, parameters in writer.calls] == ["", "b", "d"]
+    query = writer.calls[0][0]
+    assert "WHERE a.id > $after" in query
+    assert "MENTIONED_IN" not in query and "`RELATED_TO`" in query
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+from graph_memory import GraphConfig, GraphMemorySystem, _parse_legacy_timestamp
+
+
+class ScriptedWriter:
+    """Stands in for GraphWriter: answers reads of legacy strings, records the writes"""
+
+    def __init__(self, strings):
+        self.strings = strings
+        self.written = []
+
+    async def run(self, operation, query, **parameters):
+        if "IS :: LOCAL DATETIME" in query:
+            return [{"converted": 0}]
+        if "IS :: STRING" in query:
+            rows = [row for row in self.strings if row["element_id"] > parameters["after"]]
+            return rows[:parameters["batch_size"]]
+        if "UNWIND $rows" in query:
+            self.written.extend(parameters["rows"])
+        return []
+
+
+class MarkerSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, **parameters):
+        return self
+
+    async def single(self):
+        return None
+
+
+class MarkerDriver:
+    def session(self, **kwargs):
+        return MarkerSession()
+
+
+def test_parse_legacy_timestamp():
+    assert _parse_legacy_timestamp("2024-05-01T12:30:00") == datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    assert _parse_legacy_timestamp("2024-05-01T12:30:00+02:00").utcoffset().total_seconds() == 7200
+    assert _parse_legacy_timestamp("yesterday") is None
+    assert _parse_legacy_timestamp("2024-13-01T00:00:00") is None
+
+
+async def test_migration_skips_unparsable_strings():
+    graph = GraphMemorySystem(GraphConfig(backend="neo4j"))
+    graph.driver = MarkerDriver()
+    writer = graph.writer = ScriptedWriter([
+        {"element_id": "a", "value": "2024-05-01T12:30:00"},
+        {"element_id": "b", "value": "not a date"},
+        {"element_id": "c", "value": "2024-05-02T08:00:00Z"},
+    ])
+
+    converted = await graph.migrate_temporal_properties(batch_size=2)
+
+    # Three properties on nodes and three on relationships, each replaying the same rows
+    assert converted == 2 * 6
+    assert {row["element_id"] for row in writer.written} == {"a", "c"}
+    assert all(row["value"].tzinfo is not None for row in writer.written)
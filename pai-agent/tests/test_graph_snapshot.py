@@ -0,0 +1,45 @@
+from datetime import date, datetime, timezone
+
+from graph_memory import GraphConfig, GraphMemorySystem, NodeType, RelationType
+from graph_snapshot import read_snapshot
+
+SEEN = datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+
+async def test_export_import_round_trips_graph_and_typed_properties(embedded_graph, tmp_path):
+    a, b = await embedded_graph.create_nodes([
+        ("A", NodeType.PERSON, {"born": date(1990, 5, 17), "seen_at": SEEN}),
+        ("B", NodeType.CONCEPT, {"tags": ["x", "y"]}),
+    ])
+    await embedded_graph.create_relationship(a, b, RelationType.KNOWS, {"since": SEEN}, strength=0.9)
+    path = str(tmp_path / "graph.npz")
+
+    meta = await embedded_graph.export_snapshot(path)
+    assert meta["node_count"] == 2
+
+    target = GraphMemorySystem(GraphConfig(backend="embedded", snapshot_path=None))
+    await target.initialize()
+    try:
+        counts = await target.import_snapshot(path)
+        assert counts["nodes"] == 2 and counts["edges"] == 1
+
+        node = target.store.get_node(a)
+        assert node.properties["born"] == date(1990, 5, 17)
+        assert node.properties["seen_at"] == SEEN
+        assert target.store.get_node(b).properties["tags"] == ["x", "y"]
+        edge = next(target.store.iter_edges())
+        assert edge["properties"]["since"] == SEEN
+        assert edge["strength"] == 0.9
+    finally:
+        await target.close()
+
+
+async def test_snapshot_columns_are_readable_without_the_graph(embedded_graph, tmp_path):
+    await embedded_graph.create_nodes([("A", NodeType.CONCEPT, None), ("B", NodeType.CONCEPT, None)])
+    path = str(tmp_path / "graph.npz")
+    await embedded_graph.export_snapshot(path)
+
+    snapshot = read_snapshot(path)
+
+    assert sorted(snapshot.node_names) == ["A", "B"]
+    assert len(snapshot.edge_indptr) == 3
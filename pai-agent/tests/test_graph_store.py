@@ -0,0 +1,73 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from graph_store import (
+    SNAPSHOT_HEADER_SIZE, SNAPSHOT_MAGIC, EmbeddedGraphStore, decode_json_value, encode_json_value
+)
+
+NOW = datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def _store():
+    store = EmbeddedGraphStore()
+    store.merge_node("a", "Alice", "Person", {"born": date(1990, 5, 17), "seen_at": NOW}, NOW)
+    store.merge_node("c", "Conversation 1", "Conversation", {"content": "hi", "raw": b"\x00\xff"}, NOW)
+    store.merge_relationship("a", "c", "MENTIONED_IN", {"strength": 0.7, "at": NOW}, NOW)
+    return store
+
+
+def test_snapshot_round_trips_typed_properties(tmp_path):
+    path = str(tmp_path / "graph.snapshot")
+    _store().save_snapshot(path)
+
+    loaded = EmbeddedGraphStore.load_snapshot(path)
+
+    alice = loaded.get_node("a")
+    assert alice.properties == {"born": date(1990, 5, 17), "seen_at": NOW}
+    assert loaded.get_node("c").properties["raw"] == b"\x00\xff"
+    edge = next(loaded.iter_edges())
+    assert edge["properties"] == {"at": NOW}
+    assert edge["strength"] == pytest.approx(0.7)
+    assert [c.id for c in loaded.mentioned_conversations("Alice")] == ["c"]
+
+
+def test_snapshot_rejects_unserializable_properties(tmp_path):
+    store = EmbeddedGraphStore()
+    store.merge_node("a", "Alice", "Person", {"handle": object()}, NOW)
+
+    with pytest.raises(TypeError):
+        store.save_snapshot(str(tmp_path / "graph.snapshot"))
+
+
+def test_load_snapshot_rejects_foreign_files(tmp_path):
+    path = tmp_path / "graph.snapshot"
+    path.write_bytes(b"NOTAGRAPH" + b"\x00" * SNAPSHOT_HEADER_SIZE)
+
+    with pytest.raises(ValueError):
+        EmbeddedGraphStore.load_snapshot(str(path))
+
+
+def test_load_snapshot_reads_version_1(tmp_path):
+    path = str(tmp_path / "graph.snapshot")
+    _store().save_snapshot(path)
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    data[len(SNAPSHOT_MAGIC):SNAPSHOT_HEADER_SIZE] = (1).to_bytes(4, "little")
+    with open(path, "wb") as f:
+        f.write(data)
+
+    assert EmbeddedGraphStore.load_snapshot(path).node_count == 2
+
+
+def test_json_value_codec():
+    values = [NOW, date(2024, 1, 2), timedelta(minutes=5), b"bytes", {1, 2}]
+    encoded = json.dumps(values, default=encode_json_value)
+    assert json.loads(encoded, object_hook=decode_json_value) == values
+    assert decode_json_value({"$type": "datetime"}) == {"$type": "datetime"}
+
+
+async def test_query_graph_reports_unsupported_backend(embedded_graph):
+    rows = await embedded_graph.query_graph("MATCH (n) RETURN n")
+    assert rows[0]["error"] == "unsupported_on_embedded_backend"
@@ -0,0 +1,60 @@
+import graph_memory as graph_memory_module
+from graph_memory import NodeType, RelationType
+
+
+async def _mentions(graph, count):
+    python, rust = await graph.create_nodes([
+        ("Python", NodeType.CONCEPT, None),
+        ("Rust", NodeType.CONCEPT, None),
+    ])
+    conversations = await graph.create_nodes([
+        (f"Conversation c{i}", NodeType.CONVERSATION,
+         {"user_message": f"question {i}", "assistant_response": f"answer {i}"})
+        for i in range(count)
+    ])
+    rows = [(python, conversation, RelationType.MENTIONED_IN, None, 0.5) for conversation in conversations]
+    rows.append((rust, conversations[0], RelationType.MENTIONED_IN, None, 0.5))
+    await graph.create_relationships(rows)
+    return conversations
+
+
+async def test_summary_is_bounded_to_top_k(embedded_graph):
+    embedded_graph.config.summary_top_k = 3
+    await _mentions(embedded_graph, 6)
+
+    summary = (await embedded_graph.get_entity_summaries(["Python"]))["Python"]
+
+    assert summary["mention_count"] == 6
+    assert len(summary["conversations"]) == 3
+    assert [neighbor["name"] for neighbor in summary["neighbors"]] == ["Rust"]
+
+
+async def test_new_mention_refreshes_hot_summary(embedded_graph):
+    conversations = await _mentions(embedded_graph, 2)
+    await embedded_graph.get_entity_summaries(["Rust"])
+
+    rust = embedded_graph._generate_node_id("Rust", NodeType.CONCEPT)
+    await embedded_graph.create_relationship(rust, conversations[1], RelationType.MENTIONED_IN)
+
+    summary = (await embedded_graph.get_entity_summaries(["Rust"]))["Rust"]
+    assert summary["mention_count"] == 2
+
+
+async def test_graph_query_tool_keeps_ranked_memory_output(embedded_graph, monkeypatch):
+    await _mentions(embedded_graph, 1)
+    monkeypatch.setattr(graph_memory_module, "graph_memory", embedded_graph)
+
+    output = await graph_memory_module.query_graph_memory_tool("Tell me about Python")
+
+    assert output.startswith("Memory (relevance: ")
+    assert "question 0... -> answer 0..." in output
+
+
+async def test_entity_summaries_tool_formats_summaries(embedded_graph, monkeypatch):
+    await _mentions(embedded_graph, 1)
+    monkeypatch.setattr(graph_memory_module, "graph_memory", embedded_graph)
+
+    output = await graph_memory_module.entity_summaries_tool("Tell me about Python")
+
+    assert output.startswith("Entity Python (1 mentions")
+    assert "; related: Rust" in output